@@ -9,10 +9,194 @@ Can be edited individually in users config file ($HOME/.geological_data_processi
     section: [General], option: debug
 """
 
+log_queue_size = 10000
+"""
+Maximum number of log messages waiting for the background log writer. Logging blocks, if the queue is full.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [General], option: log queue size
+"""
+
+log_flush_interval = 1.0
+"""
+Seconds between two flushes of the log file
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [General], option: log flush interval
+"""
+
+progress_interval = 0.5
+"""
+Maximum number of seconds between two progress notifications of the import controllers. Apart from that, the progress
+is only reported, if the integer percentage changes.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [General], option: progress interval
+"""
+
+import_chunk_size = 50000
+"""
+Number of rows read and processed at once by the import controllers. Limits the memory usage for large import files.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: chunk size
+"""
+
+import_batch_size = 1000
+"""
+Number of objects written to the database within a single transaction by the bulk import path.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: batch size
+"""
+
+import_commit_interval = 0
+"""
+Maximum number of seconds between two commits of the bulk import path, 0 commits only after import_batch_size objects.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: commit interval
+"""
+
+import_isolate_errors = False
+"""
+Skip and report objects, which cannot be written to the database, instead of failing the import (True). A failing
+batch is rolled back to its savepoint and written again object by object.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: isolate errors
+"""
+
+import_fast_load = True
+"""
+Use PostgreSQL COPY to write imported points and properties (True). Falls back to ORM inserts for SQLite databases or
+if COPY fails.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: fast load
+"""
+
+import_group_well_logs = True
+"""
+Group well log samples per well before writing them to the database (True) or import them row by row (False)
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: group well logs
+"""
+
+import_workers = 2
+"""
+Number of worker threads, which parse and validate the chunks of an import file while the import thread writes the
+previous chunks to the database
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: workers
+"""
+
+import_queue_size = 4
+"""
+Maximum number of parsed chunks waiting to be written to the database, limits the memory used by the import pipeline
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: queue size
+"""
+
+import_parse_processes = 0
+"""
+Number of worker processes parsing large import files, 0 uses one process per CPU core
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: parse processes
+"""
+
+import_parallel_parse_size = 64 * 1024 * 1024
+"""
+Minimum size of an import file in bytes to parse it with multiple processes. Smaller files are parsed sequentially,
+because starting the worker processes takes longer.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: parallel parse size
+"""
+
+import_decompress_threads = 0
+"""
+Number of threads decompressing gzip import files, which consist of multiple members (e.g. written by bgzip). 0 uses
+one thread per cpu, 1 disables the parallel decompression.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: decompress threads
+"""
+
+import_sample_rows = 100
+"""
+Number of data rows read together with the header lines, when an import file is selected. The same number of rows is
+sampled evenly from the rest of the file. The column types are inferred from all sample rows.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: sample rows
+"""
+
+import_cache_directory = ""
+"""
+Directory of the on-disk cache for parsed import files. An empty string selects $HOME/.geological_data_processing_cache.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: cache directory
+"""
+
+import_cache_size = 0
+"""
+Maximum size of the on-disk cache for parsed import files in bytes. The least recently used entries are removed, if the
+cache grows larger. The cache is disabled by default (0), e.g. 2147483648 enables a cache with up to 2 GiB.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Import], option: cache size
+"""
+
+db_pool_size = 5
+"""
+Number of connections kept open by the PostgreSQL connection pool
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Database], option: pool size
+"""
+
+db_max_overflow = 10
+"""
+Number of additional PostgreSQL connections allowed, if all pooled connections are in use
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Database], option: max overflow
+"""
+
+db_pool_pre_ping = True
+"""
+Test pooled connections before using them (True) to detect connections closed by the database server
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Database], option: pool pre ping
+"""
+
+db_pool_recycle = 3600
+"""
+Seconds after which pooled connections are replaced, -1 to keep them open
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [Database], option: pool recycle
+"""
+
+sqlite_pragmas = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY"
+}
+"""
+PRAGMA statements executed for each new SQLite connection. A negative cache_size is interpreted as KiB.
+Each pragma can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [SQLite], option: name of the pragma, e.g. journal_mode
+"""
+
+sqlite_bulk_load = False
+"""
+Import data into SQLite databases in bulk load mode (True): secondary indexes are dropped during the import and
+rebuilt at the end, synchronous is set to sqlite_import_synchronous.
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [SQLite], option: bulk load
+"""
+
+sqlite_import_synchronous = "OFF"
+"""
+synchronous PRAGMA of SQLite databases during imports in bulk load mode
+Can be edited individually in users config file ($HOME/.geological_data_processing)
+    section: [SQLite], option: import synchronous
+"""
+
 module_list = {
     "packaging": "19.1",
     "GeologicalToolbox": "0.3.1.b3",
-    "keyring": "19.2.0"
+    "keyring": "19.2.0",
+    "numpy": "1.16.0"
 }
 """
 Dictionary of required modules and related versions
@@ -5,21 +5,33 @@ ToDo: Add Property Type to Point and Line Import
 """
 import json
 from concurrent.futures import Future
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Tuple
 
+import numpy as np
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.controller.import_pipeline import ImportPipeline
 from GeologicalDataProcessing.miscellaneous.exception_handler import ExceptionHandler
+from GeologicalDataProcessing.miscellaneous.progress_reporter import ProgressReporter
 from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn, ImportData
 from GeologicalDataProcessing.models.log_model import PropertyImportData, LogImportData
+from GeologicalDataProcessing.services.bulk_writer import BulkWriter, LineBulkWriter, PointBulkWriter, \
+    PropertyBulkWriter, WellBulkWriter
 from GeologicalDataProcessing.services.database_service import DatabaseService
+from GeologicalDataProcessing.services.import_file_reader import ImportFileReader
 from GeologicalDataProcessing.services.import_service import ImportService
+from GeologicalDataProcessing.services.line_segments import LineSegments, segment_lines
+from GeologicalDataProcessing.services.object_prefetch import existing_ids, ids_by_value, load_by_ids
+from GeologicalDataProcessing.services.stratigraphy_cache import StratigraphyCache
+from GeologicalDataProcessing.services.transaction_policy import TransactionPolicy
 from PyQt5.QtCore import pyqtSignal, QThread, QMutex
-from geological_toolbox.db_handler import AbstractDBObject
-from geological_toolbox.exceptions import WellMarkerDepthException, DatabaseRequestException
+from sqlalchemy.orm.session import Session
+from geological_toolbox.exceptions import DatabaseRequestException
 from geological_toolbox.geometries import GeoPoint, Line
 from geological_toolbox.properties import Property
-from geological_toolbox.stratigraphy import StratigraphicObject
 from geological_toolbox.well_logs import WellLogValue, WellLog
-from geological_toolbox.wells import WellMarker, Well
+from geological_toolbox.wells import Well
 
 
 class ImportControllersInterface(QThread):
@@ -27,20 +39,24 @@ class ImportControllersInterface(QThread):
     Basic interface for all import_tests controller
     """
 
-    def __init__(self, data: Dict, selection: Dict, properties: List[PropertyImportData]) -> None:
+    def __init__(self, data: ImportData or ImportFileReader, selection: Dict,
+                 properties: List[PropertyImportData], policy: TransactionPolicy = None) -> None:
         """
-        :param data: import data parsed from the file to import
+        :param data: import data parsed from the file to import or a reader, which reads the file chunk by chunk
         :param selection: dictionary of selected columns
+        :param policy: defines, when the imported objects are committed, defaults to the policy of the config file
         """
         super().__init__()
 
         self._logger = QGISLogHandler(self.__class__.__name__)
-        self._data: Dict = data
+        self._data: ImportData or ImportFileReader = data
         self._selection: Dict = selection
         self._properties: List[PropertyImportData] = properties
+        self._policy: TransactionPolicy = TransactionPolicy() if policy is None else policy
         self._mutex = QMutex()
         self._cancel = False
         self._message = ""
+        self._progress = ProgressReporter(self.update_progress.emit, self.update_rate.emit)
 
     def run(self) -> None:
         """
@@ -49,6 +65,149 @@ class ImportControllersInterface(QThread):
         """
         pass
 
+    def _column(self, chunk: ImportData, key: str) -> ImportColumn or None:
+        """
+        Returns the column selected for the given key or None, if no column was selected
+        :param chunk: currently processed chunk of the import data
+        :param key: selection key, e.g. "easting"
+        :return: the selected column or None
+        """
+        name = self._selection[key]
+        return None if name == "" else chunk.column(name)
+
+    @staticmethod
+    def _row_progress(chunk: ImportData, index: int, start: float) -> float:
+        """
+        Returns the progress of the current chunk row in percent
+        :param chunk: currently processed chunk of the import data
+        :param index: row index inside the chunk
+        :param start: part of the import file (0 - 1) read before the current chunk
+        :return: the progress of the current chunk row in percent
+        """
+        return 100 * (start + (chunk.progress - start) * index / chunk.row_count)
+
+    def _pipeline(self, transform: Callable[[ImportData], any]) -> Iterator[Tuple[ImportData, any]]:
+        """
+        Starts the import pipeline: the import file is read, parsed and transformed chunk by chunk inside worker
+        threads, while the import thread writes the transformed chunks to the database
+        :param transform: transform stage of the controller, called inside the worker threads. It must not access the
+                          database session.
+        :return: an iterator over the parsed chunks and the related transform results in file order
+        """
+        pipeline = ImportPipeline(self._data, transform, is_cancelled=lambda: self._cancel)
+        return pipeline.run(config.import_chunk_size)
+
+    def _report_skipped(self, writer: BulkWriter) -> None:
+        """
+        Emits import_finished_with_warnings, if the writer skipped objects, which could not be written to the database
+        :param writer: bulk writer of the import
+        :return: Nothing
+        """
+        if len(writer.failed) > 0:
+            self.import_finished_with_warnings.emit("Could not write {} objects to the database.".
+                                                    format(len(writer.failed)))
+
+    def _row_errors(self) -> Dict[int, str] or None:
+        """
+        Returns a new dictionary collecting the errors of invalid chunk rows, if the policy isolates errors
+        :return: an empty dictionary row index -> error message or None, if errors fail the import
+        """
+        return dict() if self._policy.isolate_errors else None
+
+    def _values(self, chunk: ImportData, key: str, default: any = None, as_float: bool = False,
+                errors: Dict[int, str] = None) -> List:
+        """
+        Converts the column selected for the given key at once into a list of python values
+        :param chunk: currently processed chunk of the import data
+        :param key: selection key, e.g. "easting"
+        :param default: value used for empty cells and for all rows, if no column was selected
+        :param as_float: convert numeric values to float
+        :param errors: collects the rows, which cannot be converted, instead of raising an error. Their values are
+                       set to default.
+        :return: the list of values
+        :raises ValueError: if as_float is set, the column contains text and no errors dictionary is given
+        """
+        column = self._column(chunk, key)
+        if column is None:
+            return [default] * chunk.row_count
+        if (errors is None) or not as_float or (column.dtype != ColumnTypes.TEXT):
+            return column.to_values(default, as_float)
+
+        # convert the text column cell by cell to find the invalid rows
+        values = [default] * chunk.row_count
+        for i, text in enumerate(column.to_list()):
+            if text == "":
+                continue
+            try:
+                values[i] = float(text)
+            except ValueError:
+                errors.setdefault(i, "Cannot convert [{}] of column {} in data row {} to float".
+                                  format(text, column.name, chunk.offset + i + 1))
+        return values
+
+    @staticmethod
+    def _ids(chunk: ImportData, column: ImportColumn or None) -> List[int or None]:
+        """
+        Converts the cells of an id column row by row into integers
+        :param chunk: currently processed chunk of the import data
+        :param column: id column or None, if no id column exists
+        :return: the list of ids, None for empty cells and cells, which are no valid integers
+        """
+        ids = [None] * chunk.row_count
+        if column is None:
+            return ids
+
+        for i, text in enumerate(column.to_list()):
+            try:
+                ids[i] = int(text)
+            except ValueError:
+                pass
+        return ids
+
+    def _texts(self, chunk: ImportData, key: str) -> List[str]:
+        """
+        Converts the column selected for the given key at once into a list of strings
+        :param chunk: currently processed chunk of the import data
+        :param key: selection key, e.g. "comment"
+        :return: the list of strings, empty strings for all rows, if no column was selected
+        """
+        column = self._column(chunk, key)
+        return [""] * chunk.row_count if column is None else column.to_list()
+
+    def _property_texts(self, chunk: ImportData) -> List[List[Tuple[PropertyImportData, str]]]:
+        """
+        Returns the property values of all chunk rows as text
+        :param chunk: currently processed chunk of the import data
+        :return: a list of tuples of the property definition and the related value for each row
+        """
+        columns = [(item, chunk.column(item.name).to_list()) for item in self._properties]
+        return [[(item, texts[i]) for item, texts in columns] for i in range(chunk.row_count)]
+
+    @staticmethod
+    def _has_coordinates(chunk: ImportData, index: int, east: any, north: any,
+                         errors: Dict[int, str] = None) -> bool:
+        """
+        Checks the coordinates of a chunk row
+        :param chunk: currently processed chunk of the import data
+        :param index: row index inside the chunk
+        :param east: easting of the row or None
+        :param north: northing of the row or None
+        :param errors: collects invalid rows instead of raising an error
+        :return: True, if the row has valid coordinates, False if both coordinates are empty or the row is invalid
+        :raises ValueError: if only one of the coordinates is empty and no errors dictionary is given
+        """
+        if (errors is not None) and (index in errors):
+            return False
+        if (east is None) and (north is None):
+            return False
+        if (east is None) or (north is None):
+            message = "Incomplete coordinates in data row {}".format(chunk.offset + index + 1)
+            if errors is None:
+                raise ValueError(message)
+            errors[index] = message
+            return False
+        return True
+
     #
     # signals
     #
@@ -56,6 +215,9 @@ class ImportControllersInterface(QThread):
     update_progress = pyqtSignal(int)
     """update progress bar signal. Committed value has to be between 0 and 100"""
 
+    update_rate = pyqtSignal(float, float)
+    """signal emitted together with the progress: processed rows per second and estimated remaining seconds (or -1)"""
+
     import_finished = pyqtSignal()
     """signal emitted, when the import process has finished"""
 
@@ -114,12 +276,17 @@ class PointImportController(ImportControllersInterface):
     controller for the point data import
     """
 
-    def __init__(self, data: Dict, selection: Dict, property_cols: List[PropertyImportData]) -> None:
+    def __init__(self, data: ImportData or ImportFileReader, selection: Dict,
+                 property_cols: List[PropertyImportData], policy: TransactionPolicy = None,
+                 fast_load: bool = None) -> None:
         """
-        :param data: import data parsed from the file to import
+        :param data: import data parsed from the file to import or a reader, which reads the file chunk by chunk
         :param selection: dictionary of selected columns
+        :param policy: defines, when the imported points are committed, defaults to the policy of the config file
+        :param fast_load: use COPY for PostgreSQL databases, defaults to config.import_fast_load
         """
-        super().__init__(data, selection, property_cols)
+        super().__init__(data, selection, property_cols, policy)
+        self.__fast_load = config.import_fast_load if fast_load is None else fast_load
 
     def run(self):
         """
@@ -128,97 +295,90 @@ class PointImportController(ImportControllersInterface):
         """
 
         self._mutex.lock()
+        self._progress.start()
         service = DatabaseService.get_instance()
         service.close_session()
         service.connect()
         session = service.get_session()
+        copy_loader = service.get_copy_loader(session) if self.__fast_load else None
+        writer = PointBulkWriter(session, self._policy, copy_loader)
 
+        indexes = list()
         try:
-            onekey = self._data[next(iter(self._data.keys()))]["values"]
-            # import json
-            # self._logger.info(json.dumps(onekey, indent=2))
-            count = len(onekey)
-
-            east = self._selection["easting"]
-            north = self._selection["northing"]
-            alt = self._selection["altitude"]
-            strat = self._selection["strat"]
-            age = self._selection["strat_age"]
-            set_name = self._selection["set_name"]
-            comment = self._selection["comment"]
-
+            indexes = service.begin_bulk_load(session)
+            horizons = StratigraphyCache(session)
             reference = ImportService.get_instance().get_crs()
             if reference is None:
                 reference = ""
             else:
                 reference = reference.toWkt()
 
-            self._logger.debug("Saving with reference system\n{}".format(reference))
-
-            for i in range(count):
-                self.update_progress.emit(100 * i / count)
-
-                if (self._data[east]["values"][i] == "") and (self._data[north]["values"][i] == ""):
-                    continue
+            self._logger.debug("Saving with reference system\n{}", args=(reference,))
+
+            last_progress = 0
+            for chunk, (rows, errors) in self._pipeline(self._transform):
+                for message in errors:
+                    writer.skip(message)
+
+                # load all points to update at once
+                points = load_by_ids(GeoPoint, session, [row[1] for row in rows if row[1] is not None], "properties")
+
+                for i, _id, e, n, h, s, a, sn, c, properties in rows:
+                    self._progress.report(self._row_progress(chunk, i, last_progress), chunk.offset + i)
+
+                    strat_obj = horizons.get(s, a)
+
+                    if _id is not None:
+                        if _id not in points:
+                            raise DatabaseRequestException("No result found for ID {}".format(_id))
+
+                        point = points[_id]
+                        point.easting = e
+                        point.northing = n
+                        point.altitude = h
+                        point.del_z() if h is None else point.use_z()
+                        point.reference_system = reference
+                        point.horizon = strat_obj
+                        point.name = sn
+                        point.comment = c
+                        self._logger.debug("point update")
+
+                        # add / update properties
+                        for item, value in properties:
+                            self._logger.debug("Property: {}", args=(item,))
+                            if point.has_property(item.name):
+                                p = point.get_property(item.name)
+                                p.property_unit = item.unit
+                                p.value = value
+                                p.property_type = item.property_type
+                            else:
+                                p = Property(value=value, property_name=item.name, _type=item.property_type,
+                                             property_unit=item.unit, session=session)
+                                point.add_property(p)
+
+                        self._logger.debug("point: {}", args=(point,))
+                        writer.add_object(point)
 
-                _id = None
-                if "gpt_id" in self._data:
-                    try:
-                        _id = int(self._data["gpt_id"]["values"][i])
-                    except ValueError:
-                        pass
-
-                e = float(self._data[east]["values"][i])
-                n = float(self._data[north]["values"][i])
-                h = None if alt == "" else float(self._data[alt]["values"][i])
-                s = "" if strat == "" else self._data[strat]["values"][i]
-                a = -1 if age == "" else float(self._data[age]["values"][i])
-                sn = "" if set_name == "" else self._data[set_name]["values"][i]
-                c = "" if comment == "" else self._data[comment]["values"][i]
-
-                strat_obj = StratigraphicObject.init_stratigraphy(session, s, a)
-
-                if (_id is not None) and (_id > -1):
-                    point = GeoPoint.load_by_id_from_db(_id, session)
-                    point.easting = e
-                    point.northing = n
-                    point.altitude = h
-                    point.del_z() if h is None else point.use_z()
-                    point.reference_system = reference
-                    point.horizon = strat_obj
-                    point.name = sn
-                    point.comment = c
-                    self._logger.debug("point update")
-
-                else:
-                    point = GeoPoint(strat_obj, False if (h is None) else True, reference,
-                                     e, n, 0 if (h is None) else h, session, sn, c)
-                    self._logger.debug("new point")
-
-                # add / update properties
-                for item in self._properties:
-                    self._logger.debug("Property: {}".format(item))
-                    if point.has_property(item.name):
-                        p = point.get_property(item.name)
-                        p.property_unit = item.unit
-                        p.value = self._data[item.name]["values"][i]
-                        p.property_type = item.property_type
                     else:
-                        p = Property(value=self._data[item.name]["values"][i], property_name=item.name,
-                                     _type=item.property_type, property_unit=item.unit,
-                                     session=session)
-                        point.add_property(p)
+                        # new points are collected and written with bulk inserts
+                        writer.add_point(strat_obj, reference, e, n, h, sn, c, properties)
+                        self._logger.debug("new point")
 
-                self._logger.debug("point: {}".format(point))
-                point.save_to_db()
+                    if self._cancel:
+                        # write already collected points to keep the database consistent with the progress
+                        writer.flush()
+                        self._logger.debug("Import canceled")
+                        self.import_failed.emit(self._message)
+                        break
 
+                last_progress = chunk.progress
                 if self._cancel:
-                    self._logger.debug("Import canceled")
-                    self.import_failed.emit(self._message)
                     break
 
             if not self._cancel:
-                self.update_progress.emit(100)
+                writer.flush()
+                self._report_skipped(writer)
+                self._progress.report(100)
                 self._logger.debug("Points successfully imported")
                 self.import_finished.emit()
 
@@ -228,23 +388,61 @@ class PointImportController(ImportControllersInterface):
             self._logger.error("Error", msg)
 
         finally:
+            service.end_bulk_load(session, indexes)
             service.close_session()
 
         self._mutex.unlock()
         self.quit()
 
+    #
+    # protected functions
+    #
+
+    def _transform(self, chunk: ImportData) -> Tuple[List[Tuple], List[str]]:
+        """
+        Transform stage of the import pipeline: validates and converts the rows of a chunk
+        :param chunk: currently processed chunk of the import data
+        :return: a tuple of a list of tuples (row index, id or None, easting, northing, altitude, horizon name,
+                 horizon age, name, comment, [(property, value)]) for all valid rows with coordinates and the error
+                 messages of the invalid rows, if the policy isolates errors
+        :raises ValueError: if a row is invalid and the policy does not isolate errors
+        """
+        errors = self._row_errors()
+        east = self._values(chunk, "easting", as_float=True, errors=errors)
+        north = self._values(chunk, "northing", as_float=True, errors=errors)
+        alt = self._values(chunk, "altitude", as_float=True, errors=errors)
+        strat = self._texts(chunk, "strat")
+        age = self._values(chunk, "strat_age", -1.0, as_float=True, errors=errors)
+        set_name = self._texts(chunk, "set_name")
+        comment = self._texts(chunk, "comment")
+        properties = self._property_texts(chunk)
+
+        ids = self._ids(chunk, chunk.column("gpt_id") if "gpt_id" in chunk else None)
+
+        rows = list()
+        for i in range(chunk.row_count):
+            if not self._has_coordinates(chunk, i, east[i], north[i], errors):
+                continue
+
+            _id = None if (ids[i] is None) or (ids[i] <= -1) else ids[i]
+            rows.append((i, _id, east[i], north[i], alt[i], strat[i], age[i], set_name[i], comment[i], properties[i]))
+
+        return rows, list() if errors is None else [errors[i] for i in sorted(errors)]
+
 
 class LineImportController(ImportControllersInterface):
     """
     controller for the line data import
     """
 
-    def __init__(self, data: Dict, selection: Dict, property_cols: List[PropertyImportData]) -> None:
+    def __init__(self, data: ImportData or ImportFileReader, selection: Dict,
+                 property_cols: List[PropertyImportData], policy: TransactionPolicy = None) -> None:
         """
-        :param data: import data parsed from the file to import
+        :param data: import data parsed from the file to import or a reader, which reads the file chunk by chunk
         :param selection: dictionary of selected columns
+        :param policy: defines, when the imported lines are committed, defaults to the policy of the config file
         """
-        super().__init__(data, selection, property_cols)
+        super().__init__(data, selection, property_cols, policy)
 
     def run(self):
         """
@@ -252,144 +450,101 @@ class LineImportController(ImportControllersInterface):
         :return: True if function executed successfully, else False
         """
         self._mutex.lock()
+        self._progress.start()
         service = DatabaseService.get_instance()
         service.close_session()
         service.connect()
         session = DatabaseService.get_instance().get_session()
+        writer = LineBulkWriter(session, self._policy)
 
+        indexes = list()
         try:
-            onekey = self._data[next(iter(self._data.keys()))]["values"]
-            # import json
-            # self._logger.info(json.dumps(onekey, indent=2))
-            count = len(onekey)
-
-            east = self._selection["easting"]
-            north = self._selection["northing"]
-            alt = self._selection["altitude"]
-            strat = self._selection["strat"]
-            age = self._selection["strat_age"]
-            set_name = self._selection["set_name"]
-            comment = self._selection["comment"]
-
+            indexes = service.begin_bulk_load(session)
+            horizons = StratigraphyCache(session)
             reference = ImportService.get_instance().get_crs()
             if reference is None:
                 reference = ""
             else:
                 reference = reference.toWkt()
 
-            self._logger.debug("Saving with reference system\n{}".format(reference))
-
-            lines = dict()
+            self._logger.debug("Saving with reference system\n{}", args=(reference,))
 
-            line = 0
+            lines = list()
+            line = None
 
-            maximum = count
-            for i in range(count):
-                _id = None
-                if "gln_id" in self._data:
-                    try:
-                        _id = int(self._data["gln_id"]["values"][i])
-                    except ValueError:
-                        pass
+            last_progress = 0
+            for chunk, (segments, vertices) in self._pipeline(self._transform):
+                for nr in range(segments.count):
+                    start, stop = int(segments.offsets[nr]), int(segments.offsets[nr + 1])
 
-                if (self._data[east]["values"][i] == "") and (self._data[north]["values"][i] == ""):
-                    line += 1
-                    continue
-
-                e = float(self._data[east]["values"][i])
-                n = float(self._data[north]["values"][i])
-                h = None if alt == "" else float(self._data[alt]["values"][i])
-                s = "" if strat == "" else self._data[strat]["values"][i]
-                a = -1 if age == "" else float(self._data[age]["values"][i])
-                sn = "" if set_name == "" else self._data[set_name]["values"][i]
-                c = "" if comment == "" else self._data[comment]["values"][i]
+                    if (line is not None) and (nr == 0) and segments.continues:
+                        # the line continues the last line of the previous chunk
+                        line["vertices"].extend(vertices[start:stop])
+                        line["closed"] = (len(line["vertices"]) > 1) and (line["first"] == vertices[stop - 1][1:4])
+                    else:
+                        _id, e, n, h, s, a, sn, c, _ = vertices[start]
+                        line = {
+                            "id": _id,
+                            "strat": horizons.get(s, a),
+                            "vertices": vertices[start:stop],
+                            "name": sn,
+                            "comment": c,
+                            "first": (e, n, h),
+                            "closed": bool(segments.closed[nr])
+                        }
+                        lines.append(line)
+
+                    self._logger.debug("line segment with {} points", args=(stop - start,))
+                    self._progress.report(self._row_progress(chunk, int(segments.rows[stop - 1]), last_progress) / 2,
+                                          chunk.offset + int(segments.rows[stop - 1]))
 
-                strat_obj = StratigraphicObject.init_stratigraphy(session, s, a)
-                point = GeoPoint(None, False if (h is None) else True, reference,
-                                 e, n, 0 if (h is None) else h, session, sn, c)
+                    if self._cancel:
+                        self._logger.debug("Import canceled")
+                        self.import_failed.emit(self._message)
+                        break
 
-                # add / update properties
-                for item in self._properties:
-                    self._logger.debug("Property: {}".format(item))
-                    if point.has_property(item.name):
-                        p = point.get_property(item.name)
-                        p.property_unit = item.unit
-                        p.value = self._data[item.name]["values"][i]
-                        p.property_type = item.property_type
-                    else:
-                        p = Property(value=self._data[item.name]["values"][i], property_name=item.name,
-                                     _type=item.property_type, property_unit=item.unit,
-                                     session=session)
-                        point.add_property(p)
-
-                if _id is not None:
-                    point.line_id = _id
-
-                self._logger.debug("line point: {}".format(point))
-
-                if line in lines:
-                    lines[line]["points"].append(point)
-                else:
-                    lines[line] = {
-                        "id": _id,
-                        "strat": strat_obj,
-                        "points": [point],
-                        "name": sn,
-                        "comment": c
-                    }
-                    maximum += 1
-
-                i += 1
-                self.update_progress.emit(100 * i / maximum)
+                if not segments.open_end:
+                    line = None
 
+                last_progress = chunk.progress
                 if self._cancel:
-                    self._logger.debug("Import canceled")
-                    self.import_failed.emit(self._message)
                     break
 
-            i = count
+            i = 0
             if not self._cancel:
-                for l in lines:
+                existing = existing_ids(Line, session, [line["id"] for line in lines if line["id"] is not None])
+
+                for line in lines:
                     i += 1
 
-                    line = lines[l]
-                    closed = False
-                    if (len(line["points"]) > 1) and (line["points"][0] == line["points"][-1]):
-                        closed = True
-                        line["points"].pop()
-
-                    new_line = None
-                    if line["id"] is not None:
-                        new_line = Line.load_by_id_from_db(line["id"], session)
-                        if new_line is not None:
-                            for point in new_line.points:
-                                AbstractDBObject.delete_from_db(point, session)
-                                del point
-
-                            new_line.closed = closed
-                            new_line.points = line["points"]
-                            new_line.horizon = line["strat"]
-                            new_line.name = line["name"]
-                            new_line.comment = line["comment"]
-
-                            self._logger.debug("Updated existing line")
-
-                    if line["id"] is None or new_line is None:  # new_line is None ? not in database -> create a new one
-                        new_line = Line(closed, line["strat"], line["points"], session, line["name"], line["comment"])
-                        self._logger.debug("Created new line")
+                    closed = line["closed"]
+                    if closed:
+                        line["vertices"].pop()
 
-                    new_line.save_to_db()
-                    self._logger.debug("Line: {}".format(str(new_line)))
+                    if line["id"] in existing:
+                        # the old vertices of all lines inside a batch are deleted at once
+                        writer.replace_line(line["id"], closed, line["strat"], reference, line["name"],
+                                            line["comment"], [vertex[1:4] + vertex[6:] for vertex in line["vertices"]])
+                        self._logger.debug("Updated existing line")
 
-                    self.update_progress.emit(100 * i / maximum)
+                    else:  # no id or not in database -> create a new one
+                        points = [self.__create_point(vertex, reference, session) for vertex in line["vertices"]]
+                        new_line = Line(closed, line["strat"], points, session, line["name"], line["comment"])
+                        writer.add_object(new_line)
+                        self._logger.debug("Created new line")
+
+                    self._progress.report(50 + 50 * i / len(lines))
 
                     if self._cancel:
+                        writer.flush()
                         self._logger.debug("Import canceled")
                         self.import_failed.emit(self._message)
                         break
 
             if not self._cancel:
-                self.update_progress.emit(100)
+                writer.flush()
+                self._report_skipped(writer)
+                self._progress.report(100)
                 self._logger.debug("Lines successfully imported")
                 self.import_finished.emit()
 
@@ -399,23 +554,91 @@ class LineImportController(ImportControllersInterface):
             self._logger.error("Error", msg)
 
         finally:
+            service.end_bulk_load(session, indexes)
             service.close_session()
 
         self._mutex.unlock()
         self.quit()
 
+    #
+    # protected functions
+    #
+
+    def _transform(self, chunk: ImportData) -> Tuple[LineSegments, List[Tuple]]:
+        """
+        Transform stage of the import pipeline: splits a chunk into line segments and converts the vertex rows
+        :param chunk: currently processed chunk of the import data
+        :return: a tuple of the line segments and a list of vertex tuples (line id or None, easting, northing,
+                 altitude, horizon name, horizon age, name, comment, [(property, value)]) in the order of
+                 segments.rows
+        :raises ValueError: if a row has only one coordinate
+        """
+        segments = segment_lines(self._column(chunk, "easting"), self._column(chunk, "northing"),
+                                 self._column(chunk, "altitude"), chunk.offset)
+
+        east = self._values(chunk, "easting", as_float=True)
+        north = self._values(chunk, "northing", as_float=True)
+        alt = self._values(chunk, "altitude", as_float=True)
+        strat = self._texts(chunk, "strat")
+        age = self._values(chunk, "strat_age", -1.0, as_float=True)
+        set_name = self._texts(chunk, "set_name")
+        comment = self._texts(chunk, "comment")
+        properties = self._property_texts(chunk)
+
+        ids = self._ids(chunk, chunk.column("gln_id") if "gln_id" in chunk else None)
+
+        vertices = [(ids[i], east[i], north[i], alt[i], strat[i], age[i],
+                     set_name[i], comment[i], properties[i]) for i in segments.rows.tolist()]
+        return segments, vertices
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __create_point(vertex: Tuple, reference: str, session: Session) -> GeoPoint:
+        """
+        Creates a new line vertex
+        :param vertex: vertex tuple returned by the transform stage
+        :param reference: reference system of the vertex
+        :param session: current database session
+        :return: the new point
+        """
+        _id, e, n, h, _, _, sn, c, properties = vertex
+
+        point = GeoPoint(None, False if (h is None) else True, reference,
+                         e, n, 0 if (h is None) else h, session, sn, c)
+
+        for item, value in properties:
+            if point.has_property(item.name):
+                p = point.get_property(item.name)
+                p.property_unit = item.unit
+                p.value = value
+                p.property_type = item.property_type
+            else:
+                p = Property(value=value, property_name=item.name, _type=item.property_type,
+                             property_unit=item.unit, session=session)
+                point.add_property(p)
+
+        if _id is not None:
+            point.line_id = _id
+
+        return point
+
 
 class WellImportController(ImportControllersInterface):
     """
     controller for well data import
     """
 
-    def __init__(self, data: Dict, selection: Dict, property_cols: List[PropertyImportData]) -> None:
+    def __init__(self, data: ImportData or ImportFileReader, selection: Dict,
+                 property_cols: List[PropertyImportData], policy: TransactionPolicy = None) -> None:
         """
-        :param data: import data parsed from the file to import
+        :param data: import data parsed from the file to import or a reader, which reads the file chunk by chunk
         :param selection: dictionary of selected columns
+        :param policy: defines, when the imported wells are committed, defaults to the policy of the config file
         """
-        super().__init__(data, selection, property_cols)
+        super().__init__(data, selection, property_cols, policy)
 
     def run(self) -> bool:
         """
@@ -424,123 +647,88 @@ class WellImportController(ImportControllersInterface):
         """
 
         self._mutex.lock()
+        self._progress.start()
         service = DatabaseService.get_instance()
         service.close_session()
         service.connect()
         session = DatabaseService.get_instance().get_session()
+        writer = WellBulkWriter(session, self._policy)
 
+        indexes = list()
         try:
-            onekey = self._data[next(iter(self._data.keys()))]["values"]
-            count = len(onekey)
-
-            name = self._selection["name"]
-            short_name = self._selection["short_name"]
-            east = self._selection["easting"]
-            north = self._selection["northing"]
-            alt = self._selection["altitude"]
-            total_depth = self._selection["total_depth"]
-            strat = self._selection["strat"]
-            depth_to = self._selection["depth_to"]
-            comment = self._selection["comment"]
-
+            indexes = service.begin_bulk_load(session)
+            horizons = StratigraphyCache(session)
             reference = ImportService.get_instance().get_crs()
             if reference is None:
                 reference = ""
             else:
                 reference = reference.toWkt()
 
-            self._logger.debug("Saving with reference system\n{}".format(reference))
+            self._logger.debug("Saving with reference system\n{}", args=(reference,))
 
             wells = dict()
 
-            maximum = count
-            for i in range(count):
-                if (self._data[east]["values"][i] == "") and (self._data[north]["values"][i] == ""):
-                    continue
+            last_progress = 0
+            for chunk, (rows, errors) in self._pipeline(self._transform):
+                for message in errors:
+                    writer.skip(message)
+
+                for i, na, sn, e, n, kb, td, s, dt, c in rows:
+                    marker = (dt, horizons.get(s), c)
+
+                    if na in wells:
+                        wells[na]["marker"].append(marker)
+                    else:
+                        wells[na] = {
+                            "short_name": sn,
+                            "easting": e,
+                            "northing": n,
+                            "altitude": kb,
+                            "total_depth": td,
+                            "marker": [marker]
+                        }
 
-                na = self._data[name]["values"][i]
-                sn = "" if short_name == "" else self._data[short_name]["values"][i]
-                e = float(self._data[east]["values"][i])
-                n = float(self._data[north]["values"][i])
-                kb = None if alt == "" else float(self._data[alt]["values"][i])
-                td = -1 if total_depth == "" else float(self._data[total_depth]["values"][i])
-                s = "" if strat == "" else self._data[strat]["values"][i]
-                dt = -1 if depth_to == "" else float(self._data[depth_to]["values"][i])
-                c = "" if comment == "" else self._data[comment]["values"][i]
-
-                strat_obj = StratigraphicObject.init_stratigraphy(session, s, -1)
-                strat_obj.save_to_db()
-
-                marker = WellMarker(dt, strat_obj, session=session, comment=c)
-                # marker.save_to_db()
-                # point = GeoPoint(None, False if (h is None) else True, reference,
-                #                e, n, 0 if (h is None) else h, session, sn, c)
-
-                if na in wells:
-                    wells[na]["marker"].append(marker)
-                else:
-                    wells[na] = {
-                        "short_name": sn,
-                        "easting": e,
-                        "northing": n,
-                        "altitude": kb,
-                        "total_depth": td,
-                        "marker": [marker]
-                    }
-
-                    maximum += 1
+                    if self._cancel:
+                        self._logger.debug("Import canceled")
+                        self.import_failed.emit(self._message)
+                        break
 
+                    self._progress.report(self._row_progress(chunk, i, last_progress) / 2, chunk.offset + i)
+
+                last_progress = chunk.progress
                 if self._cancel:
-                    self._logger.debug("Import canceled")
-                    self.import_failed.emit(self._message)
                     break
 
-                self.update_progress.emit(100 * i / maximum)
-
-            i = count
+            i = 0
             if not self._cancel:
-                for well_name in wells:
+                # load the ids of all existing wells at once
+                existing = ids_by_value(Well, session, "wellname", wells.keys())
+
+                for well_name, well in wells.items():
                     i += 1
-                    well = wells[well_name]
 
-                    new_well = Well.load_by_wellname_from_db(well_name, session)
-                    if new_well is not None:
-                        try:
-                            self._logger.debug("Updating existing well: {}".format(new_well))
-                            for marker in new_well.marker:
-                                WellMarker.delete_from_db(marker, session)
-
-                            new_well.save_to_db()
-                            new_well.marker = well["marker"]
-                            new_well.short_name = well["short_name"]
-                            new_well.easting = well["easting"]
-                            new_well.northing = well["northing"]
-                            new_well.depth = well["total_depth"]
-                        except WellMarkerDepthException as e:
-                            self._logger.error("WellMarkerDepthException", "{}\n{}".format(new_well, str(e)))
-                            return False
+                    if well_name in existing:
+                        self._logger.debug("Updating existing well: {}", args=(well_name,))
+                        writer.replace_well(existing[well_name], well_name, well["short_name"], well["total_depth"],
+                                            well["easting"], well["northing"], well["marker"])
                     else:
-                        self._logger.debug("Creating new well with name [{}]".format(well_name))
-                        new_well = Well(well_name, well["short_name"], well["total_depth"], reference_system=reference,
-                                        easting=well["easting"], northing=well["northing"], altitude=well["altitude"],
-                                        session=session)
-
-                        new_well.marker = well["marker"]
-
-                    new_well.save_to_db()
-
-                    self._logger.debug("Saved well:\n{}".format(new_well))
+                        self._logger.debug("Creating new well with name [{}]", args=(well_name,))
+                        writer.add_well(well_name, well["short_name"], well["total_depth"], reference,
+                                        well["easting"], well["northing"], well["altitude"], well["marker"])
 
-                    self.update_progress.emit(100 * i / maximum)
+                    self._progress.report(50 + 50 * i / len(wells))
 
                     if self._cancel:
+                        writer.flush()
                         self._logger.debug("Import canceled")
                         self.import_failed.emit(self._message)
                         break
 
             if not self._cancel:
-                self.update_progress.emit(100)
-                self._logger.debug("Lines successfully imported")
+                writer.flush()
+                self._report_skipped(writer)
+                self._progress.report(100)
+                self._logger.debug("Wells successfully imported")
                 self.import_finished.emit()
 
         except Exception as e:
@@ -549,23 +737,63 @@ class WellImportController(ImportControllersInterface):
             self._logger.error("Error", msg)
 
         finally:
+            service.end_bulk_load(session, indexes)
             service.close_session()
 
         self._mutex.unlock()
         self.quit()
 
+    #
+    # protected functions
+    #
+
+    def _transform(self, chunk: ImportData) -> Tuple[List[Tuple], List[str]]:
+        """
+        Transform stage of the import pipeline: validates and converts the rows of a chunk
+        :param chunk: currently processed chunk of the import data
+        :return: a tuple of a list of tuples (row index, well name, short name, easting, northing, altitude, total
+                 depth, horizon name, marker depth, comment) for all valid rows with coordinates and the error
+                 messages of the invalid rows, if the policy isolates errors
+        :raises ValueError: if a row is invalid and the policy does not isolate errors
+        """
+        errors = self._row_errors()
+        name = self._texts(chunk, "name")
+        short_name = self._texts(chunk, "short_name")
+        east = self._values(chunk, "easting", as_float=True, errors=errors)
+        north = self._values(chunk, "northing", as_float=True, errors=errors)
+        alt = self._values(chunk, "altitude", as_float=True, errors=errors)
+        total_depth = self._values(chunk, "total_depth", -1.0, as_float=True, errors=errors)
+        strat = self._texts(chunk, "strat")
+        depth_to = self._values(chunk, "depth_to", -1.0, as_float=True, errors=errors)
+        comment = self._texts(chunk, "comment")
+
+        rows = list()
+        for i in range(chunk.row_count):
+            if not self._has_coordinates(chunk, i, east[i], north[i], errors):
+                continue
+
+            rows.append((i, name[i], short_name[i], east[i], north[i], alt[i], total_depth[i], strat[i], depth_to[i],
+                         comment[i]))
+
+        return rows, list() if errors is None else [errors[i] for i in sorted(errors)]
+
 
 class PropertyImportController(ImportControllersInterface):
     """
     controller for the additional property import
     """
 
-    def __init__(self, data: Dict, selection: Dict, property_cols: List[PropertyImportData]) -> None:
+    def __init__(self, data: ImportData or ImportFileReader, selection: Dict,
+                 property_cols: List[PropertyImportData], policy: TransactionPolicy = None,
+                 fast_load: bool = None) -> None:
         """
-        :param data: import data parsed from the file to import
+        :param data: import data parsed from the file to import or a reader, which reads the file chunk by chunk
         :param selection: dictionary of selected columns
+        :param policy: defines, when the imported points are committed, defaults to the policy of the config file
+        :param fast_load: use COPY for PostgreSQL databases, defaults to config.import_fast_load
         """
-        super().__init__(data, selection, property_cols)
+        super().__init__(data, selection, property_cols, policy)
+        self.__fast_load = config.import_fast_load if fast_load is None else fast_load
 
     def run(self):
         """
@@ -574,82 +802,70 @@ class PropertyImportController(ImportControllersInterface):
         """
 
         self._mutex.lock()
+        self._progress.start()
         service = DatabaseService.get_instance()
         service.close_session()
         service.connect()
         session = service.get_session()
 
         failed_imports = 0
+        indexes = list()
         try:
-            onekey = self._data[next(iter(self._data.keys()))]["values"]
-            # import json
-            # self._logger.info(json.dumps(onekey, indent=2))
-            count = len(onekey)
-
-            id_col = self._selection["id"]
-
+            indexes = service.begin_bulk_load(session)
             reference = ImportService.get_instance().get_crs()
             if reference is None:
                 reference = ""
             else:
                 reference = reference.toWkt()
 
-            self._logger.debug("Saving with reference system\n{}".format(reference))
+            self._logger.debug("Saving with reference system\n{}", args=(reference,))
 
-            for i in range(count):
-                self.update_progress.emit(100 * i / count)
+            copy_loader = service.get_copy_loader(session) if self.__fast_load else None
+            writer = PropertyBulkWriter(session, self._policy, reference, copy_loader)
 
-                try:
-                    _id = int(self._data[id_col]["values"][i])
-                except ValueError:
-                    self._logger.warn("No id specified for current data set at line {}".format(i), only_logfile=True)
-                    failed_imports += 1
-                    continue
+            last_progress = 0
+            for chunk, rows in self._pipeline(self._transform):
+                # check all point ids of the chunk at once
+                points = existing_ids(GeoPoint, session, [row[1] for row in rows if row[1] is not None])
 
-                if (_id is None) or (_id < 0):
-                    self._logger.warn("Unknown Geopoint ID found: [{}]".format(_id))
-                    failed_imports += 1
-                    continue
+                for i, _id, properties in rows:
+                    self._progress.report(self._row_progress(chunk, i, last_progress), chunk.offset + i)
 
-                try:
-                    point = GeoPoint.load_by_id_from_db(_id, session)
-                    if point is None:
-                        self._logger.warn("No Geopoint with ID [{}] found".format(_id))
+                    if _id is None:
+                        self._logger.warn("No id specified for current data set at line {}", only_logfile=True,
+                                          args=(chunk.offset + i,))
                         failed_imports += 1
                         continue
 
-                    point.reference_system = reference
+                    if _id < 0:
+                        self._logger.warn("Unknown Geopoint ID found: [{}]", args=(_id,))
+                        failed_imports += 1
+                        continue
 
-                    # add / update properties
-                    for item in self._properties:
-                        self._logger.debug("Property: {}".format(item))
-                        if point.has_property(item.name):
-                            p = point.get_property(item.name)
-                            p.property_unit = item.unit
-                            p.value = self._data[item.name]["values"][i]
-                            p.property_type = item.property_type
-                        else:
-                            p = Property(value=self._data[item.name]["values"][i], property_name=item.name,
-                                         _type=item.property_type, property_unit=item.unit,
-                                         session=session)
-                            point.add_property(p)
+                    if _id not in points:
+                        self._logger.warn("No Geopoint with ID [{}] found", args=(_id,))
+                        failed_imports += 1
+                        continue
 
-                    self._logger.debug("point: {}".format(point))
-                    point.save_to_db()
+                    # properties are inserted or updated together with all other points of the batch
+                    writer.set_properties(_id, properties)
 
-                except DatabaseRequestException:
-                    self._logger.warn("Cannot find Geopoint with ID [{}]. Skipping property import".format(_id))
-                    failed_imports += 1
+                    if self._cancel:
+                        writer.flush()
+                        self._logger.debug("Import canceled")
+                        self.import_failed.emit(self._message)
+                        break
 
+                last_progress = chunk.progress
                 if self._cancel:
-                    self._logger.debug("Import canceled")
-                    self.import_failed.emit(self._message)
                     break
 
             if not self._cancel:
+                writer.flush()
+                failed_imports += len(writer.failed)
                 if failed_imports > 0:
                     self.import_finished_with_warnings.emit("Could not import {} properties.".format(failed_imports))
-                self.update_progress.emit(100)
+                self._progress.report(100)
                 self.import_finished.emit()
 
         except Exception as e:
@@ -658,23 +874,43 @@ class PropertyImportController(ImportControllersInterface):
             self._logger.error("Error", msg, to_messagebar=True)
 
         finally:
+            service.end_bulk_load(session, indexes)
             service.close_session()
 
         self._mutex.unlock()
         self.quit()
 
+    #
+    # protected functions
+    #
+
+    def _transform(self, chunk: ImportData) -> List[Tuple]:
+        """
+        Transform stage of the import pipeline: converts the rows of a chunk
+        :param chunk: currently processed chunk of the import data
+        :return: list of tuples (row index, point id or None, [(property, value)]) for all rows
+        """
+        ids = self._ids(chunk, self._column(chunk, "id"))
+        properties = self._property_texts(chunk)
+
+        return [(i, ids[i], properties[i]) for i in range(chunk.row_count)]
+
 
 class WellLogImportController(ImportControllersInterface):
     """
     controller for well log data import
     """
 
-    def __init__(self, data: Dict, selection: Dict, log_cols: List[LogImportData]) -> None:
+    def __init__(self, data: ImportData or ImportFileReader, selection: Dict, log_cols: List[LogImportData],
+                 grouped: bool = None, policy: TransactionPolicy = None) -> None:
         """
-        :param data: import data parsed from the file to import
+        :param data: import data parsed from the file to import or a reader, which reads the file chunk by chunk
         :param selection: dictionary of selected columns
+        :param grouped: group the samples per well before writing, defaults to config.import_group_well_logs
+        :param policy: defines, when the updated wells are committed, defaults to the policy of the config file
         """
-        super().__init__(data, selection, log_cols)
+        super().__init__(data, selection, log_cols, policy)
+        self.__grouped = config.import_group_well_logs if grouped is None else grouped
 
     def run(self):
         """
@@ -683,64 +919,91 @@ class WellLogImportController(ImportControllersInterface):
         """
 
         self._mutex.lock()
+        self._progress.start()
         service = DatabaseService.get_instance()
         service.close_session()
         service.connect()
         session = service.get_session()
 
-        failed_imports = 0
+        indexes = list()
         try:
-            onekey = self._data[next(iter(self._data.keys()))]["values"]
-            # import json
-            # self._logger.info(json.dumps(onekey, indent=2))
-            count = len(onekey)
-
-            well_name_col = self._selection["well_name"]
-            depth_col = self._selection["depth"]
-
+            indexes = service.begin_bulk_load(session)
             reference = ImportService.get_instance().get_crs()
             if reference is None:
                 reference = ""
             else:
                 reference = reference.toWkt()
 
-            self._logger.debug("Saving with reference system\n{}".format(reference))
+            self._logger.debug("Saving with reference system\n{}", args=(reference,))
 
-            for i in range(count):
-                self.update_progress.emit(100 * i / count)
+            writer = BulkWriter(session, self._policy)
+            if self.__grouped:
+                failed_imports = self._import_grouped(session, reference, writer)
+            else:
+                failed_imports = self._import_rows(session, reference, writer)
 
-                try:
-                    well_name = self._data[well_name_col]["values"][i]
-                except ValueError:
-                    self._logger.warn("No well_name specified for current data set at line {}".format(i))
-                    failed_imports += 1
-                    continue
+            # commit the remaining wells, even if the import was canceled
+            writer.flush()
 
-                if (well_name is None) or (well_name == ""):
-                    self._logger.warn("Unknown well name found: [{}]".format(well_name))
+            if not self._cancel:
+                if failed_imports > 0:
+                    self.import_finished_with_warnings.emit("Could not import {} properties.".format(failed_imports))
+                self._progress.report(100)
+                self.import_finished.emit()
+
+        except Exception as e:
+            msg = str(ExceptionHandler(e))
+            self.import_failed.emit(msg)
+            self._logger.error("Error", msg, to_messagebar=True)
+
+        finally:
+            service.end_bulk_load(session, indexes)
+            service.close_session()
+
+        self._mutex.unlock()
+        self.quit()
+
+    #
+    # protected functions
+    #
+
+    def _import_rows(self, session: Session, reference: str, writer: BulkWriter) -> int:
+        """
+        Imports the log values row by row, each row loads and saves the related well
+        :param session: SQLAlchemy session used for all database requests
+        :param reference: reference system of the wells
+        :param writer: writer committing the updated wells
+        :return: number of samples, which could not be imported
+        """
+        failed_imports = 0
+        last_progress = 0
+        for chunk, rows in self._pipeline(self._transform_rows):
+            for i, well_name, depth, values in rows:
+                self._progress.report(self._row_progress(chunk, i, last_progress), chunk.offset + i)
+
+                if well_name == "":
+                    self._logger.warn("Unknown well name found: [{}]", args=(well_name,))
                     failed_imports += 1
                     continue
 
                 try:
                     well: Well = Well.load_by_wellname_from_db(well_name, session)
                     if well is None:
-                        self._logger.warn("No well with name [{}] found...".format(well_name))
+                        self._logger.warn("No well with name [{}] found...", args=(well_name,))
                         failed_imports += 1
                         continue
 
                     well.reference_system = reference
 
                     # add / update properties
-                    for item in self._properties:
-                        self._logger.debug("Property: {}".format(item))
+                    for item, value in values:
+                        self._logger.debug("Property: {}", args=(item,))
                         if well.has_log(item.name):
                             log = well.get_log(item.name)
                         else:
                             log = WellLog(property_name = item.name, property_unit = item.unit, session=session)
                             well.add_log(log)
 
-                        depth = self._data[depth_col]["values"][i]
-                        value = self._data[item.name]["values"][i]
                         try:
                             log_value: WellLogValue = log.get_value_by_depth(depth)
                         except ValueError:
@@ -749,11 +1012,11 @@ class WellLogImportController(ImportControllersInterface):
                         log_value.value = value
                         log.insert_log_value(log_value)
 
-                    self._logger.debug("well: {}".format(well))
-                    well.save_to_db()
+                    self._logger.debug("well: {}", args=(well,))
+                    writer.add_object(well)
 
                 except DatabaseRequestException:
-                    self._logger.warn("Cannot find well with name [{}]. Skipping log import".format(well_name))
+                    self._logger.warn("Cannot find well with name [{}]. Skipping log import", args=(well_name,))
                     failed_imports += 1
 
                 if self._cancel:
@@ -761,19 +1024,161 @@ class WellLogImportController(ImportControllersInterface):
                     self.import_failed.emit(self._message)
                     break
 
-            if not self._cancel:
-                if failed_imports > 0:
-                    self.import_finished_with_warnings.emit("Could not import {} properties.".format(failed_imports))
-                self.update_progress.emit(100)
-                self.import_finished.emit()
+            last_progress = chunk.progress
+            if self._cancel:
+                break
 
-        except Exception as e:
-            msg = str(ExceptionHandler(e))
-            self.import_failed.emit(msg)
-            self._logger.error("Error", msg, to_messagebar=True)
+        return failed_imports
 
-        finally:
-            service.close_session()
+    def _import_grouped(self, session: Session, reference: str, writer: BulkWriter) -> int:
+        """
+        Imports the log values grouped per well. All samples are collected and partitioned by well name first,
+        afterwards each well is loaded once, its logs are merged with all related samples and the well is saved.
+        Empty log cells are skipped.
+        :param session: SQLAlchemy session used for all database requests
+        :param reference: reference system of the wells
+        :param writer: writer committing the updated wells
+        :return: number of samples, which could not be imported
+        """
+        failed_imports = 0
 
-        self._mutex.unlock()
-        self.quit()
+        # well name -> {"depth": [depth arrays], log name -> ([value arrays], [mask arrays])}
+        samples: Dict[str, Dict] = dict()
+
+        for chunk, (invalid, partition) in self._pipeline(self._transform_grouped):
+            self._progress.report(50 * chunk.progress, chunk.offset + chunk.row_count)
+
+            if invalid > 0:
+                self._logger.warn("{} rows without well name or depth found", args=(invalid,))
+                failed_imports += invalid
+
+            for name, (depth, logs) in partition.items():
+                well_samples = samples.setdefault(name, {"depth": list()})
+                well_samples["depth"].append(depth)
+                for item in self._properties:
+                    values, masks = well_samples.setdefault(item.name, (list(), list()))
+                    values.append(logs[item.name][0])
+                    masks.append(logs[item.name][1])
+
+            if self._cancel:
+                self._logger.debug("Import canceled")
+                self.import_failed.emit(self._message)
+                return failed_imports
+
+        for index, (well_name, well_samples) in enumerate(samples.items()):
+            self._progress.report(50 + 50 * index / len(samples))
+
+            depth = np.concatenate(well_samples["depth"])
+            well: Well = Well.load_by_wellname_from_db(well_name, session)
+            if well is None:
+                self._logger.warn("No well with name [{}] found...", args=(well_name,))
+                failed_imports += len(depth)
+                continue
+
+            well.reference_system = reference
+
+            for item in self._properties:
+                self._logger.debug("Property: {}", args=(item,))
+                log = well.get_log(item.name)
+                if log is None:
+                    log = WellLog(property_name=item.name, property_unit=item.unit, session=session)
+                    well.add_log(log)
+
+                values, masks = well_samples[item.name]
+                mask = np.concatenate(masks)
+                self._merge_log_values(log, depth[mask], np.concatenate(values)[mask], session)
+
+            self._logger.debug("well [{}]: {} samples merged", args=(well_name, len(depth)))
+            writer.add_object(well)
+
+            if self._cancel:
+                self._logger.debug("Import canceled")
+                self.import_failed.emit(self._message)
+                break
+
+        return failed_imports
+
+    def _transform_rows(self, chunk: ImportData) -> List[Tuple]:
+        """
+        Transform stage of the row by row import: converts the rows of a chunk
+        :param chunk: currently processed chunk of the import data
+        :return: list of tuples (row index, well name, depth, [(log, value)]) for all rows
+        """
+        well_names = self._texts(chunk, "well_name")
+        depths = self._values(chunk, "depth")
+        columns = [(item, chunk.column(item.name).to_values()) for item in self._properties]
+
+        return [(i, well_names[i], depths[i], [(item, values[i]) for item, values in columns])
+                for i in range(chunk.row_count)]
+
+    def _transform_grouped(self, chunk: ImportData) -> Tuple[int, Dict[str, Tuple]]:
+        """
+        Transform stage of the grouped import: partitions the valid rows of a chunk by well name
+        :param chunk: currently processed chunk of the import data
+        :return: a tuple of the number of rows without well name or depth and a dictionary well name -> (depths,
+                 {log name: (values, mask)})
+        :raises ValueError: if no depth column is selected or the depth column or a log column contains non numeric
+                            values
+        """
+        well_names = np.array(self._texts(chunk, "well_name"))
+        depths = self._column(chunk, "depth")
+        if depths is None:
+            raise ValueError("No depth column selected")
+        if not (depths.is_number or depths.dtype == ColumnTypes.EMPTY):
+            raise ValueError("Depth column [{}] contains non numeric values".format(depths.name))
+
+        valid = (well_names != "") & depths.mask
+
+        columns = list()
+        for item in self._properties:
+            column = chunk.column(item.name)
+            if not (column.is_number or column.dtype == ColumnTypes.EMPTY):
+                raise ValueError("Log column [{}] contains non numeric values".format(item.name))
+            columns.append(column)
+
+        # partition the chunk rows by well name
+        partition = dict()
+        rows = np.flatnonzero(valid)
+        rows = rows[np.argsort(well_names[rows], kind="stable")]
+        names, starts = np.unique(well_names[rows], return_index=True)
+        for name, part in zip(names, np.split(rows, starts[1:])):
+            partition[str(name)] = (depths.values[part].astype(np.float64),
+                                    {item.name: (column.values[part].astype(np.float64), column.mask[part])
+                                     for item, column in zip(self._properties, columns)})
+
+        return int(np.count_nonzero(~valid)), partition
+
+    @staticmethod
+    def _merge_log_values(log: WellLog, depths: np.ndarray, values: np.ndarray, session: Session) -> None:
+        """
+        Merges the samples into the well log. Values at existing depths are updated, all other samples are inserted.
+        If a depth occurs multiple times, the last sample is used.
+        :param log: well log to update
+        :param depths: depths of the samples
+        :param values: values of the samples
+        :param session: SQLAlchemy session used for all database requests
+        :return: Nothing
+        :raises ValueError: if a depth is smaller than 0 or larger than the final well depth
+        """
+        if len(depths) == 0:
+            return
+
+        order = np.argsort(depths, kind="stable")
+        depths = depths[order]
+        values = values[order]
+        last = np.append(depths[1:] != depths[:-1], True)
+        depths = depths[last]
+        values = values[last]
+
+        # sorted depth index of the existing log values
+        existing = sorted(log.log_values, key=lambda x: x.depth)
+        found = np.zeros(len(depths), dtype=bool)
+        if len(existing) > 0:
+            existing_depths = np.array([x.depth for x in existing], dtype=np.float64)
+            pos = np.searchsorted(existing_depths, depths)
+            found = existing_depths[np.minimum(pos, len(existing) - 1)] == depths
+            for p, value in zip(pos[found], values[found]):
+                existing[p].value = float(value)
+
+        log.insert_multiple_log_values([WellLogValue(float(d), float(v), session=session)
+                                        for d, v in zip(depths[~found], values[~found])])
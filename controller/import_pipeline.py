@@ -0,0 +1,138 @@
+# -*- coding: UTF-8 -*-
+"""
+Defines the staged import engine used by the import controllers
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, Tuple
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ImportData
+from GeologicalDataProcessing.services.import_file_reader import ImportFileReader
+
+
+class _StageError:
+    """wraps an exception raised by the reader stage"""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+class ImportPipeline:
+    """
+    Staged import engine with three stages connected by a bounded queue:
+
+    1. parse: a reader thread reads the import file chunk by chunk
+    2. transform: a pool of worker threads parses each chunk and runs the transform function of the controller on it,
+       e.g. validation and type conversion of all rows
+    3. write: the thread iterating over :meth:`run` receives the transformed chunks in file order. This is the import
+       thread of the controller, which owns the database session.
+
+    At most queue_size chunks are read in advance, which limits the memory usage. Exceptions of all stages are
+    reraised in the writing thread. The pipeline stops, if the cancel function returns True or the writing thread
+    stops the iteration.
+    """
+
+    def __init__(self, data: ImportData or ImportFileReader, transform: Callable[[ImportData], any],
+                 is_cancelled: Callable[[], bool] = None, workers: int = None, queue_size: int = None) -> None:
+        """
+        :param data: import data or a reader, which reads the import file chunk by chunk
+        :param transform: transform stage, called with each chunk inside the worker threads
+        :param is_cancelled: function returning True, if the import was canceled
+        :param workers: number of worker threads, defaults to config.import_workers
+        :param queue_size: maximum number of chunks read in advance, defaults to config.import_queue_size
+        """
+        self.__logger = QGISLogHandler(self.__class__.__name__)
+        self.__data = data
+        self.__transform = transform
+        self.__is_cancelled = (lambda: False) if is_cancelled is None else is_cancelled
+        self.__workers = max(config.import_workers if workers is None else workers, 1)
+        self.__queue_size = max(config.import_queue_size if queue_size is None else queue_size, 1)
+
+    #
+    # public functions
+    #
+
+    def run(self, chunk_size: int) -> Iterator[Tuple[ImportData, any]]:
+        """
+        Runs the pipeline and returns the chunks together with the result of the transform stage in file order
+        :param chunk_size: maximum number of data rows per chunk
+        :return: an iterator over tuples of the parsed chunk and the transform result
+        :raises Exception: reraises all exceptions of the parse and transform stages
+        """
+        if isinstance(self.__data, ImportFileReader):
+            chunks = self.__data.iter_raw_chunks(chunk_size)
+            parse = self.__data.parse_chunk
+        else:
+            chunks = self.__data.iter_chunks(chunk_size)
+            parse = None
+
+        results = queue.Queue(maxsize=self.__queue_size)
+        stop = threading.Event()
+        end = object()
+        pool = ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix="ImportWorker")
+
+        def put(item: any) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read() -> None:
+            try:
+                for chunk in chunks:
+                    if stop.is_set() or self.__is_cancelled():
+                        break
+                    if not put(pool.submit(self.__process, parse, chunk)):
+                        break
+            except Exception as e:
+                put(_StageError(e))
+            finally:
+                put(end)
+
+        reader = threading.Thread(target=read, name="ImportReader", daemon=True)
+        reader.start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is end:
+                    break
+                if isinstance(item, _StageError):
+                    raise item.error
+                yield item.result()
+
+        finally:
+            stop.set()
+            while reader.is_alive() or not results.empty():
+                try:
+                    item = results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if isinstance(item, Future):
+                    item.cancel()
+
+            reader.join()
+            pool.shutdown(wait=True)
+            self.__logger.debug("import pipeline stopped")
+
+    #
+    # private functions
+    #
+
+    def __process(self, parse: Callable or None, chunk: any) -> Tuple[ImportData, any]:
+        """
+        worker function: parses the chunk and runs the transform stage
+        :param parse: parse function or None, if the chunk is already parsed
+        :param chunk: raw or parsed chunk
+        :return: a tuple of the parsed chunk and the transform result
+        """
+        if parse is not None:
+            chunk = parse(chunk)
+        return chunk, self.__transform(chunk)
@@ -40,6 +40,19 @@ from GeologicalDataProcessing.resources import *
 # import tests
 from GeologicalDataProcessing.tests.miscellaneouse.test_ExceptionHandling import TestExceptionHandlingClass
 from GeologicalDataProcessing.tests.import_tests.test_point_import import TestPointImportClass
+from GeologicalDataProcessing.tests.import_tests.test_import_data import TestImportDataClass
+from GeologicalDataProcessing.tests.import_tests.test_bulk_writer import TestBulkWriterClass
+from GeologicalDataProcessing.tests.import_tests.test_stratigraphy_cache import TestStratigraphyCacheClass
+from GeologicalDataProcessing.tests.import_tests.test_object_prefetch import TestObjectPrefetchClass
+from GeologicalDataProcessing.tests.import_tests.test_well_log_import import TestWellLogImportClass
+from GeologicalDataProcessing.tests.database_tests.test_database_service import TestDatabaseServiceClass
+from GeologicalDataProcessing.tests.miscellaneouse.test_log_writer import TestLogWriterClass
+from GeologicalDataProcessing.tests.miscellaneouse.test_qgis_log_handler import TestQGISLogHandlerClass
+from GeologicalDataProcessing.tests.miscellaneouse.test_progress_reporter import TestProgressReporterClass
+from GeologicalDataProcessing.tests.import_tests.test_import_pipeline import TestImportPipelineClass
+from GeologicalDataProcessing.tests.import_tests.test_mapped_file import TestMappedFileClass
+from GeologicalDataProcessing.tests.import_tests.test_file_metadata import TestFileMetadataClass
+from GeologicalDataProcessing.tests.import_tests.test_transaction_policy import TestTransactionPolicyClass
 
 # miscellaneous
 import GeologicalDataProcessing.config as config
@@ -236,6 +249,9 @@ class GeologicalDataProcessing:
         # remove the toolbar
         del self.toolbar
 
+        # write all pending log messages
+        QGISLogHandler.shutdown()
+
     # --------------------------------------------------------------------------
 
     def run(self) -> None:
@@ -357,6 +373,19 @@ class GeologicalDataProcessing:
         suite = unittest.TestSuite()
 
         suite.addTests(loader.loadTestsFromTestCase(TestExceptionHandlingClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestImportDataClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestBulkWriterClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestStratigraphyCacheClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestObjectPrefetchClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestWellLogImportClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestDatabaseServiceClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestLogWriterClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestQGISLogHandlerClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestProgressReporterClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestImportPipelineClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestMappedFileClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestFileMetadataClass))
+        suite.addTests(loader.loadTestsFromTestCase(TestTransactionPolicyClass))
 
         test_cases = loader.getTestCaseNames(TestPointImportClass)
         for name in test_cases:
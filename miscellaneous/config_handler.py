@@ -35,6 +35,103 @@ class ConfigHandler:
         if debug != "":
             config.debug = True if debug.lower() in ["true", "yes", "on", "1"] else False
 
+        log_queue_size = self.get("General", "log queue size")
+        if log_queue_size != "":
+            config.log_queue_size = max(int(log_queue_size), 1)
+
+        log_flush_interval = self.get("General", "log flush interval")
+        if log_flush_interval != "":
+            config.log_flush_interval = float(log_flush_interval)
+
+        progress_interval = self.get("General", "progress interval")
+        if progress_interval != "":
+            config.progress_interval = float(progress_interval)
+
+        chunk_size = self.get("Import", "chunk size")
+        if chunk_size != "":
+            config.import_chunk_size = max(int(chunk_size), 1)
+
+        batch_size = self.get("Import", "batch size")
+        if batch_size != "":
+            config.import_batch_size = max(int(batch_size), 1)
+
+        commit_interval = self.get("Import", "commit interval")
+        if commit_interval != "":
+            config.import_commit_interval = max(float(commit_interval), 0.0)
+
+        isolate_errors = self.get("Import", "isolate errors")
+        if isolate_errors != "":
+            config.import_isolate_errors = True if isolate_errors.lower() in ["true", "yes", "on", "1"] else False
+
+        fast_load = self.get("Import", "fast load")
+        if fast_load != "":
+            config.import_fast_load = True if fast_load.lower() in ["true", "yes", "on", "1"] else False
+
+        group_logs = self.get("Import", "group well logs")
+        if group_logs != "":
+            config.import_group_well_logs = True if group_logs.lower() in ["true", "yes", "on", "1"] else False
+
+        workers = self.get("Import", "workers")
+        if workers != "":
+            config.import_workers = max(int(workers), 1)
+
+        queue_size = self.get("Import", "queue size")
+        if queue_size != "":
+            config.import_queue_size = max(int(queue_size), 1)
+
+        parse_processes = self.get("Import", "parse processes")
+        if parse_processes != "":
+            config.import_parse_processes = max(int(parse_processes), 0)
+
+        parallel_parse_size = self.get("Import", "parallel parse size")
+        if parallel_parse_size != "":
+            config.import_parallel_parse_size = max(int(parallel_parse_size), 0)
+
+        decompress_threads = self.get("Import", "decompress threads")
+        if decompress_threads != "":
+            config.import_decompress_threads = max(int(decompress_threads), 0)
+
+        sample_rows = self.get("Import", "sample rows")
+        if sample_rows != "":
+            config.import_sample_rows = max(int(sample_rows), 1)
+
+        cache_directory = self.get("Import", "cache directory")
+        if cache_directory != "":
+            config.import_cache_directory = cache_directory
+
+        cache_size = self.get("Import", "cache size")
+        if cache_size != "":
+            config.import_cache_size = max(int(cache_size), 0)
+
+        pool_size = self.get("Database", "pool size")
+        if pool_size != "":
+            config.db_pool_size = max(int(pool_size), 1)
+
+        max_overflow = self.get("Database", "max overflow")
+        if max_overflow != "":
+            config.db_max_overflow = max(int(max_overflow), 0)
+
+        pre_ping = self.get("Database", "pool pre ping")
+        if pre_ping != "":
+            config.db_pool_pre_ping = True if pre_ping.lower() in ["true", "yes", "on", "1"] else False
+
+        pool_recycle = self.get("Database", "pool recycle")
+        if pool_recycle != "":
+            config.db_pool_recycle = int(pool_recycle)
+
+        for pragma in config.sqlite_pragmas:
+            value = self.get("SQLite", pragma)
+            if value != "":
+                config.sqlite_pragmas[pragma] = value
+
+        bulk_load = self.get("SQLite", "bulk load")
+        if bulk_load != "":
+            config.sqlite_bulk_load = True if bulk_load.lower() in ["true", "yes", "on", "1"] else False
+
+        import_synchronous = self.get("SQLite", "import synchronous")
+        if import_synchronous != "":
+            config.sqlite_import_synchronous = import_synchronous
+
     def get(self, section: str, option: str) -> str:
         return self.__config_parser.get(section, option, fallback="")
 
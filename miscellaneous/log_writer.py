@@ -0,0 +1,194 @@
+# -*- coding: UTF-8 -*-
+"""
+Module providing a background writer for log messages
+"""
+
+import atexit
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, TextIO, Tuple
+
+
+class LogWriter:
+    """
+    Writes log records in a dedicated thread. The records are collected in a bounded queue, so the logging thread
+    only pays for the enqueue operation. The writer thread formats the records, writes them in batches to persistent
+    log file handles, which are flushed periodically, and dispatches the messages for the QGIS message log in batches
+    of equal message levels.
+
+    If the queue is full, the logging thread blocks until the writer caught up, so no records are lost.
+    """
+
+    # record kinds
+    __FILE = 0
+    __DISPATCH = 1
+    __FLUSH = 2
+    __STOP = 3
+
+    max_batch = 1000
+    """maximum number of records processed at once"""
+
+    def __init__(self, dispatch: Callable[[str, any], None], queue_size: int, flush_interval: float) -> None:
+        """
+        :param dispatch: function called with the joined messages and the message level of a dispatch batch
+        :param queue_size: maximum number of queued records
+        :param flush_interval: seconds between two flushes of the log files
+        """
+        self.__dispatch = dispatch
+        self.__queue = queue.Queue(maxsize=max(int(queue_size), 1))
+        self.__flush_interval = max(float(flush_interval), 0.01)
+        self.__files: Dict[str, TextIO] = dict()
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+        atexit.register(self.stop)
+
+    #
+    # public functions
+    #
+
+    def write(self, path: str, name: str, level: str, title: str, text: str = None) -> None:
+        """
+        Queues a log file record, the timestamp is taken now and formatted by the writer thread
+        :param path: path of the log file
+        :param name: name of the logger
+        :param level: name of the message level
+        :param title: message title
+        :param text: message text
+        :return: Nothing
+        """
+        self.__put((self.__FILE, path, (time.time(), name, level, title, text)))
+
+    def dispatch(self, message: str, level: any) -> None:
+        """
+        Queues a message for the dispatch function
+        :param message: message text
+        :param level: message level, messages with equal levels are joined
+        :return: Nothing
+        """
+        self.__put((self.__DISPATCH, level, message))
+
+    def flush(self) -> None:
+        """
+        Blocks until all queued records are written and the log files are flushed
+        :return: Nothing
+        """
+        if self.__thread is not None:
+            self.__put((self.__FLUSH, None, None))
+            self.__queue.join()
+
+    def stop(self) -> None:
+        """
+        Writes all queued records, closes the log files and stops the writer thread
+        :return: Nothing
+        """
+        with self.__lock:
+            thread = self.__thread
+            if thread is None:
+                return
+
+            self.__queue.put((self.__STOP, None, None))
+            thread.join()
+            self.__thread = None
+
+    #
+    # private functions
+    #
+
+    def __put(self, record: Tuple) -> None:
+        """
+        Starts the writer thread if necessary and queues the record
+        :param record: record to queue
+        :return: Nothing
+        """
+        if self.__thread is None:
+            with self.__lock:
+                if self.__thread is None:
+                    self.__thread = threading.Thread(target=self.__run, name="LogWriter", daemon=True)
+                    self.__thread.start()
+
+        self.__queue.put(record)
+
+    def __run(self) -> None:
+        """
+        writer thread function
+        :return: Nothing
+        """
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            try:
+                records = [self.__queue.get(timeout=self.__flush_interval)]
+            except queue.Empty:
+                records = list()
+
+            while len(records) < self.max_batch:
+                try:
+                    records.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            kinds = set(record[0] for record in records)
+            running = self.__STOP not in kinds
+
+            try:
+                self.__write_batch(records)
+                if (not running) or (self.__FLUSH in kinds) or (time.monotonic() - last_flush >= self.__flush_interval):
+                    for logfile in self.__files.values():
+                        logfile.flush()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                sys.stderr.write("LogWriter: cannot write log records: {}\n".format(e))
+
+            for _ in records:
+                self.__queue.task_done()
+
+        for logfile in self.__files.values():
+            logfile.close()
+        self.__files = dict()
+
+    def __write_batch(self, records: List[Tuple]) -> None:
+        """
+        Writes the file records grouped by log file and dispatches consecutive messages of the same level at once
+        :param records: records to process
+        :return: Nothing
+        """
+        lines: Dict[str, List[str]] = dict()
+        messages: List[str] = list()
+        last_level = None
+
+        for kind, key, value in records:
+            if kind == self.__FILE:
+                lines.setdefault(key, list()).append(self.__format(*value))
+            elif kind == self.__DISPATCH:
+                if (key != last_level) and (len(messages) > 0):
+                    self.__dispatch("\n".join(messages), last_level)
+                    messages = list()
+                messages.append(value)
+                last_level = key
+
+        if len(messages) > 0:
+            self.__dispatch("\n".join(messages), last_level)
+
+        for path, path_lines in lines.items():
+            if path not in self.__files:
+                self.__files[path] = open(path, "a")
+            self.__files[path].write("".join(path_lines))
+
+    @staticmethod
+    def __format(timestamp: float, name: str, level: str, title: str, text: str or None) -> str:
+        """
+        formats a log file record
+        :return: the log file line
+        """
+        line = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        if name != "":
+            line = "{} - {}".format(line, name)
+        line = "{} - {} - {}".format(line, level, title)
+        if text is not None:
+            line = "{}: {}".format(line, text)
+
+        return "{}\n".format(line)
@@ -0,0 +1,71 @@
+# -*- coding: UTF-8 -*-
+"""
+Module providing a throttled progress reporter for long running processes
+"""
+
+import time
+from typing import Callable
+
+import GeologicalDataProcessing.config as config
+
+
+class ProgressReporter:
+    """
+    Reduces the number of progress notifications of a long running process. A new value is only emitted, if the
+    integer percentage changed or the last notification is older than the given interval. Additionally, the processing
+    rate and the estimated remaining time are reported together with the progress.
+    """
+
+    def __init__(self, emit_progress: Callable[[int], None], emit_rate: Callable[[float, float], None] = None,
+                 interval: float = None) -> None:
+        """
+        :param emit_progress: function called with the progress in percent (0 - 100)
+        :param emit_rate: function called with the processed rows per second and the estimated remaining seconds
+                          (-1 if unknown)
+        :param interval: maximum number of seconds between two notifications, defaults to config.progress_interval
+        """
+        self.__emit_progress = emit_progress
+        self.__emit_rate = emit_rate
+        self.__interval = config.progress_interval if interval is None else float(interval)
+
+        self.__start = time.monotonic()
+        self.__last_time = self.__start
+        self.__last_value = -1
+
+    #
+    # public functions
+    #
+
+    def start(self) -> None:
+        """
+        Resets the reporter at the beginning of a new process
+        :return: Nothing
+        """
+        self.__start = time.monotonic()
+        self.__last_time = self.__start
+        self.__last_value = -1
+
+    def report(self, percent: float, rows: int = None) -> None:
+        """
+        Reports the current progress. The progress is only emitted, if the integer percentage changed or the
+        interval elapsed since the last notification.
+        :param percent: current progress in percent
+        :param rows: number of rows processed so far, used to calculate the processing rate
+        :return: Nothing
+        """
+        value = min(max(int(percent), 0), 100)
+        now = time.monotonic()
+        if (value == self.__last_value) and (now - self.__last_time < self.__interval):
+            return
+
+        self.__last_value = value
+        self.__last_time = now
+        self.__emit_progress(value)
+
+        elapsed = now - self.__start
+        if (self.__emit_rate is None) or (rows is None) or (elapsed <= 0):
+            return
+
+        # remaining time is unknown (-1) until the first progress is made
+        remaining = elapsed * max(100 - percent, 0) / percent if percent > 0 else -1.0
+        self.__emit_rate(rows / elapsed, remaining)
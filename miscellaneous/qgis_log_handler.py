@@ -6,14 +6,15 @@ Python Module for pushing debug messages to QGIS
 import os
 import platform
 import tempfile
-from datetime import datetime
 from enum import Enum
+from typing import Callable, Tuple
 
 # noinspection PyUnresolvedReferences
 from qgis.core import Qgis, QgsMessageLog
 from qgis.gui import QgisInterface
 
 import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.log_writer import LogWriter
 
 
 class LogLevel(Enum):
@@ -44,18 +45,31 @@ def push_to_qgislogging(title: str, text: str = None, level: LogLevel = LogLevel
         msg = "{} - {}".format(text, title)
     else:
         msg = title
-    QgsMessageLog().logMessage(msg, tag="GeologicalDataProcessing", level=loglevel,
-                               notifyUser=True)
+    QGISLogHandler.get_writer().dispatch(msg, loglevel)
+
+
+def _log_message(msg: str, level: Qgis.MessageLevel) -> None:
+    """
+    Writes a (batch) message to the QGIS message log, called by the log writer thread
+    :param msg: message to write to the QGIS messagelog
+    :param level: QGIS message level
+    :return: Nothing
+    """
+    QgsMessageLog().logMessage(msg, tag="GeologicalDataProcessing", level=level, notifyUser=True)
 
 
 class QGISLogHandler:
     """
     Singleton class for pushing log messages to QGIS and / or a log file
+
+    Log file lines and QGIS message log entries are written asynchronously by a shared
+    :class:`~GeologicalDataProcessing.miscellaneous.log_writer.LogWriter`.
     """
     __iface = None
     __instance = None
     __logfile = ""
     __to_file = False
+    __writer = None
 
     # def __new__(cls) -> "QGISLogHandler":
     #     """
@@ -72,7 +86,7 @@ class QGISLogHandler:
 
     def __push_to_logfile(self, title: str, text: str = None, level: LogLevel = LogLevel.INFO) -> None:
         """
-        Writes the string text to self.__logfile
+        Queues the string text for self.__logfile
         :param title: message title
         :param text: message to write to the QGIS messagebar / messagelog
         :param level: QGIS message level (standard: 0 -> QgsMessageLog.INFO)
@@ -82,15 +96,7 @@ class QGISLogHandler:
             assert "log file not known..."
 
         if (level != LogLevel.DEBUG) or config.debug:
-            with open(self.__logfile, "a") as logfile:
-                line = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                if self.name != "":
-                    line = "{} - {}".format(line, self.name)
-                line = "{} - {} - {}".format(line, level.name, title)
-                if text is not None:
-                    line = "{}: {}".format(line, text)
-
-                logfile.write("{}\n".format(line))
+            self.get_writer().write(self.__logfile, self.name, level.name, title, text)
 
     def __push_to_qgis(self, title: str, text: str, level: LogLevel = LogLevel.INFO) -> None:
         """
@@ -125,16 +131,41 @@ class QGISLogHandler:
                 # level == LogLevel.DEBUG => do nothing
                 pass
 
-    def push_message(self, title: str, text: str = None, level: LogLevel = LogLevel.INFO, only_logfile: bool = False,
-                     to_messagebar: bool = False):
+    def is_enabled(self, level: LogLevel) -> bool:
         """
-        :param title: message title
-        :param text: message to write to the QGIS messagebar / messagelog
+        Fast check, if messages of the given level are written anywhere. Debug messages are only written to the log
+        file and only if debugging is activated.
+        :param level: message level
+        :return: True, if messages of this level are logged
+        """
+        if level == LogLevel.DEBUG:
+            return self.__to_file and config.debug
+        return True
+
+    def push_message(self, title: str or Callable[[], str], text: str or Callable[[], str] = None,
+                     level: LogLevel = LogLevel.INFO, only_logfile: bool = False, to_messagebar: bool = False,
+                     args: Tuple = ()):
+        """
+        Title and text are formatted lazily: callables are only called and args are only inserted into the title via
+        str.format, if the message is written at all.
+        :param title: message title or a callable returning it
+        :param text: message to write to the QGIS messagebar / messagelog or a callable returning it
         :param level: QGIS message level (standard: 0 -> QgsMessageLog.INFO)
         :param only_logfile: Don't write output to QGIS interface, even if it is set
         :param to_messagebar: Notify user with messagebar notification
+        :param args: format arguments for the title
         :return: Nothing
         """
+        if not self.is_enabled(level):
+            return
+
+        if callable(title):
+            title = title()
+        if len(args) > 0:
+            title = title.format(*args)
+        if callable(text):
+            text = text()
+
         if self.__to_file:
             self.__push_to_logfile(title, text, level)
         if not only_logfile:
@@ -142,50 +173,86 @@ class QGISLogHandler:
         if (self.__iface is not None) and to_messagebar:
             self.__push_to_qgis(title, text, level)
 
-    def debug(self, title: str, text: str = None) -> None:
+    def debug(self, title: str or Callable[[], str], text: str or Callable[[], str] = None, args: Tuple = ()) -> None:
         """
-        Log a debug message
-        :param title: title to be logged
-        :param text: text to be logged
+        Log a debug message. Use args or callables instead of preformatted strings inside loops, they are only
+        evaluated if debug logging is enabled.
+        :param title: title to be logged or a callable returning it
+        :param text: text to be logged or a callable returning it
+        :param args: format arguments for the title
         :return: Nothing
         """
-        self.push_message(title=title, text=text, level=LogLevel.DEBUG)
+        self.push_message(title=title, text=text, level=LogLevel.DEBUG, args=args)
 
-    def error(self, title: str, text: str = None, only_logfile: bool = False, to_messagebar: bool = False) -> None:
+    def error(self, title: str or Callable[[], str], text: str or Callable[[], str] = None,
+              only_logfile: bool = False, to_messagebar: bool = False, args: Tuple = ()) -> None:
         """
         Log an error message
         :param title: title to be logged
         :param text: text to be logged
         :param only_logfile: Don't write output to QGIS interface, even if it is set
         :param to_messagebar: Notify user with messagebar notification
+        :param args: format arguments for the title
         :return: Nothing
         """
         self.push_message(title=title, text=text, level=LogLevel.CRITICAL, only_logfile=only_logfile,
-                          to_messagebar=to_messagebar)
+                          to_messagebar=to_messagebar, args=args)
 
-    def info(self, title: str, text: str = None, only_logfile: bool = False, to_messagebar: bool = False) -> None:
+    def info(self, title: str or Callable[[], str], text: str or Callable[[], str] = None,
+             only_logfile: bool = False, to_messagebar: bool = False, args: Tuple = ()) -> None:
         """
         Log an info message
         :param title: title to be logged
         :param text: text to be logged
         :param only_logfile: Don't write output to QGIS interface, even if it is set
         :param to_messagebar: Notify user with messagebar notification
+        :param args: format arguments for the title
         :return: Nothing
         """
         self.push_message(title=title, text=text, level=LogLevel.INFO, only_logfile=only_logfile,
-                          to_messagebar=to_messagebar)
+                          to_messagebar=to_messagebar, args=args)
 
-    def warn(self, title: str, text: str = None, only_logfile: bool = False, to_messagebar: bool = False) -> None:
+    def warn(self, title: str or Callable[[], str], text: str or Callable[[], str] = None,
+             only_logfile: bool = False, to_messagebar: bool = False, args: Tuple = ()) -> None:
         """
         Log a warning message
         :param title: title to be logged
         :param text: text to be logged
         :param only_logfile: Don't write output to QGIS interface, even if it is set
         :param to_messagebar: Notify user with messagebar notification
+        :param args: format arguments for the title
         :return: Nothing
         """
         self.push_message(title=title, text=text, level=LogLevel.WARNING, only_logfile=only_logfile,
-                          to_messagebar=to_messagebar)
+                          to_messagebar=to_messagebar, args=args)
+
+    @staticmethod
+    def get_writer() -> LogWriter:
+        """
+        Returns the background writer shared by all log handlers
+        :return: the background writer shared by all log handlers
+        """
+        if QGISLogHandler.__writer is None:
+            QGISLogHandler.__writer = LogWriter(_log_message, config.log_queue_size, config.log_flush_interval)
+        return QGISLogHandler.__writer
+
+    @staticmethod
+    def flush() -> None:
+        """
+        Blocks until all queued log messages are written
+        :return: Nothing
+        """
+        if QGISLogHandler.__writer is not None:
+            QGISLogHandler.__writer.flush()
+
+    @staticmethod
+    def shutdown() -> None:
+        """
+        Writes all queued log messages, closes the log file and stops the background writer
+        :return: Nothing
+        """
+        if QGISLogHandler.__writer is not None:
+            QGISLogHandler.__writer.stop()
 
     # setter and getter
     @property
@@ -0,0 +1,462 @@
+# -*- coding: UTF-8 -*-
+"""
+Defines the columnar data model of parsed import files
+"""
+
+from collections.abc import Mapping, Sequence
+from enum import Enum, unique
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+
+@unique
+class ColumnTypes(Enum):
+    """Enum defining the data types of parsed import columns"""
+    INT = 0
+    """column contains only integer values"""
+    FLOAT = 1
+    """column contains floating point values"""
+    TEXT = 2
+    """column contains at least one non numeric value"""
+    EMPTY = 3
+    """column contains no values at all"""
+
+
+class ImportColumn:
+    """
+    Single column of a parsed import file.
+
+    Numeric columns are stored as a typed numpy array together with a validity mask, empty cells are masked out. Text
+    columns are stored as categorical codes referencing an array of unique values, which keeps columns with few
+    distinct values (stratigraphy, set names, ...) small.
+
+    The text of a cell is always the original cell string. If the numeric values of a column don't reproduce the
+    original strings (e.g. "0815", "1.50" or "1e3"), the strings are kept additionally.
+    """
+
+    def __init__(self, name: str, unit: str, dtype: ColumnTypes, values: np.ndarray, mask: np.ndarray,
+                 categories: np.ndarray = None, raw: np.ndarray = None) -> None:
+        """
+        :param name: column name
+        :param unit: unit of the column (second line of the import file)
+        :param dtype: data type of the column
+        :param values: numeric values or, for text columns, category codes
+        :param mask: boolean array, True for each non empty cell
+        :param categories: unique values of a text column, None otherwise
+        :param raw: original cell strings of a numeric column, None if the formatted values are equal to them
+        :raises ValueError: if a text column has no categories
+        """
+        if dtype == ColumnTypes.TEXT and categories is None:
+            raise ValueError("text column {} needs categories".format(name))
+
+        self.__name = name
+        self.__unit = unit
+        self.__dtype = dtype
+        self.__values = values
+        self.__mask = mask
+        self.__categories = categories
+        self.__raw = raw if dtype in (ColumnTypes.INT, ColumnTypes.FLOAT) else None
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __repr__(self) -> str:
+        return "ImportColumn <{}, {}, {}, {} rows>".format(self.name, self.unit, self.dtype.name, len(self))
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the column name
+        :return: the column name
+        """
+        return self.__name
+
+    @property
+    def unit(self) -> str:
+        """
+        Returns the unit of the column
+        :return: the unit of the column
+        """
+        return self.__unit
+
+    @property
+    def dtype(self) -> ColumnTypes:
+        """
+        Returns the data type of the column
+        :return: the data type of the column
+        """
+        return self.__dtype
+
+    @property
+    def is_number(self) -> bool:
+        """
+        Returns True, if the column is an integer or float column
+        :return: True, if the column is an integer or float column
+        """
+        return self.__dtype in (ColumnTypes.INT, ColumnTypes.FLOAT)
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Returns the numeric values or the category codes of a text column. Masked cells have undefined values.
+        :return: the numeric values or the category codes of a text column
+        """
+        return self.__values
+
+    @property
+    def mask(self) -> np.ndarray:
+        """
+        Returns the validity mask of the column, True for each non empty cell
+        :return: the validity mask of the column
+        """
+        return self.__mask
+
+    @property
+    def categories(self) -> np.ndarray or None:
+        """
+        Returns the unique values of a text column or None for all other column types
+        :return: the unique values of a text column or None
+        """
+        return self.__categories
+
+    @property
+    def raw(self) -> np.ndarray or None:
+        """
+        Returns the original cell strings of a numeric column or None, if the formatted values are equal to them
+        :return: the original cell strings or None
+        """
+        return self.__raw
+
+    #
+    # public functions
+    #
+
+    def is_valid(self, index: int) -> bool:
+        """
+        Returns True, if the cell at index is not empty
+        :param index: row index
+        :return: True, if the cell at index is not empty
+        """
+        return bool(self.__mask[index])
+
+    def get(self, index: int, default: any = None) -> any:
+        """
+        Returns the value at index as python object (int, float or str) or default, if the cell is empty
+        :param index: row index
+        :param default: value returned for empty cells
+        :return: the value at index or default
+        """
+        if not self.__mask[index]:
+            return default
+
+        if self.__dtype == ColumnTypes.TEXT:
+            return str(self.__categories[self.__values[index]])
+        if self.__dtype == ColumnTypes.INT:
+            return int(self.__values[index])
+        return float(self.__values[index])
+
+    def text(self, index: int) -> str:
+        """
+        Returns the original string of the cell at index, empty cells are returned as empty string
+        :param index: row index
+        :return: the value at index as string
+        """
+        if not self.__mask[index]:
+            return ""
+        return str(self.strings(index, index + 1)[0])
+
+    def to_list(self) -> List[str]:
+        """
+        Returns the column as list of the original cell strings
+        :return: the column as list of strings
+        """
+        return np.where(self.__mask, self.strings(), "").tolist()
+
+    def strings(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Returns the original strings of the rows [start, stop). Empty cells have undefined values.
+        :param start: first row
+        :param stop: row after the last one, defaults to the end of the column
+        :return: array of strings
+        """
+        if self.__raw is not None:
+            return self.__raw[start:stop]
+        if self.__dtype == ColumnTypes.TEXT:
+            return self.__categories[self.__values[start:stop]]
+        if self.__dtype == ColumnTypes.EMPTY:
+            return np.full(len(self.__values[start:stop]), "")
+        return self.__values[start:stop].astype(str)
+
+    def to_values(self, default: any = None, as_float: bool = False) -> List:
+        """
+        Converts the whole column at once into a list of python objects (int, float or str), like :meth:`get` for
+        each single cell
+        :param default: value used for empty cells
+        :param as_float: convert the values of numeric columns to float
+        :return: the list of values
+        :raises ValueError: if as_float is set for a text column
+        """
+        if self.__dtype == ColumnTypes.TEXT:
+            if as_float:
+                raise ValueError("text column {} cannot be converted to float".format(self.__name))
+            categories = self.__categories.tolist()
+            values = [categories[code] for code in self.__values.tolist()]
+        elif as_float or self.__dtype != ColumnTypes.INT:
+            values = self.__values.astype(np.float64).tolist()
+        else:
+            values = self.__values.tolist()
+
+        if self.__mask.all():
+            return values
+        return [value if valid else default for value, valid in zip(values, self.__mask.tolist())]
+
+    def slice(self, start: int, stop: int) -> "ImportColumn":
+        """
+        Returns a new column with the rows [start, stop). Numeric values and masks are numpy views, no data is copied.
+        :param start: first row
+        :param stop: row after the last one
+        :return: a new column with the rows [start, stop)
+        """
+        return ImportColumn(self.__name, self.__unit, self.__dtype, self.__values[start:stop],
+                            self.__mask[start:stop], self.__categories,
+                            None if self.__raw is None else self.__raw[start:stop])
+
+    @classmethod
+    def from_strings(cls, name: str, unit: str, strings: List[str] or np.ndarray,
+                     dtype: ColumnTypes = None) -> "ImportColumn":
+        """
+        Parses a list of cell strings into a typed column. A column is numeric, if every non empty cell can be
+        converted, integers are preferred over floats.
+
+        The conversion is done for the whole column at once. An expected data type, e.g. inferred from sample rows,
+        skips the conversions, which are known to fail: a FLOAT column isn't tried as INT and a TEXT column isn't
+        tried as number. The column falls back to the next type, if the expected type doesn't fit.
+        :param name: column name
+        :param unit: column unit
+        :param strings: cell values
+        :param dtype: expected data type of the column or None, if unknown
+        :return: the parsed column
+        """
+        raw = np.asarray(strings, dtype=str)
+        mask = raw != ""
+
+        if not mask.any():
+            return cls(name, unit, ColumnTypes.EMPTY, np.full(len(raw), np.nan), mask)
+
+        if dtype not in (ColumnTypes.FLOAT, ColumnTypes.TEXT):
+            try:
+                values = np.where(mask, raw, "0").astype(np.int64)
+                return cls(name, unit, ColumnTypes.INT, values, mask, raw=cls.__inexact(values, mask, raw))
+            except (ValueError, OverflowError):
+                pass
+
+        if dtype != ColumnTypes.TEXT:
+            try:
+                values = np.where(mask, raw, "nan").astype(np.float64)
+                return cls(name, unit, ColumnTypes.FLOAT, values, mask, raw=cls.__inexact(values, mask, raw))
+            except ValueError:
+                pass
+
+        categories, codes = np.unique(raw, return_inverse=True)
+        return cls(name, unit, ColumnTypes.TEXT, codes.astype(np.int32), mask, categories)
+
+    @classmethod
+    def concat(cls, parts: List["ImportColumn"]) -> "ImportColumn":
+        """
+        Concatenates parts of the same column, e.g. parsed from consecutive ranges of an import file. The result has
+        the same type as a column parsed at once: integer parts are widened to floats, if at least one part contains
+        floating point values. Text parts can only be combined with other text parts or empty parts.
+        :param parts: list of column parts in file order, name and unit are taken from the first part
+        :return: the concatenated column
+        :raises ValueError: if the list is empty or text parts are mixed with numeric parts
+        """
+        if len(parts) == 0:
+            raise ValueError("no column parts to concatenate")
+
+        name = parts[0].name
+        unit = parts[0].unit
+        mask = np.concatenate([part.mask for part in parts])
+        types = set(part.dtype for part in parts) - {ColumnTypes.EMPTY}
+
+        if len(types) == 0:
+            return cls(name, unit, ColumnTypes.EMPTY, np.full(len(mask), np.nan), mask)
+
+        if ColumnTypes.TEXT in types:
+            if len(types) > 1:
+                raise ValueError("cannot concatenate text and numeric parts of column {}".format(name))
+
+            raw = np.concatenate([np.full(len(part), "") if part.dtype == ColumnTypes.EMPTY
+                                  else part.categories[part.values] for part in parts])
+            categories, codes = np.unique(raw, return_inverse=True)
+            return cls(name, unit, ColumnTypes.TEXT, codes.astype(np.int32), mask, categories)
+
+        # parts of another type or with original strings may be formatted differently after the concatenation
+        dtype = ColumnTypes.INT if types == {ColumnTypes.INT} else ColumnTypes.FLOAT
+        strings = None
+        if any((part.raw is not None) or (part.dtype not in (dtype, ColumnTypes.EMPTY)) for part in parts):
+            strings = np.concatenate([part.strings() for part in parts])
+
+        if dtype == ColumnTypes.INT:
+            values = np.concatenate([np.zeros(len(part), dtype=np.int64) if part.dtype == ColumnTypes.EMPTY
+                                     else part.values for part in parts])
+        else:
+            values = np.concatenate([part.values.astype(np.float64) for part in parts])
+            values = np.where(mask, values, np.nan)
+
+        raw = None if strings is None else cls.__inexact(values, mask, strings)
+        return cls(name, unit, dtype, values, mask, raw=raw)
+
+    @staticmethod
+    def __inexact(values: np.ndarray, mask: np.ndarray, strings: np.ndarray) -> np.ndarray or None:
+        """
+        Compares the formatted numeric values with the original cell strings
+        :param values: numeric values
+        :param mask: validity mask
+        :param strings: original cell strings
+        :return: the original strings, if at least one non empty cell differs from its formatted value, else None
+        """
+        if np.array_equal(values.astype(str)[mask], strings[mask]):
+            return None
+        return strings
+
+
+class ColumnValues(Sequence):
+    """
+    read only list view on an :class:`ImportColumn` returning the cell values as strings
+    """
+
+    def __init__(self, column: ImportColumn) -> None:
+        self.__column = column
+
+    def __getitem__(self, index: int or slice) -> str or List[str]:
+        if isinstance(index, slice):
+            return [self.__column.text(i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index {} out of range".format(index))
+        return self.__column.text(index)
+
+    def __len__(self) -> int:
+        return len(self.__column)
+
+
+class ImportData(Mapping):
+    """
+    Columnar result of a parsed import file.
+
+    For compatibility, the object behaves like the former dictionary result of
+    :meth:`~GeologicalDataProcessing.services.import_service.ImportService.read_import_file`:
+    data[col] returns {"property": unit, "values": [str, ...]}, where "values" is a read only view on the typed column.
+    """
+
+    def __init__(self, columns: List[ImportColumn], offset: int = 0, progress: float = 1.0) -> None:
+        """
+        :param columns: list of parsed columns, all with the same length
+        :param offset: index of the first row inside the import file, used if the data is a chunk of a larger file
+        :param progress: part of the import file (0 - 1) which was read including this data
+        :raises ValueError: if the columns differ in length
+        """
+        if len(set(len(col) for col in columns)) > 1:
+            raise ValueError("columns differ in length")
+
+        self.__columns: Dict[str, ImportColumn] = dict()
+        for col in columns:
+            self.__columns[col.name] = col
+
+        self.__offset = int(offset)
+        self.__progress = float(progress)
+
+    def __getitem__(self, name: str) -> Dict:
+        column = self.__columns[name]
+        return {
+            "property": column.unit,
+            "values": ColumnValues(column)
+        }
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__columns)
+
+    def __len__(self) -> int:
+        return len(self.__columns)
+
+    def __repr__(self) -> str:
+        return "ImportData <{} columns, {} rows>".format(len(self), self.row_count)
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def columns(self) -> List[ImportColumn]:
+        """
+        Returns the list of columns
+        :return: the list of columns
+        """
+        return list(self.__columns.values())
+
+    @property
+    def offset(self) -> int:
+        """
+        Returns the index of the first row inside the import file
+        :return: the index of the first row inside the import file
+        """
+        return self.__offset
+
+    @property
+    def progress(self) -> float:
+        """
+        Returns the part of the import file (0 - 1) which was read including this data
+        :return: the part of the import file which was read including this data
+        """
+        return self.__progress
+
+    @property
+    def row_count(self) -> int:
+        """
+        Returns the number of data rows
+        :return: the number of data rows
+        """
+        if len(self.__columns) == 0:
+            return 0
+        return len(next(iter(self.__columns.values())))
+
+    #
+    # public functions
+    #
+
+    def column(self, name: str) -> ImportColumn:
+        """
+        Returns the column with the given name
+        :param name: name of the requested column
+        :return: the column with the given name
+        :raises KeyError: if no column with this name exists
+        """
+        return self.__columns[name]
+
+    def iter_chunks(self, chunk_size: int) -> Iterator["ImportData"]:
+        """
+        Iterates over the data in chunks of chunk_size rows. The chunks are views, no data is copied.
+        :param chunk_size: maximum number of rows per chunk
+        :return: an iterator over the chunks
+        :raises ValueError: if chunk_size is smaller than 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk size has to be larger than 0")
+
+        count = self.row_count
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            yield ImportData([col.slice(start, stop) for col in self.columns], self.__offset + start, stop / count)
+
+    def as_dict(self) -> Dict:
+        """
+        Returns a full copy of the data in the former dictionary format {col: {"property": unit, "values": [str]}}
+        :return: a full copy of the data in the former dictionary format
+        """
+        return {col.name: {"property": col.unit, "values": col.to_list()} for col in self.__columns.values()}
@@ -0,0 +1,837 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing batch wise database writers for the import controllers
+"""
+
+import time
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm.session import Session
+
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.log_model import PropertyImportData
+from GeologicalDataProcessing.services.copy_loader import CopyLoader
+from GeologicalDataProcessing.services.object_prefetch import query_size
+from GeologicalDataProcessing.services.transaction_policy import TransactionPolicy
+from geological_toolbox.db_handler import AbstractDBObject
+from geological_toolbox.exceptions import WellMarkerDepthException
+from geological_toolbox.geometries import GeoPoint, Line
+from geological_toolbox.properties import Property, PropertyTypes
+from geological_toolbox.stratigraphy import StratigraphicObject
+from geological_toolbox.wells import Well, WellMarker
+
+
+def property_value(value: any, property_type: PropertyTypes) -> str:
+    """
+    Converts a property value to its database representation, equal to the
+    :class:`~geological_toolbox.properties.Property` value setter
+    :param value: property value
+    :param property_type: type of the property
+    :return: the property value as string
+    :raises ValueError: if the value cannot be converted to the property type
+    """
+    value = str(value)
+    try:
+        if property_type == PropertyTypes.INT:
+            int(value)
+        elif property_type == PropertyTypes.FLOAT:
+            float(value)
+    except ValueError:
+        raise ValueError("Cannot convert property values [{}] to specified type {}".
+                         format(value, property_type.name))
+    return value
+
+
+class BulkWriter:
+    """
+    Base class for all bulk writers. Collected objects are written to the database, when the
+    :class:`~GeologicalDataProcessing.services.transaction_policy.TransactionPolicy` requests a commit or
+    :meth:`flush` is called. Each batch is written inside a savepoint and committed in a single transaction. A failing
+    batch is rolled back completely or, if the policy isolates errors, written again object by object. Objects, which
+    fail again, are skipped and listed in :attr:`failed`. If the policy isolates errors, objects with values, which
+    cannot be converted, are skipped and listed as well.
+
+    ORM objects added via :meth:`add_object` are flushed before the savepoint of the batch, their errors always fail
+    the batch.
+
+    If a :class:`~GeologicalDataProcessing.services.copy_loader.CopyLoader` is given, derived classes write their rows
+    with COPY. A failing COPY is rolled back to a savepoint and the writer falls back to ORM bulk inserts.
+    """
+
+    def __init__(self, session: Session, policy: TransactionPolicy, copy_loader: CopyLoader = None) -> None:
+        """
+        :param session: SQLAlchemy session used for all database requests
+        :param policy: defines, when the collected objects are committed
+        :param copy_loader: optional COPY loader for PostgreSQL databases
+        """
+        self._logger = QGISLogHandler(self.__class__.__name__)
+        self._session = session
+        self._policy = policy
+        self._copy_loader = copy_loader
+        self._pending = 0
+        self._written = 0
+
+        self.__last_commit = time.monotonic()
+        self.__replays: List[Callable[[], None] or None] = list()
+        self.__replaying = False
+        self.__failed: List[str] = list()
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def batch_size(self) -> int:
+        """
+        Returns the maximum number of objects written and committed at once
+        :return: the maximum number of objects written and committed at once
+        """
+        return self._policy.batch_size
+
+    @property
+    def pending(self) -> int:
+        """
+        Returns the number of collected objects, which are not yet written to the database
+        :return: the number of collected objects, which are not yet written to the database
+        """
+        return self._pending
+
+    @property
+    def written(self) -> int:
+        """
+        Returns the number of objects written to the database
+        :return: the number of objects written to the database
+        """
+        return self._written
+
+    @property
+    def failed(self) -> List[str]:
+        """
+        Returns the error messages of all objects, which were skipped because they could not be written
+        :return: one error message per skipped object
+        """
+        return list(self.__failed)
+
+    #
+    # public functions
+    #
+
+    def add_object(self, obj: AbstractDBObject) -> None:
+        """
+        Adds an ORM object, e.g. an updated database object, to the current batch
+        :param obj: ORM object to save
+        :return: Nothing
+        """
+        self._session.add(obj)
+        self._added()
+
+    def skip(self, message: str) -> None:
+        """
+        Skips an object, which was rejected before it could be added, e.g. a data row with invalid values
+        :param message: reason, why the object was skipped
+        :return: Nothing
+        """
+        self._logger.warn("Skipping object", message)
+        self.__failed.append(message)
+
+    def flush(self) -> None:
+        """
+        Writes all pending objects to the database and commits the transaction
+        :return: Nothing
+        :raises Exception: reraises all database errors after rolling back the current batch. If the policy isolates
+                           errors, failing objects are skipped instead.
+        """
+        if self._pending == 0:
+            return
+
+        skipped = len(self.__failed)
+
+        # objects loaded in advance (horizons, prefetched points, ...) stay usable after the batch commit instead of
+        # being reloaded one by one. The setting of the shared session is restored after the write.
+        expire_on_commit = self._session.expire_on_commit
+        self._session.expire_on_commit = False
+        try:
+            # ORM objects are written in the outer transaction
+            self._session.flush()
+            try:
+                with self._session.begin_nested():
+                    self._write_batch()
+            except Exception as e:
+                if not self._policy.isolate_errors:
+                    raise
+                self._logger.warn("Batch of {} objects failed, writing the objects one by one", str(e),
+                                  args=(self._pending,))
+                self.__write_isolated()
+
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            self.__reset()
+            raise
+        finally:
+            self._session.expire_on_commit = expire_on_commit
+
+        skipped = len(self.__failed) - skipped
+        self._logger.debug("batch of {} objects written, {} skipped", args=(self._pending - skipped, skipped))
+        self._written += self._pending - skipped
+        self.__reset()
+
+    #
+    # protected functions
+    #
+
+    def _added(self, replay: Callable[[], None] = None) -> None:
+        """
+        Counts a newly collected object and writes the batch, if the policy requests a commit
+        :param replay: function collecting the object again, used to write the objects of a failed batch one by one.
+                       None for ORM objects, which are part of the session.
+        :return: Nothing
+        """
+        if self.__replaying:
+            return
+
+        if self._policy.isolate_errors:
+            self.__replays.append(replay)
+
+        self._pending += 1
+        if self._policy.is_due(self._pending, self.__last_commit):
+            self.flush()
+
+    def _reject(self, error: Exception) -> None:
+        """
+        Skips an object, whose values cannot be converted, if the policy isolates errors
+        :param error: conversion error of the object
+        :return: Nothing
+        :raises Exception: reraises the error, if the policy does not isolate errors
+        """
+        if not self._policy.isolate_errors:
+            raise error
+        self.skip(str(error))
+
+    def _write_batch(self) -> None:
+        """
+        Writes the current batch and falls back to ORM bulk inserts, if COPY fails
+        :return: Nothing
+        """
+        if self._copy_loader is None:
+            self._write()
+            return
+
+        try:
+            with self._session.begin_nested():
+                self._write()
+        except Exception as e:
+            self._logger.warn("COPY failed, falling back to ORM bulk inserts", str(e))
+            self._copy_loader = None
+            self._write()
+
+    def _write(self) -> None:
+        """
+        Writes the collected objects to the database without committing. Has to be implemented by derived classes,
+        ORM objects added via :meth:`add_object` are written by the final commit.
+        :return: Nothing
+        """
+        pass
+
+    def _clear(self) -> None:
+        """
+        Clears the collected objects after a batch was written or rolled back
+        :return: Nothing
+        """
+        pass
+
+    def _horizon_id(self, horizon: StratigraphicObject or None) -> int:
+        """
+        Returns the database id of the horizon. New horizons are flushed immediately, so following requests of the
+        same horizon find the database entry.
+        :param horizon: stratigraphic object or None
+        :return: the database id of the horizon or -1 if horizon is None
+        """
+        if horizon is None:
+            return -1
+
+        # horizons inserted inside a rolled back savepoint are removed from the session
+        if (horizon.id is None) or (horizon not in self._session):
+            self._session.add(horizon)
+            self._session.flush()
+
+        return horizon.id
+
+    #
+    # private functions
+    #
+
+    def __write_isolated(self) -> None:
+        """
+        Writes the objects of a failed batch one by one, each inside its own savepoint. Objects, which cannot be
+        written, are skipped and their errors are stored.
+        :return: Nothing
+        """
+        self._clear()
+        self.__replaying = True
+        try:
+            for number, replay in enumerate(self.__replays):
+                if replay is None:
+                    continue
+
+                try:
+                    replay()
+                    with self._session.begin_nested():
+                        self._write_batch()
+                except Exception as e:
+                    self._logger.warn("Skipping object {} of the batch", str(e), args=(number + 1,))
+                    self.__failed.append(str(e))
+                finally:
+                    self._clear()
+        finally:
+            self.__replaying = False
+
+    def __reset(self) -> None:
+        """
+        Clears the collected objects after a batch was written or rolled back
+        :return: Nothing
+        """
+        self._clear()
+        self._pending = 0
+        self.__replays = list()
+        self.__last_commit = time.monotonic()
+
+
+class PointBulkWriter(BulkWriter):
+    """
+    Collects new GeoPoints together with their properties and writes them with SQLAlchemy bulk inserts instead of
+    separate ORM objects and commits for each point.
+    """
+
+    def __init__(self, session: Session, policy: TransactionPolicy, copy_loader: CopyLoader = None) -> None:
+        """
+        :param session: SQLAlchemy session used for all database requests
+        :param policy: defines, when the collected points are committed
+        :param copy_loader: optional COPY loader for PostgreSQL databases
+        """
+        super().__init__(session, policy, copy_loader)
+
+        self.__points: List[Dict] = list()
+        self.__properties: List[List[Dict]] = list()
+
+    def add_point(self, horizon: StratigraphicObject or None, reference: str, easting: float, northing: float,
+                  altitude: float or None, name: str = "", comment: str = "",
+                  properties: List[Tuple[PropertyImportData, any]] = None) -> None:
+        """
+        Adds a new point to the current batch. The values are converted the same way as the GeoPoint constructor does.
+        :param horizon: stratigraphic object of the point
+        :param reference: reference system of the point (e.g. WKT)
+        :param easting: easting coordinate
+        :param northing: northing coordinate
+        :param altitude: altitude of the point or None if the point has no z-value
+        :param name: point set name
+        :param comment: additional comment
+        :param properties: list of property definitions and related values
+        :return: Nothing
+        :raises ValueError: if a value cannot be converted and the policy does not isolate errors
+        """
+        try:
+            rows = [self._convert(horizon, reference, easting, northing, altitude, name, comment, properties)]
+        except ValueError as e:
+            self._reject(e)
+            return
+
+        self._collect(rows)
+        self._added(partial(self.add_point, horizon, reference, easting, northing, altitude, name, comment,
+                            properties))
+
+    #
+    # protected functions
+    #
+
+    def _convert(self, horizon: StratigraphicObject or None, reference: str, easting: float, northing: float,
+                 altitude: float or None, name: str = "", comment: str = "",
+                 properties: List[Tuple[PropertyImportData, any]] = None, line_id: int = None,
+                 line_pos: int = -1) -> Tuple[Dict, List[Dict]]:
+        """
+        Converts a point and its properties into database rows
+        :param horizon: stratigraphic object of the point
+        :param reference: reference system of the point (e.g. WKT)
+        :param easting: easting coordinate
+        :param northing: northing coordinate
+        :param altitude: altitude of the point or None if the point has no z-value
+        :param name: point set name
+        :param comment: additional comment
+        :param properties: list of property definitions and related values
+        :param line_id: id of the line, the point belongs to
+        :param line_pos: position of the point inside the line
+        :return: a tuple of the point row and the related property rows
+        :raises ValueError: if a value cannot be converted
+        """
+        point = {
+            "has_z": altitude is not None,
+            "horizon_id": self._horizon_id(horizon),
+            "reference": str(reference),
+            "east": float(easting),
+            "north": float(northing),
+            "alt": 0.0 if altitude is None else float(altitude),
+            "name_col": str(name)[:100],
+            "comment_col": str(comment)[:100],
+            "line_id": line_id,
+            "line_pos": line_pos
+        }
+
+        props = list()
+        for item, value in [] if properties is None else properties:
+            props.append({
+                "prop_name": str(item.name)[:100],
+                "prop_unit": str(item.unit)[:100],
+                "prop_type": item.property_type.name,
+                "prop_value": property_value(value, item.property_type),
+                "name_col": "",
+                "comment_col": ""
+            })
+
+        return point, props
+
+    def _collect(self, rows: List[Tuple[Dict, List[Dict]]]) -> None:
+        """
+        Adds converted points to the current batch without counting them as pending objects
+        :param rows: list of tuples of the point row and the related property rows
+        :return: Nothing
+        """
+        for point, props in rows:
+            self.__points.append(point)
+            self.__properties.append(props)
+
+    def _write(self) -> None:
+        """
+        Writes the collected points and properties with bulk inserts or COPY
+        :return: Nothing
+        """
+        if len(self.__points) == 0:
+            return
+
+        with_properties = any(len(props) > 0 for props in self.__properties)
+
+        if self._copy_loader is not None:
+            for point, _id in zip(self.__points, self._copy_loader.reserve_ids(GeoPoint, len(self.__points))):
+                point["id"] = _id
+            self._copy_loader.copy(GeoPoint, self.__points)
+        else:
+            # point ids are only needed to link the properties
+            self._session.bulk_insert_mappings(GeoPoint, self.__points, return_defaults=with_properties)
+
+        if not with_properties:
+            return
+
+        properties = list()
+        for point, props in zip(self.__points, self.__properties):
+            for prop in props:
+                prop["point_id"] = point["id"]
+                properties.append(prop)
+
+        if self._copy_loader is not None:
+            for prop, _id in zip(properties, self._copy_loader.reserve_ids(Property, len(properties))):
+                prop["id"] = _id
+            self._copy_loader.copy(Property, properties)
+        else:
+            self._session.bulk_insert_mappings(Property, properties)
+
+    def _clear(self) -> None:
+        """
+        Clears the collected points
+        :return: Nothing
+        """
+        self.__points = list()
+        self.__properties = list()
+
+
+class LineBulkWriter(PointBulkWriter):
+    """
+    Replaces the vertices of existing lines. The old vertices of all lines inside a batch are deleted together with
+    their properties by a single statement per table, the new vertices are written with bulk inserts. New lines are
+    added as ORM objects via :meth:`add_object`.
+    """
+
+    def __init__(self, session: Session, policy: TransactionPolicy, copy_loader: CopyLoader = None) -> None:
+        """
+        :param session: SQLAlchemy session used for all database requests
+        :param policy: defines, when the collected lines are committed
+        :param copy_loader: optional COPY loader for PostgreSQL databases
+        """
+        super().__init__(session, policy, copy_loader)
+
+        self.__lines: List[Dict] = list()
+
+    def replace_line(self, line_id: int, closed: bool, horizon: StratigraphicObject or None, reference: str,
+                     name: str, comment: str, vertices: List[Tuple]) -> None:
+        """
+        Adds an existing line to the current batch. All vertices of the line are replaced by the given ones.
+        :param line_id: database id of the line
+        :param closed: True, if the line is closed
+        :param horizon: stratigraphic object of the line and all its vertices
+        :param reference: reference system of the vertices (e.g. WKT)
+        :param name: name of the line
+        :param comment: additional comment
+        :param vertices: list of tuples (easting, northing, altitude or None, name, comment, [(property, value)]) in
+                         line order
+        :return: Nothing
+        :raises ValueError: if a value cannot be converted and the policy does not isolate errors
+        """
+        try:
+            rows = [self._convert(horizon, reference, e, n, h, sn, c, properties, line_id, position)
+                    for position, (e, n, h, sn, c, properties) in enumerate(vertices)]
+        except ValueError as e:
+            self._reject(e)
+            return
+
+        self.__lines.append({
+            "id": line_id,
+            "closed": bool(closed),
+            "horizon_id": self._horizon_id(horizon),
+            "name_col": str(name)[:100],
+            "comment_col": str(comment)[:100]
+        })
+        self._collect(rows)
+        self._added(partial(self.replace_line, line_id, closed, horizon, reference, name, comment, vertices))
+
+    #
+    # protected functions
+    #
+
+    def _write(self) -> None:
+        """
+        Deletes the old vertices of the collected lines, updates the lines and writes the new vertices
+        :return: Nothing
+        """
+        ids = [line["id"] for line in self.__lines]
+        for start in range(0, len(ids), query_size):
+            batch = ids[start:start + query_size]
+            vertices = select(GeoPoint.id).where(GeoPoint.line_id.in_(batch))
+            self._session.query(Property).filter(Property.point_id.in_(vertices)). \
+                delete(synchronize_session=False)
+            self._session.query(GeoPoint).filter(GeoPoint.line_id.in_(batch)).delete(synchronize_session=False)
+
+        if len(self.__lines) > 0:
+            self._session.bulk_update_mappings(Line, self.__lines)
+
+        super()._write()
+
+    def _clear(self) -> None:
+        """
+        Clears the collected lines and vertices
+        :return: Nothing
+        """
+        super()._clear()
+        self.__lines = list()
+
+
+class WellBulkWriter(BulkWriter):
+    """
+    Writes wells together with their markers. The markers of all existing wells inside a batch are deleted by a single
+    statement and replaced by bulk inserts, new wells are written with bulk inserts as well.
+    """
+
+    def __init__(self, session: Session, policy: TransactionPolicy) -> None:
+        """
+        :param session: SQLAlchemy session used for all database requests
+        :param policy: defines, when the collected wells are committed
+        """
+        super().__init__(session, policy)
+
+        self.__new_wells: List[Dict] = list()
+        self.__updated_wells: List[Dict] = list()
+        self.__markers: List[List[Dict]] = list()
+        self.__updated_markers: List[List[Dict]] = list()
+
+    #
+    # public functions
+    #
+
+    def add_well(self, well_name: str, short_name: str, depth: float, reference: str, easting: float,
+                 northing: float, altitude: float, markers: List[Tuple]) -> None:
+        """
+        Adds a new well to the current batch
+        :param well_name: unique name of the well
+        :param short_name: shortened well name
+        :param depth: drilled depth of the well
+        :param reference: reference system of the well (e.g. WKT)
+        :param easting: easting coordinate
+        :param northing: northing coordinate
+        :param altitude: altitude of the well head
+        :param markers: list of tuples (depth, horizon, comment)
+        :return: Nothing
+        :raises ValueError: if a value is missing or cannot be converted, a name or comment is longer than 100
+                            characters or the depth is below 0 and the policy does not isolate errors
+        :raises WellMarkerDepthException: if a marker is deeper than the well and the policy does not isolate errors
+        """
+        try:
+            well = {
+                "wellname": self.__text(well_name, "Well name"),
+                "shortwellname": self.__text(short_name, "Short well name"),
+                "drill_depth": self.__depth(well_name, depth, markers),
+                "reference": str(reference),
+                "east": self.__number(easting, "Easting", well_name),
+                "north": self.__number(northing, "Northing", well_name),
+                "alt": self.__number(altitude, "Altitude", well_name),
+                "name_col": "",
+                "comment_col": ""
+            }
+            rows = self.__marker_rows(markers)
+        except (ValueError, WellMarkerDepthException) as e:
+            self._reject(e)
+            return
+
+        self.__new_wells.append(well)
+        self.__markers.append(rows)
+        self._added(partial(self.add_well, well_name, short_name, depth, reference, easting, northing, altitude,
+                            markers))
+
+    def replace_well(self, well_id: int, well_name: str, short_name: str, depth: float, easting: float,
+                     northing: float, markers: List[Tuple]) -> None:
+        """
+        Adds an existing well to the current batch. All markers of the well are replaced by the given ones.
+        :param well_id: database id of the well
+        :param well_name: name of the well, used for error messages
+        :param short_name: shortened well name
+        :param depth: drilled depth of the well
+        :param easting: easting coordinate
+        :param northing: northing coordinate
+        :param markers: list of tuples (depth, horizon, comment)
+        :return: Nothing
+        :raises ValueError: if a value is missing or cannot be converted, a name or comment is longer than 100
+                            characters or the depth is below 0 and the policy does not isolate errors
+        :raises WellMarkerDepthException: if a marker is deeper than the well and the policy does not isolate errors
+        """
+        try:
+            well = {
+                "id": well_id,
+                "shortwellname": self.__text(short_name, "Short well name"),
+                "drill_depth": self.__depth(well_name, depth, markers),
+                "east": self.__number(easting, "Easting", well_name),
+                "north": self.__number(northing, "Northing", well_name)
+            }
+            rows = self.__marker_rows(markers)
+        except (ValueError, WellMarkerDepthException) as e:
+            self._reject(e)
+            return
+
+        self.__updated_wells.append(well)
+        self.__updated_markers.append(rows)
+        self._added(partial(self.replace_well, well_id, well_name, short_name, depth, easting, northing, markers))
+
+    #
+    # protected functions
+    #
+
+    def _write(self) -> None:
+        """
+        Deletes the old markers of the updated wells, writes the wells and inserts all new markers
+        :return: Nothing
+        """
+        ids = [well["id"] for well in self.__updated_wells]
+        for start in range(0, len(ids), query_size):
+            self._session.query(WellMarker).filter(WellMarker.well_id.in_(ids[start:start + query_size])). \
+                delete(synchronize_session=False)
+
+        if len(self.__updated_wells) > 0:
+            self._session.bulk_update_mappings(Well, self.__updated_wells)
+
+        if len(self.__new_wells) > 0:
+            # well ids are needed to link the markers
+            self._session.bulk_insert_mappings(Well, self.__new_wells, return_defaults=True)
+
+        markers = list()
+        for well, rows in zip(self.__updated_wells + self.__new_wells, self.__updated_markers + self.__markers):
+            for row in rows:
+                row["well_id"] = well["id"]
+                markers.append(row)
+
+        if len(markers) > 0:
+            self._session.bulk_insert_mappings(WellMarker, markers)
+
+    def _clear(self) -> None:
+        """
+        Clears the collected wells and markers
+        :return: Nothing
+        """
+        self.__new_wells = list()
+        self.__updated_wells = list()
+        self.__markers = list()
+        self.__updated_markers = list()
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __depth(well_name: str, depth: float, markers: List[Tuple]) -> float:
+        """
+        Validates the drilled depth of a well, equal to the :class:`~geological_toolbox.wells.Well` depth setter
+        :param well_name: name of the well, used for error messages
+        :param depth: drilled depth of the well
+        :param markers: list of tuples (depth, horizon, comment)
+        :return: the depth as float
+        :raises ValueError: if the depth is missing, cannot be converted or is below 0
+        :raises WellMarkerDepthException: if a marker is deeper than the well
+        """
+        depth = WellBulkWriter.__number(depth, "Depth", well_name)
+        if depth < 0:
+            raise ValueError("Depth is below 0! ({})".format(depth))
+
+        deepest = max((float(marker[0]) for marker in markers), default=0.0)
+        if deepest > depth:
+            raise WellMarkerDepthException("Well [{}]: depth ({}) lower than depth of last marker {}".
+                                           format(well_name, depth, deepest))
+        return depth
+
+    @staticmethod
+    def __number(value: any, description: str, well_name: str) -> float:
+        """
+        Converts a numeric value of a well to float. Missing values are rejected like invalid ones.
+        :param value: value to convert
+        :param description: description of the value, used for error messages
+        :param well_name: name of the well, used for error messages
+        :return: the value as float
+        :raises ValueError: if the value is missing or cannot be converted
+        """
+        if value is None:
+            raise ValueError("Well [{}]: {} is missing".format(well_name, description.lower()))
+        return float(value)
+
+    @staticmethod
+    def __text(value: any, description: str) -> str:
+        """
+        Converts a name or comment to string. Longer texts than the database columns allow are rejected instead of
+        being truncated, truncated well names could match other wells.
+        :param value: name or comment
+        :param description: description of the value, used for error messages
+        :return: the value as string
+        :raises ValueError: if the text is longer than 100 characters
+        """
+        value = str(value)
+        if len(value) > 100:
+            raise ValueError("{} [{}...] is longer than 100 characters".format(description, value[:100]))
+        return value
+
+    def __marker_rows(self, markers: List[Tuple]) -> List[Dict]:
+        """
+        Converts the markers of a well into database rows
+        :param markers: list of tuples (depth, horizon, comment)
+        :return: the marker rows without well id
+        :raises ValueError: if a marker depth cannot be converted or a comment is too long
+        """
+        return [{
+            "drill_depth": float(depth),
+            "horizon_id": self._horizon_id(horizon),
+            "name_col": "",
+            "comment_col": self.__text(comment, "Marker comment")
+        } for depth, horizon, comment in markers]
+
+
+class PropertyBulkWriter(BulkWriter):
+    """
+    Inserts or updates the properties of existing GeoPoints. The existing property rows of all points inside a batch
+    are requested with chunked IN (...) queries, afterwards existing rows are updated and missing rows are inserted
+    with a single executemany statement each. If a point has multiple properties with the same name, the oldest one
+    is updated.
+    """
+
+    def __init__(self, session: Session, policy: TransactionPolicy, reference: str = None,
+                 copy_loader: CopyLoader = None) -> None:
+        """
+        :param session: SQLAlchemy session used for all database requests
+        :param policy: defines, when the collected properties are committed
+        :param reference: reference system assigned to all points, whose properties are written. None keeps the
+                          current reference systems.
+        :param copy_loader: optional COPY loader for PostgreSQL databases, used for the inserted rows
+        """
+        super().__init__(session, policy, copy_loader)
+
+        self.__reference = reference
+        self.__properties: Dict[Tuple[int, str], Dict] = dict()
+
+    #
+    # public functions
+    #
+
+    def set_properties(self, point_id: int, properties: List[Tuple[PropertyImportData, any]]) -> None:
+        """
+        Adds the properties of an existing point to the current batch. If the same property of a point is set multiple
+        times, the last value is written.
+        :param point_id: database id of the point
+        :param properties: list of property definitions and related values
+        :return: Nothing
+        :raises ValueError: if a value cannot be converted and the policy does not isolate errors
+        """
+        rows = dict()
+        try:
+            for item, value in properties:
+                name = str(item.name)[:100]
+                rows[(point_id, name)] = {
+                    "point_id": point_id,
+                    "prop_name": name,
+                    "prop_unit": str(item.unit)[:100],
+                    "prop_type": item.property_type.name,
+                    "prop_value": property_value(value, item.property_type)
+                }
+        except ValueError as e:
+            self._reject(e)
+            return
+
+        self.__properties.update(rows)
+
+        self._added(partial(self.set_properties, point_id, properties))
+
+    #
+    # protected functions
+    #
+
+    def _write(self) -> None:
+        """
+        Updates the existing and inserts the missing properties of the collected points
+        :return: Nothing
+        """
+        if len(self.__properties) == 0:
+            return
+
+        point_ids = sorted(set(point_id for point_id, _ in self.__properties))
+        names = sorted(set(name for _, name in self.__properties))
+
+        existing: Dict[Tuple[int, str], int] = dict()
+        for start in range(0, len(point_ids), query_size):
+            batch = point_ids[start:start + query_size]
+            query = self._session.query(Property.id, Property.point_id, Property.prop_name). \
+                filter(Property.point_id.in_(batch), Property.prop_name.in_(names)).order_by(Property.id)
+            for _id, point_id, name in query:
+                existing.setdefault((point_id, name), _id)
+
+            if self.__reference is not None:
+                self._session.query(GeoPoint).filter(GeoPoint.id.in_(batch)). \
+                    update({GeoPoint.reference: self.__reference}, synchronize_session=False)
+
+        updates = list()
+        inserts = list()
+        for key, row in self.__properties.items():
+            if key in existing:
+                updates.append(dict(row, id=existing[key]))
+            else:
+                inserts.append(dict(row, name_col="", comment_col=""))
+
+        if len(updates) > 0:
+            self._session.bulk_update_mappings(Property, updates)
+
+        if len(inserts) == 0:
+            return
+
+        if self._copy_loader is not None:
+            for row, _id in zip(inserts, self._copy_loader.reserve_ids(Property, len(inserts))):
+                row["id"] = _id
+            self._copy_loader.copy(Property, inserts)
+        else:
+            self._session.bulk_insert_mappings(Property, inserts)
+
+    def _clear(self) -> None:
+        """
+        Clears the collected properties
+        :return: Nothing
+        """
+        self.__properties = dict()
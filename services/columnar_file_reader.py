@@ -0,0 +1,248 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing a reader for binary columnar import files (Parquet, Feather / Arrow IPC)
+"""
+
+import importlib.util
+import json
+import os
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn, ImportData
+
+
+class ColumnarFileReader:
+    """
+    Reads Parquet and Feather / Arrow IPC files into the columnar
+    :class:`~GeologicalDataProcessing.models.import_data.ImportData` model. The file can be used everywhere a
+    :class:`~GeologicalDataProcessing.services.import_file_reader.ImportFileReader` is accepted.
+
+    Column names are taken from the schema. Units are read from the schema metadata: either a "units" entry of the
+    schema, which contains a json object {column: unit}, or a "unit" entry of a single field. Numeric columns without
+    empty cells are handed over without copying the values, string columns are dictionary encoded into the categorical
+    text columns of the model.
+
+    The reader requires the optional module pyarrow.
+    """
+
+    logger = QGISLogHandler("ColumnarFileReader")
+
+    parquet_extensions = (".parquet", ".pq")
+    """file extensions of Parquet files"""
+
+    arrow_extensions = (".feather", ".arrow", ".ipc")
+    """file extensions of Feather / Arrow IPC files"""
+
+    def __init__(self, filename: str) -> None:
+        """
+        :param filename: path to the import file
+        :raises ImportError: if pyarrow is not installed
+        """
+        if not self.is_available():
+            raise ImportError("Cannot read {}, the python module pyarrow is not installed".format(filename))
+
+        self.__filename = os.path.normpath(filename)
+        self.__schema = None
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def filename(self) -> str:
+        """
+        Returns the path to the import file
+        :return: the path to the import file
+        """
+        return self.__filename
+
+    @property
+    def number_columns(self) -> List[int]:
+        """
+        Returns the indices of the integer and floating point columns
+        :return: the indices of the numeric columns
+        """
+        import pyarrow as pa
+
+        return [index for index, field in enumerate(self.__get_schema())
+                if pa.types.is_integer(field.type) or pa.types.is_floating(field.type) or
+                pa.types.is_boolean(field.type)]
+
+    #
+    # public functions
+    #
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Returns True, if pyarrow is installed
+        :return: True, if pyarrow is installed
+        """
+        return importlib.util.find_spec("pyarrow") is not None
+
+    @classmethod
+    def is_columnar_file(cls, filename: str) -> bool:
+        """
+        Returns True, if the file extension denotes a Parquet or Feather / Arrow IPC file
+        :param filename: path to the import file
+        :return: True, if the file is a columnar binary file
+        """
+        return filename.lower().endswith(cls.parquet_extensions + cls.arrow_extensions)
+
+    def read_header(self) -> Tuple[List[str], List[str]]:
+        """
+        Reads the column names and units from the schema
+        :return: a tuple of the column names and the related units. Missing units are empty strings.
+        :raises ImportError: if the file has less than two columns
+        """
+        schema = self.__get_schema()
+        if len(schema.names) < 2:
+            raise ImportError("Cannot read import file, not enough columns")
+
+        units = dict()
+        if schema.metadata is not None and b"units" in schema.metadata:
+            try:
+                units = json.loads(schema.metadata[b"units"].decode("utf-8"))
+            except ValueError as e:
+                self.logger.warn("Cannot read units from schema metadata", str(e))
+
+        for field in schema:
+            if field.metadata is not None and b"unit" in field.metadata:
+                units[field.name] = field.metadata[b"unit"].decode("utf-8")
+
+        return list(schema.names), [str(units.get(name, "")) for name in schema.names]
+
+    def read(self) -> ImportData:
+        """
+        Reads the complete import file
+        :return: the columnar data
+        :raises ImportError: if the file has less than two columns
+        """
+        self.logger.debug("reading import file {}", args=(self.__filename,))
+
+        cols, units = self.read_header()
+        table = self.__read_table()
+        return self.__convert(cols, units, [column.combine_chunks() for column in table.columns], 0, 1.0)
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[ImportData]:
+        """
+        Reads the import file chunk by chunk. Parquet files are read row group wise, Feather / Arrow IPC files are
+        memory mapped.
+        :param chunk_size: maximum number of rows per chunk
+        :return: an iterator over the chunks
+        :raises ImportError: if the file has less than two columns
+        :raises ValueError: if chunk_size is smaller than 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk size has to be larger than 0")
+
+        self.logger.debug("reading import file {} in chunks of {} rows", args=(self.__filename, chunk_size))
+
+        cols, units = self.read_header()
+        if self.__filename.lower().endswith(self.parquet_extensions):
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(self.__filename)
+            total = parquet_file.metadata.num_rows
+            batches = parquet_file.iter_batches(batch_size=chunk_size)
+        else:
+            table = self.__read_table()
+            total = table.num_rows
+            batches = table.to_batches(max_chunksize=chunk_size)
+
+        offset = 0
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+            yield self.__convert(cols, units, batch.columns, offset, (offset + batch.num_rows) / total)
+            offset += batch.num_rows
+
+    #
+    # private functions
+    #
+
+    def __get_schema(self):
+        """
+        Returns the schema of the import file, reads it on the first request
+        :return: the arrow schema
+        """
+        if self.__schema is None:
+            if self.__filename.lower().endswith(self.parquet_extensions):
+                import pyarrow.parquet as pq
+                self.__schema = pq.read_schema(self.__filename)
+            else:
+                self.__schema = self.__read_table().schema
+        return self.__schema
+
+    def __read_table(self):
+        """
+        Reads the import file as arrow table. Feather / Arrow IPC files are memory mapped.
+        :return: the arrow table
+        """
+        if self.__filename.lower().endswith(self.parquet_extensions):
+            import pyarrow.parquet as pq
+            return pq.read_table(self.__filename)
+
+        import pyarrow.feather as feather
+        return feather.read_table(self.__filename, memory_map=True)
+
+    def __convert(self, cols: List[str], units: List[str], arrays: List, offset: int, progress: float) -> ImportData:
+        """
+        Converts arrow arrays into the columnar import model
+        :param cols: column names
+        :param units: column units
+        :param arrays: one arrow array per column
+        :param offset: index of the first row inside the import file
+        :param progress: part of the import file which was read including these rows
+        :return: the columnar data
+        """
+        return ImportData([self.__convert_array(name, unit, array) for name, unit, array in zip(cols, units, arrays)],
+                          offset, progress)
+
+    @staticmethod
+    def __convert_array(name: str, unit: str, array) -> ImportColumn:
+        """
+        Converts a single arrow array into an import column
+        :param name: column name
+        :param unit: column unit
+        :param array: arrow array
+        :return: the import column
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if array.null_count == 0:
+            mask = np.ones(len(array), dtype=bool)
+        else:
+            mask = array.is_valid().to_numpy(zero_copy_only=False)
+
+        dtype = array.type
+        if pa.types.is_dictionary(dtype):
+            array = array.dictionary_decode()
+            dtype = array.type
+
+        if array.null_count == len(array):
+            return ImportColumn(name, unit, ColumnTypes.EMPTY, np.full(len(array), np.nan), mask)
+
+        if pa.types.is_integer(dtype) or pa.types.is_boolean(dtype):
+            if array.null_count > 0:
+                array = array.fill_null(0)
+            values = array.to_numpy(zero_copy_only=False)
+            return ImportColumn(name, unit, ColumnTypes.INT, values.astype(np.int64, copy=False), mask)
+
+        if pa.types.is_floating(dtype):
+            values = array.to_numpy(zero_copy_only=False)
+            return ImportColumn(name, unit, ColumnTypes.FLOAT, values.astype(np.float64, copy=False), mask)
+
+        if not (pa.types.is_string(dtype) or pa.types.is_large_string(dtype)):
+            array = array.cast(pa.string())
+
+        # empty strings are empty cells, as in delimited text files
+        mask = mask & pc.fill_null(pc.not_equal(array, ""), False).to_numpy(zero_copy_only=False)
+        encoded = array.fill_null("").dictionary_encode()
+        categories = np.asarray(encoded.dictionary.to_pylist(), dtype=str)
+        return ImportColumn(name, unit, ColumnTypes.TEXT, encoded.indices.to_numpy().astype(np.int32), mask,
+                            categories)
@@ -0,0 +1,356 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing streaming access to compressed import files
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+
+import numpy as np
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.services.mapped_file import MappedFile
+
+
+class CompressedFile:
+    """
+    Streaming reader for gzip, bzip2, xz and zstandard compressed import files, used as context manager. The file is
+    decompressed block by block, it is never unpacked completely into memory or into a temporary file.
+
+    Files consisting of multiple gzip members (e.g. written by bgzip or concatenated .gz files) are decompressed by a
+    pool of threads: the file is split at member boundaries into segments, which are decompressed in parallel and
+    returned in file order. If a segment doesn't end at a member boundary, the rest of the file is decompressed
+    sequentially.
+
+    zstandard compressed files require the optional module zstandard.
+    """
+
+    logger = QGISLogHandler("CompressedFile")
+
+    block_size = 4 * 1024 * 1024
+    """number of compressed bytes read at once"""
+
+    segment_size = 4 * 1024 * 1024
+    """minimum number of compressed bytes of a segment, which is decompressed by a single thread"""
+
+    __signatures = [
+        (b"\x1f\x8b", "gzip"),
+        (b"BZh", "bz2"),
+        (b"\xfd7zXZ\x00", "xz"),
+        (b"\x28\xb5\x2f\xfd", "zstd")
+    ]
+
+    __gzip_member = b"\x1f\x8b\x08"
+
+    def __init__(self, filename: str, threads: int = None) -> None:
+        """
+        :param filename: path to the compressed file
+        :param threads: number of threads decompressing multi-member gzip files, defaults to
+                        config.import_decompress_threads (0: number of cpus)
+        :raises ValueError: if the file is not compressed with a supported format
+        """
+        self.__filename = filename
+        self.__compression = self.compression(filename)
+        if self.__compression is None:
+            raise ValueError("{} is not a compressed file".format(filename))
+
+        threads = config.import_decompress_threads if threads is None else threads
+        self.__threads = threads if threads > 0 else (os.cpu_count() or 1)
+        self.__file = None
+        self.__size = 0
+        self.__position = 0
+
+    def __enter__(self) -> "CompressedFile":
+        self.__file = open(self.__filename, "rb")
+        self.__size = os.fstat(self.__file.fileno()).st_size
+        self.__position = 0
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.__file.close()
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the compressed file in bytes
+        :return: the size of the compressed file in bytes
+        """
+        return self.__size
+
+    @property
+    def progress(self) -> float:
+        """
+        Returns the part of the compressed file, which was decompressed so far
+        :return: the part of the file, which was decompressed so far
+        """
+        return 1.0 if self.__size == 0 else min(self.__position / self.__size, 1.0)
+
+    #
+    # public functions
+    #
+
+    @classmethod
+    def compression(cls, filename: str) -> str or None:
+        """
+        Detects the compression format by the signature at the beginning of the file
+        :param filename: path to the file
+        :return: "gzip", "bz2", "xz", "zstd" or None, if the file is not compressed or cannot be read
+        """
+        try:
+            with open(filename, "rb") as file:
+                start = file.read(6)
+        except OSError:
+            return None
+
+        for signature, compression in cls.__signatures:
+            if start.startswith(signature):
+                return compression
+        return None
+
+    @classmethod
+    def is_compressed(cls, filename: str) -> bool:
+        """
+        Returns True, if the file is compressed with a supported format
+        :param filename: path to the file
+        :return: True, if the file is compressed
+        """
+        return cls.compression(filename) is not None
+
+    def iter_blocks(self) -> Iterator[bytes]:
+        """
+        Decompresses the file block by block
+        :return: an iterator over the decompressed blocks in file order
+        :raises ImportError: if the zstandard module is required but not installed
+        """
+        if self.__compression == "gzip" and self.__threads > 1 and self.__size >= 2 * self.segment_size:
+            return self.__iter_gzip_members()
+        return self.__iter_stream(0)
+
+    def iter_line_blocks(self, count: int, skip: int = 0) -> Iterator[bytes]:
+        """
+        Decompresses the file and returns blocks of count complete lines. The last block contains the remaining lines.
+        :param count: number of lines per block
+        :param skip: number of lines skipped at the beginning of the file, e.g. header lines
+        :return: an iterator over the newline aligned blocks
+        """
+        pending = b""
+        lines = 0
+        for block in self.iter_blocks():
+            # a '\r' at the end of the previous block is scanned again together with the following byte
+            scan = len(pending) - 1 if pending.endswith(b"\r") else len(pending)
+            data = pending + block if pending else block
+            ends = self.__line_ends(data, scan)
+
+            start = 0
+            if skip > 0:
+                skipped = min(skip, len(ends))
+                if skipped > 0:
+                    start = int(ends[skipped - 1])
+                ends = ends[skipped:]
+                skip -= skipped
+
+            for cut in ends[count - lines - 1::count].tolist():
+                yield data[start:cut]
+                start = cut
+
+            lines = (lines + len(ends)) % count
+            pending = data[start:]
+
+        if skip == 0 and len(pending) > 0:
+            yield pending
+
+    def head(self, count: int) -> List[str]:
+        """
+        Returns the first lines of the file without line breaks
+        :param count: number of lines
+        :return: list of up to count decoded lines
+        """
+        data = b""
+        for block in self.__iter_stream(0):
+            data += block
+            if len(self.__line_ends(data, 0)) >= count:
+                break
+
+        return [line.rstrip("\n") for line in MappedFile.decode_bytes(data)][:count]
+
+    def count_lines(self, skip: int = 0) -> int:
+        """
+        Counts the lines of the decompressed file, a last line without line break is counted as well
+        :param skip: number of lines at the beginning of the file, which are not counted
+        :return: the number of lines
+        """
+        count = 0
+        last = b"\n"
+        for block in self.iter_blocks():
+            if len(block) > 0:
+                # a '\r' at the end of the previous block is counted together with the following byte
+                count += len(self.__line_ends(block if last != b"\r" else last + block, 0))
+                last = block[-1:]
+
+        # the last line ends without line break or with a '\r', which was not counted yet
+        if last != b"\n":
+            count += 1
+        return max(count - skip, 0)
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __line_ends(data: bytes, start: int) -> np.ndarray:
+        """
+        Locates the line breaks of decompressed data. Lines end with '\\n', '\\r\\n' or a lone '\\r', equal to the
+        universal newlines of :meth:`MappedFile.decode_bytes`. A '\\r' as last byte is not counted, it could be
+        followed by a '\\n' at the beginning of the next block.
+        :param data: decompressed data
+        :param start: first byte to scan
+        :return: the positions after the line breaks
+        """
+        array = np.frombuffer(data, dtype=np.uint8)[start:]
+        ends = array == 10
+        ends[:-1] |= (array[:-1] == 13) & (array[1:] != 10)
+        return np.flatnonzero(ends) + (start + 1)
+
+    def __open_stream(self, position: int) -> io.RawIOBase:
+        """
+        Opens a decompressing stream beginning at the given position of the compressed file
+        :param position: position of a member or frame beginning
+        :return: the decompressing stream
+        :raises ImportError: if the zstandard module is required but not installed
+        """
+        self.__file.seek(position)
+        if self.__compression == "gzip":
+            return gzip.GzipFile(fileobj=self.__file, mode="rb")
+        if self.__compression == "bz2":
+            return bz2.BZ2File(self.__file, mode="rb")
+        if self.__compression == "xz":
+            return lzma.LZMAFile(self.__file, mode="rb")
+
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Cannot read {}, the python module zstandard is not installed".format(self.__filename))
+        return zstandard.ZstdDecompressor().stream_reader(self.__file, read_across_frames=True, closefd=False)
+
+    def __iter_stream(self, position: int) -> Iterator[bytes]:
+        """
+        Decompresses the file sequentially
+        :param position: position of a member or frame beginning, where the decompression starts
+        :return: an iterator over the decompressed blocks
+        """
+        with self.__open_stream(position) as stream:
+            while True:
+                block = stream.read(self.block_size)
+                if not block:
+                    break
+                self.__position = self.__file.tell()
+                yield block
+        self.__position = self.__size
+
+    def __iter_gzip_members(self) -> Iterator[bytes]:
+        """
+        Decompresses segments of gzip members with a pool of threads, zlib releases the GIL while decompressing
+        :return: an iterator over the decompressed segments in file order
+        """
+        with mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = self.__member_bounds(mapped)
+            if len(bounds) < 3:
+                yield from self.__iter_stream(0)
+                return
+
+            self.logger.debug("decompressing {} gzip segments with {} threads", args=(len(bounds) - 1, self.__threads))
+
+            segments = iter(zip(bounds[:-1], bounds[1:]))
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=self.__threads, thread_name_prefix="Decompress") as pool:
+                def submit() -> None:
+                    segment = next(segments, None)
+                    if segment is not None:
+                        pending.append(segment + (pool.submit(self.__inflate, mapped[segment[0]:segment[1]]),))
+
+                for _ in range(2 * self.__threads):
+                    submit()
+
+                while len(pending) > 0:
+                    start, stop, future = pending.popleft()
+                    data = future.result()
+                    if data is None:
+                        # the segment doesn't end at a member boundary
+                        for item in pending:
+                            item[2].cancel()
+                        break
+
+                    self.__position = stop
+                    submit()
+                    yield data
+
+                else:
+                    return
+
+        self.logger.debug("decompressing {} sequentially from position {}", args=(self.__filename, start))
+        yield from self.__iter_stream(start)
+
+    def __member_bounds(self, mapped: mmap.mmap) -> List[int]:
+        """
+        Searches for gzip member headers close to multiples of the segment size. The headers are only candidates,
+        the same byte sequence can occur inside compressed data as well.
+        :param mapped: memory map of the compressed file
+        :return: sorted segment boundaries including 0 and the file size
+        """
+        bounds = [0]
+        target = self.segment_size
+        while target < self.__size:
+            position = mapped.find(self.__gzip_member, target)
+            while position >= 0 and not self.__is_member_header(mapped[position:position + 10]):
+                position = mapped.find(self.__gzip_member, position + 1)
+            if position < 0:
+                break
+
+            bounds.append(position)
+            target = position + self.segment_size
+
+        bounds.append(self.__size)
+        return bounds
+
+    @staticmethod
+    def __is_member_header(header: bytes) -> bool:
+        """
+        Checks the reserved flag bits and the operating system byte of a gzip member header
+        :param header: first 10 bytes of the member
+        :return: True, if the bytes are a valid gzip member header
+        """
+        return len(header) == 10 and (header[3] & 0xE0) == 0 and (header[9] <= 13 or header[9] == 255)
+
+    @staticmethod
+    def __inflate(data: bytes) -> bytes or None:
+        """
+        Decompresses a sequence of complete gzip members
+        :param data: compressed members
+        :return: the decompressed data or None, if the data doesn't consist of complete members
+        """
+        parts = list()
+        while len(data) > 0:
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            try:
+                parts.append(decompressor.decompress(data))
+            except zlib.error:
+                return None
+
+            if not decompressor.eof:
+                return None
+            data = decompressor.unused_data
+
+        return b"".join(parts)
@@ -0,0 +1,95 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing a PostgreSQL COPY based fast loader for the toolbox tables
+"""
+
+import csv
+import io
+from typing import Dict, List, Type
+
+from sqlalchemy import text
+from sqlalchemy.orm.session import Session
+
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from geological_toolbox.db_handler import AbstractDBObject
+
+
+class CopyLoader:
+    """
+    Writes prepared rows with COPY ... FROM STDIN into a PostgreSQL database. Ids are reserved from the sequence of
+    the target table in advance, so dependent rows (e.g. properties of new points) can reference them without reading
+    the inserted rows back.
+
+    All statements are executed on the connection of the session and therefore take part in its transaction.
+    """
+
+    null = "\\N"
+    """representation of NULL values inside the copied CSV data"""
+
+    def __init__(self, session: Session) -> None:
+        """
+        :param session: SQLAlchemy session connected to a PostgreSQL database via psycopg2
+        :raises ValueError: if the session is not connected to a PostgreSQL database via psycopg2
+        """
+        if not self.is_available(session):
+            raise ValueError("COPY loading requires a PostgreSQL database connected via psycopg2")
+
+        self.__logger = QGISLogHandler(self.__class__.__name__)
+        self.__session = session
+
+    #
+    # public functions
+    #
+
+    @staticmethod
+    def is_available(session: Session) -> bool:
+        """
+        Returns True, if the session is connected to a PostgreSQL database via psycopg2
+        :param session: SQLAlchemy session to check
+        :return: True, if the session is connected to a PostgreSQL database via psycopg2
+        """
+        dialect = session.get_bind().dialect
+        return (dialect.name == "postgresql") and (dialect.driver == "psycopg2")
+
+    def reserve_ids(self, cls: Type[AbstractDBObject], count: int) -> List[int]:
+        """
+        Reserves count ids from the id sequence of the table of cls
+        :param cls: database class, e.g. GeoPoint
+        :param count: number of requested ids
+        :return: list of reserved ids
+        """
+        if count < 1:
+            return list()
+
+        sequence = cls.__table__.c.id.default.name
+        result = self.__session.execute(text("SELECT nextval(:sequence) FROM generate_series(1, :count)"),
+                                        {"sequence": sequence, "count": count})
+        return [row[0] for row in result]
+
+    def copy(self, cls: Type[AbstractDBObject], rows: List[Dict]) -> None:
+        """
+        Writes the rows into the table of cls with a single COPY statement
+        :param cls: database class, e.g. GeoPoint
+        :param rows: list of dictionaries column name -> value, all with the same keys
+        :return: Nothing
+        """
+        if len(rows) == 0:
+            return
+
+        columns = list(rows[0].keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            writer.writerow([self.null if row[col] is None else row[col] for col in columns])
+        buffer.seek(0)
+
+        statement = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '{}')". \
+            format(cls.__table__.name, ", ".join(columns), self.null)
+
+        cursor = self.__session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(statement, buffer)
+        finally:
+            cursor.close()
+
+        self.__logger.debug("{} rows copied to {}", args=(len(rows), cls.__table__.name))
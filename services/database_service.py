@@ -3,15 +3,24 @@
 module with a service providing all database related connections and functions
 """
 
+from typing import Dict, List
+
+import GeologicalDataProcessing.config as config
 from geological_toolbox.db_handler import DBHandler
+from sqlalchemy import event, text
 from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
 from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.services.copy_loader import CopyLoader
 
 
 class DatabaseService:
     """
     Singleton class controlling all database related processes
+
+    The database engine and its connection pool are created once and reused, until the connection parameters change.
+    Sessions are thread local, so each import thread works with its own session.
     """
     __instance = None
 
@@ -46,7 +55,9 @@ class DatabaseService:
         self.__username = ""
 
         self.__handler = None
-        self.__session = None
+        self.__engine_key = None
+        self.__session_factory = None
+        self.__bulk_loads = 0
 
     #
     # setter and getter
@@ -128,7 +139,7 @@ class DatabaseService:
 
     def connect(self) -> None:
         """
-        Connect a GeologicalToolbox-DBHandler
+        Connect a GeologicalToolbox-DBHandler. An existing connection with the same parameters is reused.
         :return: Nothing
         :raises ValueError: if database type is unknown
         """
@@ -140,33 +151,124 @@ class DatabaseService:
         elif self.db_type == "sqlite":
             connection = "sqlite:///{}".format(self.connection)
         else:
-            self.__handler = None
+            self.dispose()
             raise ValueError("Unknown DB Format: {}".format(self.db_type))
 
-        self.__handler = DBHandler(connection=connection, echo=False)
+        engine_args = self._engine_args()
+        key = (connection, tuple(sorted(engine_args.items())))
+        if (self.__handler is not None) and (key == self.__engine_key):
+            self.logger.debug("Reusing existing database engine")
+            return
+
+        self.dispose()
+        self.__handler = DBHandler(connection=connection, echo=False, **engine_args)
+
+        # the handler creates an initial session, which is only used to access the engine
+        engine = self.__handler.get_session().get_bind()
+        self.__handler.close_last_session()
+
+        if self.db_type == "sqlite":
+            event.listen(engine, "connect", self._set_sqlite_pragmas)
+
+        self.__session_factory = scoped_session(sessionmaker(bind=engine))
+        self.__engine_key = key
+
+    def dispose(self) -> None:
+        """
+        Closes all pooled connections and removes the current database engine
+        :return: Nothing
+        """
+        if self.__session_factory is not None:
+            self.logger.debug("Disposing database engine")
+            self.__session_factory.remove()
+            self.__session_factory.bind.dispose()
+
+        self.__handler = None
+        self.__engine_key = None
+        self.__session_factory = None
 
     def get_session(self) -> Session:
         """
-        return a sqlalchemy database session
+        return the sqlalchemy database session of the current thread
         :return: a sqlalchemy database session
         :raises ConnectionError: if no database handler is connected
         """
         self.logger.debug("get or create a session")
-        if self.__handler is None:
-            self.__session = None
+        if self.__session_factory is None:
             raise ConnectionError("No database handler found, please connect first")
 
-        self.__session = self.__handler.get_session()
-        return self.__session
+        return self.__session_factory()
+
+    def get_copy_loader(self, session: Session) -> CopyLoader or None:
+        """
+        Returns a COPY based fast loader for the session or None, if the database doesn't support COPY loading
+        :param session: SQLAlchemy session used by the loader
+        :return: a COPY loader for PostgreSQL databases, else None
+        """
+        if not CopyLoader.is_available(session):
+            self.logger.debug("COPY loading not available for database type [{}]", args=(self.db_type,))
+            return None
+
+        return CopyLoader(session)
+
+    def begin_bulk_load(self, session: Session) -> List[str]:
+        """
+        Prepares a SQLite database for a large import, if the bulk load mode is activated in the configuration.
+        All secondary indexes are dropped and synchronous is set to config.sqlite_import_synchronous.
+        Call :meth:`end_bulk_load` with the result after the import, even if the import failed.
+        :param session: SQLAlchemy session of the import
+        :return: the SQL statements of the dropped indexes
+        """
+        if (self.db_type != "sqlite") or (not config.sqlite_bulk_load):
+            return list()
+
+        # new connections of the engine use the import setting until the bulk load ends
+        self.__bulk_loads += 1
+        session.execute(text("PRAGMA synchronous = {}".format(config.sqlite_import_synchronous)))
+
+        # indexes of unique constraints (sql is NULL) cannot be dropped and are needed during the import
+        indexes = session.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+                                       "AND tbl_name != 'alembic_version'")).fetchall()
+        for name, _ in indexes:
+            session.execute(text("DROP INDEX \"{}\"".format(name)))
+        session.commit()
+
+        self.logger.debug("bulk load: {} indexes dropped", args=(len(indexes),))
+        return [sql for _, sql in indexes]
+
+    def end_bulk_load(self, session: Session, indexes: List[str]) -> None:
+        """
+        Rebuilds the indexes dropped by :meth:`begin_bulk_load` and restores the configured synchronous PRAGMA.
+        Uncommitted changes of the session are discarded, errors are logged.
+        :param session: SQLAlchemy session of the import
+        :param indexes: result of :meth:`begin_bulk_load`
+        :return: Nothing
+        """
+        if (self.db_type != "sqlite") or (not config.sqlite_bulk_load):
+            return
+
+        self.__bulk_loads = max(self.__bulk_loads - 1, 0)
+
+        try:
+            session.rollback()
+            for sql in indexes:
+                session.execute(text(sql))
+            session.commit()
+            session.execute(text("PRAGMA synchronous = {}".format(config.sqlite_pragmas["synchronous"])))
+            self.logger.debug("bulk load: {} indexes rebuilt", args=(len(indexes),))
+
+        except DBAPIError as e:
+            session.rollback()
+            self.logger.error("Cannot rebuild the database indexes after the import", str(e), to_messagebar=True)
 
     def close_session(self) -> None:
         """
-        close the current session if existing
+        close the session of the current thread if existing
         :return: Nothing
         """
         self.logger.debug("Closing session")
-        if self.__session is not None:
-            self.__session.close()
+        if self.__session_factory is not None:
+            self.__session_factory.remove()
 
     def check_connection(self) -> str:
         """
@@ -177,10 +279,47 @@ class DatabaseService:
 
         try:
             self.connect()
-            self.get_session()
+            self.get_session().execute(text("SELECT 1"))
             self.close_session()
             return ""
 
         except DBAPIError as e:
             # ExceptionHandler(e).log(only_logfile=True)
             return str(e)
+
+    #
+    # protected functions
+    #
+
+    def _engine_args(self) -> Dict:
+        """
+        Returns the connection pool arguments for the current database type. SQLite uses the default pool of
+        SQLAlchemy, as the pool size is meaningless for file databases.
+        :return: dictionary of additional arguments for sqlalchemy.create_engine
+        """
+        args = {
+            "pool_pre_ping": config.db_pool_pre_ping,
+            "pool_recycle": config.db_pool_recycle
+        }
+
+        if self.db_type == "postgresql":
+            args["pool_size"] = config.db_pool_size
+            args["max_overflow"] = config.db_max_overflow
+
+        return args
+
+    def _set_sqlite_pragmas(self, dbapi_connection, _) -> None:
+        """
+        Applies config.sqlite_pragmas to a new SQLite connection
+        :param dbapi_connection: new sqlite3 connection
+        :param _: SQLAlchemy connection record (unused)
+        :return: Nothing
+        """
+        pragmas = dict(config.sqlite_pragmas)
+        if self.__bulk_loads > 0:
+            pragmas["synchronous"] = config.sqlite_import_synchronous
+
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute("PRAGMA {} = {}".format(pragma, value))
+        cursor.close()
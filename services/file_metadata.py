@@ -0,0 +1,278 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing a cache for the header information of import files
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ColumnTypes
+from GeologicalDataProcessing.services.compressed_file import CompressedFile
+from GeologicalDataProcessing.services.mapped_file import MappedFile
+from GeologicalDataProcessing.services.type_inference import ColumnInfo, infer_types
+
+
+class FileMetadata:
+    """
+    Header information and sample rows of an import file for a single separator
+    """
+
+    def __init__(self, path: str, separator: str, lines: List[str], data_start: int,
+                 strided: List[str] = ()) -> None:
+        """
+        :param path: normalized path to the import file
+        :param separator: column separator
+        :param lines: first lines of the import file without line breaks: column names, units and the first data rows
+        :param data_start: position of the first data line inside the file, 0 for compressed files
+        :param strided: data rows sampled from the rest of the file
+        """
+        self.__path = path
+        self.__separator = separator
+        self.__header = lines[:2] + [""] * (2 - len(lines[:2]))
+        self.__data_start = data_start
+        self.__row_count = None
+
+        self.__columns = self.__header[0].strip().split(separator)
+        nr_cols = len(self.__columns)
+
+        units = self.__header[1].strip().split(separator)
+        self.__units = units[:nr_cols] + [""] * (nr_cols - len(units))
+
+        self.__samples = list()
+        for line in lines[2:] + list(strided):
+            line = line.strip().split(separator)
+            self.__samples.append(line[:nr_cols] + [""] * (nr_cols - len(line)))
+
+        self.__column_info = infer_types(self.__columns, self.__samples)
+        self.__number_columns = [index for index, info in enumerate(self.__column_info)
+                                 if info.dtype in (ColumnTypes.INT, ColumnTypes.FLOAT)]
+
+    def __repr__(self) -> str:
+        return "FileMetadata <{}, separator {}, {} columns>".format(self.path, repr(self.separator),
+                                                                    len(self.columns))
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the normalized path to the import file
+        :return: the normalized path to the import file
+        """
+        return self.__path
+
+    @property
+    def separator(self) -> str:
+        """
+        Returns the column separator
+        :return: the column separator
+        """
+        return self.__separator
+
+    @property
+    def header(self) -> List[str]:
+        """
+        Returns the column and the unit line of the import file
+        :return: the column and the unit line of the import file
+        """
+        return self.__header
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Returns the column names
+        :return: the column names
+        """
+        return self.__columns
+
+    @property
+    def units(self) -> List[str]:
+        """
+        Returns the units of all columns, missing units are empty strings
+        :return: the units of all columns
+        """
+        return self.__units
+
+    @property
+    def samples(self) -> List[List[str]]:
+        """
+        Returns the sample rows split into cells: the first data rows followed by rows sampled from the rest of the
+        file
+        :return: the sample rows
+        """
+        return self.__samples
+
+    @property
+    def column_info(self) -> List[ColumnInfo]:
+        """
+        Returns the data types and ratios of empty cells inferred from the sample rows
+        :return: the inferred data type and the ratio of empty cells for each column
+        """
+        return self.__column_info
+
+    @property
+    def dtypes(self) -> List[ColumnTypes]:
+        """
+        Returns the data types inferred from the sample rows
+        :return: the inferred data type of each column
+        """
+        return [info.dtype for info in self.__column_info]
+
+    @property
+    def number_columns(self) -> List[int]:
+        """
+        Returns the indices of the columns, which contain only numbers in all sample rows
+        :return: the indices of the numeric columns
+        """
+        return self.__number_columns
+
+    @property
+    def data_start(self) -> int:
+        """
+        Returns the position of the first data line inside the file
+        :return: the position of the first data line
+        """
+        return self.__data_start
+
+    @property
+    def row_count(self) -> int:
+        """
+        Returns the number of data rows. The rows are counted once on the first request, which reads the whole file.
+        :return: the number of data rows
+        """
+        if self.__row_count is None:
+            if CompressedFile.is_compressed(self.__path):
+                with CompressedFile(self.__path) as compressed:
+                    self.__row_count = compressed.count_lines(2)
+            else:
+                with MappedFile(self.__path) as mapped:
+                    self.__row_count = mapped.count_lines(self.__data_start)
+        return self.__row_count
+
+
+class FileMetadataCache:
+    """
+    Caches the header information of recently used import files. Entries are identified by path, modification time,
+    size and separator, so a changed file is read again. The first lines of a file are read only once for all
+    separators.
+
+    Compressed files are only sampled at the beginning, sampling the rest of the file would require to decompress it
+    completely.
+    """
+
+    logger = QGISLogHandler("FileMetadataCache")
+
+    max_entries = 32
+    """maximum number of cached files"""
+
+    def __init__(self, sample_rows: int = None) -> None:
+        """
+        :param sample_rows: number of data rows read from the beginning of the file and the number of rows sampled
+                            from the rest of the file, defaults to config.import_sample_rows
+        """
+        self.__sample_rows = max(config.import_sample_rows if sample_rows is None else sample_rows, 1)
+        self.__heads: Dict[Tuple, Tuple[List[str], int, List[str]]] = OrderedDict()
+        self.__entries: Dict[Tuple, FileMetadata] = OrderedDict()
+
+    #
+    # public functions
+    #
+
+    def head(self, path: str, count: int = 3) -> List[str]:
+        """
+        Returns the first lines of the file: column names, units and the first data rows
+        :param path: path to the import file
+        :param count: number of requested lines, at most two more than the number of sample rows
+        :return: the first lines without line breaks, missing lines are empty strings
+        :raises IOError: if the file cannot be read
+        """
+        lines = self.__head(self.__file_key(path))[0][:count]
+        return lines + [""] * (count - len(lines))
+
+    def get(self, path: str, separator: str) -> FileMetadata:
+        """
+        Returns the header information of the file for the given separator
+        :param path: path to the import file
+        :param separator: column separator, "<tabulator>" is accepted as alias for '\t'
+        :return: the header information of the file
+        :raises IOError: if the file cannot be read
+        """
+        separator = '\t' if separator == "<tabulator>" else separator
+        file_key = self.__file_key(path)
+        key = file_key + (separator,)
+
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+        lines, data_start, strided = self.__head(file_key)
+        metadata = FileMetadata(file_key[0], separator, lines, data_start, strided)
+        self.__store(self.__entries, key, metadata)
+        return metadata
+
+    def clear(self) -> None:
+        """
+        Removes all cached entries
+        :return: Nothing
+        """
+        self.__heads.clear()
+        self.__entries.clear()
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __file_key(path: str) -> Tuple[str, int, int]:
+        """
+        Returns the key of the current file version
+        :param path: path to the import file
+        :return: a tuple of the normalized path, the modification time and the file size
+        :raises IOError: if the file doesn't exist
+        """
+        path = os.path.normpath(path)
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def __head(self, file_key: Tuple[str, int, int]) -> Tuple[List[str], int, List[str]]:
+        """
+        Returns the first lines and the sampled lines of the file version, reads them if necessary
+        :param file_key: key of the file version
+        :return: a tuple of the first lines, the position of the first data line and the lines sampled from the rest
+                 of the file
+        """
+        if file_key in self.__heads:
+            self.__heads.move_to_end(file_key)
+            return self.__heads[file_key]
+
+        self.logger.debug("reading header of {}", args=(file_key[0],))
+        if CompressedFile.is_compressed(file_key[0]):
+            with CompressedFile(file_key[0]) as compressed:
+                head = (compressed.head(2 + self.__sample_rows), 0, list())
+            self.__store(self.__heads, file_key, head)
+            return head
+
+        with MappedFile(file_key[0]) as mapped:
+            head_end = mapped.line_end(0, 2 + self.__sample_rows)
+            lines = [line.rstrip("\n") for line in mapped.decode(0, head_end)]
+            head = (lines, mapped.line_end(0, 2), mapped.sample_lines(head_end, self.__sample_rows))
+
+        self.__store(self.__heads, file_key, head)
+        return head
+
+    def __store(self, entries: Dict, key: Tuple, value: any) -> None:
+        """
+        Adds an entry and removes the least recently used entries, if the cache is full
+        :param entries: cache dictionary
+        :param key: key of the new entry
+        :param value: new entry
+        :return: Nothing
+        """
+        entries[key] = value
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
@@ -0,0 +1,338 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing a gui independent reader for delimited import files
+"""
+
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, NamedTuple, Tuple
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportData
+from GeologicalDataProcessing.services.compressed_file import CompressedFile
+from GeologicalDataProcessing.services.file_metadata import FileMetadata
+from GeologicalDataProcessing.services.mapped_file import MappedFile
+from GeologicalDataProcessing.services.parallel_parser import ParallelParser, parse_lines
+from GeologicalDataProcessing.services.parse_cache import ParseCache, ParseCacheWriter
+
+
+class RawChunk(NamedTuple):
+    """undecoded lines of an import file together with the header information needed to parse them"""
+    columns: List[str]
+    units: List[str]
+    data: bytes
+    offset: int
+    progress: float
+    index: int = 0
+    """position of the chunk inside the file"""
+    cache: ParseCacheWriter = None
+    """writer of the parse cache entry, which receives the parsed chunk"""
+    part: str = None
+    """archive of an already parsed chunk inside the parse cache, data is empty in this case"""
+
+
+class ImportFileReader:
+    """
+    Reads a delimited import file into a columnar :class:`~GeologicalDataProcessing.models.import_data.ImportData`
+    result. The first line of the file defines the column names, the second line the units. The reader doesn't touch
+    any gui element and can therefore be used inside the import threads.
+
+    The file is accessed through a read only memory map (:class:`~GeologicalDataProcessing.services.mapped_file.
+    MappedFile`), lines are located inside the mapped pages and decoded only when they are parsed.
+
+    gzip, bzip2, xz and zstandard compressed files are decompressed while reading
+    (:class:`~GeologicalDataProcessing.services.compressed_file.CompressedFile`), without unpacking them first.
+
+    If the on-disk :class:`~GeologicalDataProcessing.services.parse_cache.ParseCache` is enabled via
+    config.import_cache_size, parsed files are stored inside the cache. As long as the file is unchanged, repeated
+    reads load the typed columns from the cache instead of parsing the text again.
+    """
+
+    logger = QGISLogHandler("ImportFileReader")
+
+    def __init__(self, filename: str, separator: str, metadata: FileMetadata = None, cache: ParseCache = None) -> None:
+        """
+        :param filename: path to the import file
+        :param separator: column separator, "<tabulator>" is accepted as alias for '\t'
+        :param metadata: cached header information of the file, the header lines are read from the file, if None
+        :param cache: on-disk cache for parsed files, defaults to a cache with the configured directory and size
+        """
+        self.__filename = os.path.normpath(filename)
+        self.__separator = '\t' if separator == "<tabulator>" else separator
+        self.__metadata = metadata
+        self.__cache = ParseCache() if cache is None else cache
+        self.__compressed = CompressedFile.is_compressed(self.__filename)
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def filename(self) -> str:
+        """
+        Returns the path to the import file
+        :return: the path to the import file
+        """
+        return self.__filename
+
+    @property
+    def separator(self) -> str:
+        """
+        Returns the column separator
+        :return: the column separator
+        """
+        return self.__separator
+
+    #
+    # public functions
+    #
+
+    def read_header(self) -> Tuple[List[str], List[str]]:
+        """
+        Reads the column names and units from the import file
+        :return: a tuple of the column names and the related units. Missing units are filled with empty strings.
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        if self.__has_metadata():
+            return self._parse_header(*self.__metadata.header)
+
+        if self.__compressed:
+            with CompressedFile(self.__filename) as compressed:
+                lines = compressed.head(2)
+            return self._parse_header(*(lines + [""] * (2 - len(lines))))
+
+        with MappedFile(self.__filename) as mapped:
+            return self._read_header(mapped)[:2]
+
+    def read(self) -> ImportData:
+        """
+        Reads the complete import file. Uncompressed files larger than config.import_parallel_parse_size are parsed
+        by multiple processes, see :meth:`read_parallel`.
+        :return: the parsed columnar data
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        key = self.__cache.key(self.__filename, self.__separator)
+        data = self.__cache.load(key)
+        if data is not None:
+            self.logger.debug("read import file {} from the parse cache", args=(self.__filename,))
+            return data
+
+        processes = config.import_parse_processes if config.import_parse_processes > 0 else (os.cpu_count() or 1)
+        if self.__compressed:
+            data = self.__read_compressed()
+        elif processes > 1 and os.path.getsize(self.__filename) >= config.import_parallel_parse_size:
+            data = self.read_parallel(processes)
+        else:
+            self.logger.debug("reading import file {}", args=(self.__filename,))
+            with MappedFile(self.__filename) as mapped:
+                cols, units, position = self._read_header(mapped)
+                data = self._parse_lines(cols, units, mapped.decode(position, mapped.size))
+
+        writer = self.__cache.writer(key)
+        if writer is not None:
+            count = 0
+            for count, chunk in enumerate(data.iter_chunks(config.import_chunk_size), start=1):
+                writer.add(count - 1, chunk)
+            writer.finish(count)
+
+        return data
+
+    def read_parallel(self, processes: int) -> ImportData:
+        """
+        Reads the complete import file with multiple worker processes. The data lines are split into newline aligned
+        byte ranges, which are parsed in parallel and concatenated in file order. If the worker processes cannot be
+        started, the file is parsed sequentially. Compressed files are always parsed sequentially.
+        :param processes: number of worker processes
+        :return: the parsed columnar data
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        if self.__compressed:
+            return self.__read_compressed()
+
+        self.logger.debug("reading import file {} with {} processes", args=(self.__filename, processes))
+
+        cols, units = self.read_header()
+        start = self.__metadata.data_start if self.__has_metadata() else None
+        try:
+            return ParallelParser(self.__filename, self.__separator, processes).parse(cols, units, start,
+                                                                                      self.__dtypes())
+        except (OSError, BrokenProcessPool) as e:
+            self.logger.warn("Parallel parsing failed, parsing the import file sequentially", str(e))
+
+        with MappedFile(self.__filename) as mapped:
+            position = mapped.line_end(0, 2)
+            return self._parse_lines(cols, units, mapped.decode(position, mapped.size))
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[ImportData]:
+        """
+        Reads the import file chunk by chunk. Only one chunk is held in memory at the same time, the header and unit
+        lines are resolved once and used for all chunks.
+        :param chunk_size: maximum number of data rows per chunk
+        :return: an iterator over the parsed chunks
+        :raises ImportError: if the file has less than two columns for the selected separator
+        :raises ValueError: if chunk_size is smaller than 1
+        """
+        for raw in self.iter_raw_chunks(chunk_size):
+            yield self.parse_chunk(raw)
+
+    def iter_raw_chunks(self, chunk_size: int) -> Iterator[RawChunk]:
+        """
+        Reads the import file chunk by chunk without decoding and parsing the lines. The chunks can be parsed
+        afterwards with :meth:`parse_chunk`, e.g. inside worker threads.
+
+        If the parse cache contains the file in chunks of at most chunk_size rows, the chunks reference the cached
+        archives instead. Otherwise the parsed chunks are written to a new cache entry, which becomes available, when
+        all chunks were parsed.
+        :param chunk_size: maximum number of data rows per chunk
+        :return: an iterator over the unparsed chunks
+        :raises ImportError: if the file has less than two columns for the selected separator
+        :raises ValueError: if chunk_size is smaller than 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk size has to be larger than 0")
+
+        key = self.__cache.key(self.__filename, self.__separator)
+        parts = self.__cache.parts(key)
+        if parts and max(rows for _, rows in parts) <= chunk_size:
+            self.logger.debug("reading import file {} from the parse cache", args=(self.__filename,))
+            cols, units = self.read_header()
+            for index, (part, _) in enumerate(parts):
+                yield RawChunk(cols, units, b"", 0, 0.0, index, None, part)
+            return
+
+        self.logger.debug("reading import file {} in chunks of {} rows", args=(self.__filename, chunk_size))
+
+        writer = self.__cache.writer(key)
+        try:
+            index = 0
+            for cols, units, data, progress in self.__iter_lines(chunk_size):
+                yield RawChunk(cols, units, data, index * chunk_size, progress, index, writer)
+                index += 1
+
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+
+        if writer is not None:
+            writer.finish(index)
+
+    def parse_chunk(self, raw: RawChunk) -> ImportData:
+        """
+        Parses a chunk returned by :meth:`iter_raw_chunks`
+        :param raw: unparsed chunk
+        :return: the parsed columnar data
+        """
+        if raw.part is not None:
+            return self.__cache.load_part(raw.part)
+
+        data = self._parse_lines(raw.columns, raw.units, MappedFile.decode_bytes(raw.data), raw.offset, raw.progress)
+        if raw.cache is not None:
+            raw.cache.add(raw.index, data)
+        return data
+
+    #
+    # protected functions
+    #
+
+    def _read_header(self, mapped: MappedFile) -> Tuple[List[str], List[str], int]:
+        """
+        reads the column names and units from the mapped import file
+        :param mapped: memory map of the import file
+        :return: a tuple of the column names, the related units and the position of the first data line
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        if self.__has_metadata():
+            return self._parse_header(*self.__metadata.header) + (self.__metadata.data_start,)
+
+        col_line, position = mapped.readline(0)
+        unit_line, position = mapped.readline(position)
+        return self._parse_header(col_line, unit_line) + (position,)
+
+    def _parse_header(self, col_line: str, unit_line: str) -> Tuple[List[str], List[str]]:
+        """
+        splits the header lines into column names and units
+        :param col_line: first line of the import file
+        :param unit_line: second line of the import file
+        :return: a tuple of the column names and the related units
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        cols = col_line.strip().split(self.__separator)
+        units = unit_line.strip().split(self.__separator)
+
+        if len(cols) < 2:
+            raise ImportError("Cannot read import file, not enough columns for selected separator")
+
+        self.logger.debug("cols:\t{}".format(cols))
+        self.logger.debug("units:\t{}".format(units))
+
+        units = units[:len(cols)] + [""] * (len(cols) - len(units))
+        return cols, units
+
+    def _parse_lines(self, cols: List[str], units: List[str], lines, offset: int = 0,
+                     progress: float = 1.0) -> ImportData:
+        """
+        parses data lines into typed columns
+        :param cols: column names
+        :param units: column units
+        :param lines: iterable of data lines
+        :param offset: index of the first line inside the import file
+        :param progress: part of the import file which was read including these lines
+        :return: the parsed columnar data
+        """
+        return ImportData(parse_lines(cols, units, lines, self.__separator, self.__dtypes()), offset, progress)
+
+    #
+    # private functions
+    #
+
+    def __iter_lines(self, chunk_size: int) -> Iterator[Tuple[List[str], List[str], bytes, float]]:
+        """
+        Reads the data lines of the import file in newline aligned blocks, compressed files are decompressed on the fly
+        :param chunk_size: maximum number of data lines per block
+        :return: an iterator over tuples of the column names, the units, the undecoded lines and the part of the file,
+                 which was read including these lines
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        if self.__compressed:
+            cols, units = self.read_header()
+            with CompressedFile(self.__filename) as compressed:
+                for data in compressed.iter_line_blocks(chunk_size, 2):
+                    yield cols, units, data, compressed.progress
+            return
+
+        with MappedFile(self.__filename) as mapped:
+            cols, units, position = self._read_header(mapped)
+            while position < mapped.size:
+                end = mapped.line_end(position, chunk_size)
+                yield cols, units, mapped.read(position, end), end / mapped.size
+                position = end
+
+    def __read_compressed(self) -> ImportData:
+        """
+        Decompresses and parses the complete import file
+        :return: the parsed columnar data
+        :raises ImportError: if the file has less than two columns for the selected separator
+        """
+        self.logger.debug("reading compressed import file {}", args=(self.__filename,))
+
+        cols, units = self.read_header()
+        with CompressedFile(self.__filename) as compressed:
+            lines = b"".join(compressed.iter_line_blocks(config.import_chunk_size, 2))
+        return self._parse_lines(cols, units, MappedFile.decode_bytes(lines))
+
+    def __dtypes(self) -> List[ColumnTypes] or None:
+        """
+        Returns the column types inferred from the sample rows of the file or None, if no metadata is available
+        :return: the inferred column types or None
+        """
+        return self.__metadata.dtypes if self.__has_metadata() else None
+
+    def __has_metadata(self) -> bool:
+        """
+        Returns True, if cached header information for this file and separator is available
+        :return: True, if cached header information for this file and separator is available
+        """
+        return (self.__metadata is not None) and (self.__metadata.path == self.__filename) and \
+               (self.__metadata.separator == self.__separator)
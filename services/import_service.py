@@ -6,13 +6,17 @@ module to provide the import service
 import inspect
 import os
 from qgis.core import QgsCoordinateReferenceSystem
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 
-from GeologicalDataProcessing.geological_data_processing import GeologicalDataProcessingDockWidget
+from GeologicalDataProcessing.geological_data_processing_dockwidget import GeologicalDataProcessingDockWidget
 from GeologicalDataProcessing.miscellaneous.config_handler import ConfigHandler
 from GeologicalDataProcessing.miscellaneous.exception_handler import ExceptionHandler
 from GeologicalDataProcessing.miscellaneous.helper import get_file_name
 from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ImportData
+from GeologicalDataProcessing.services.columnar_file_reader import ColumnarFileReader
+from GeologicalDataProcessing.services.file_metadata import FileMetadata, FileMetadataCache
+from GeologicalDataProcessing.services.import_file_reader import ImportFileReader
 from PyQt5.QtCore import pyqtSignal, QObject
 from PyQt5.QtWidgets import QFileDialog
 
@@ -54,6 +58,7 @@ class ImportService(QObject):
             self.separator = ","
             self.import_file = ""
             self.__config_handler = ConfigHandler()
+            self.__metadata_cache = FileMetadataCache()
 
     #
     # signals
@@ -251,61 +256,56 @@ class ImportService(QObject):
         self.import_file_changed.emit("")
         self.reset_import.emit()
 
-    def read_import_file(self) -> Dict:
+    def read_import_file(self) -> ImportData:
         """
-        Read the import file and return the resulting dictionary
-        :return: the resulting dictionary
+        Read the import file and return the resulting columnar data. The result can also be used like the former
+        dictionary {col: {"property": unit, "values": [str, ...]}}.
+        :return: the resulting columnar data
         """
         self.logger.debug("reading import file {}".format(self.import_file))
 
         try:
-            separator = self.separator
-            if separator == "<tabulator>":
-                separator = '\t'
+            if ColumnarFileReader.is_columnar_file(self.import_file):
+                return ColumnarFileReader(self.import_file).read()
+            return ImportFileReader(self.import_file, self.separator, self.get_file_metadata()).read()
 
-            result = dict()
-
-            with open(os.path.normpath(self.import_file), 'r') as import_file:
-
-                cols = import_file.readline().strip().split(separator)
-                props = import_file.readline().strip().split(separator)
-
-                if len(cols) < 2:
-                    raise ImportError("Cannot read import file, not enough columns for selected separator")
-
-                self.logger.debug("cols:\t{}".format(cols))
-                self.logger.debug("props:\t{}".format(props))
+        except IOError:
+            self.logger.error("Cannot open file", "{}".format(self.import_file))
+        except Exception as e:
+            self.logger.error("Error", str(ExceptionHandler(e)))
+            self.reset()
 
-                for i in range(0, len(cols)):
-                    try:
-                        p = props[i]
-                    except IndexError:
-                        p = ""
+    def get_import_reader(self) -> ImportFileReader or ColumnarFileReader:
+        """
+        Returns a reader for the currently selected import file and separator. Contrary to
+        :meth:`read_import_file`, the reader can be handed over to the import threads, which read the file chunk by
+        chunk. Parquet and Feather / Arrow IPC files are read with a
+        :class:`~GeologicalDataProcessing.services.columnar_file_reader.ColumnarFileReader`.
+        :return: a reader for the currently selected import file
+        """
+        self.__validate()
 
-                    result[cols[i]] = {
-                        "property": p,
-                        "values": list()
-                    }
+        if ColumnarFileReader.is_columnar_file(self.import_file):
+            return ColumnarFileReader(self.import_file)
 
-                for line in import_file:
-                    line = line.strip().split(separator)
-                    for i in range(0, len(line)):
-                        if i >= len(cols):
-                            break
+        metadata = None
+        try:
+            metadata = self.get_file_metadata()
+        except OSError as e:
+            self.logger.warn("Cannot read header of import file", str(e))
 
-                        result[cols[i]]["values"].append(line[i])
+        return ImportFileReader(self.import_file, self.separator, metadata)
 
-                    # fill the rest with empty values
-                    for i in range(len(line), len(cols)):
-                        result[cols[i]]["values"].append("")
+    def get_file_metadata(self) -> FileMetadata:
+        """
+        Returns the cached header information of the currently selected import file and separator. The file is only
+        read, if it wasn't read before or has changed since then.
+        :return: the header information of the current import file
+        :raises IOError: if the file cannot be read
+        """
+        self.__validate()
 
-            return result
-
-        except IOError:
-            ("Cannot open file", "{}".format(self.import_file))
-        except Exception as e:
-            self.logger.error("Error", str(ExceptionHandler(e)))
-            self.reset()
+        return self.__metadata_cache.get(self.import_file, self.separator)
 
     #
     # slots
@@ -338,42 +338,43 @@ class ImportService(QObject):
             return
 
         try:
-            separator = self.separator
             self.logger.debug("Selected file", "{}".format(filename))
-            if separator == "<tabulator>":
-                separator = '\t'
-
-            try:
-                import_file = open(os.path.normpath(filename), 'r')
-            except IOError:
-                self.logger.error("Cannot open file", "{}".format(filename))
-                return
 
-            cols = import_file.readline().strip()
-
-            if len(cols.split(separator)) < 3:
-                self.separator = self.find_separator(cols)
+            if ColumnarFileReader.is_columnar_file(filename):
+                try:
+                    reader = ColumnarFileReader(filename)
+                    cols, units = reader.read_header()
+                    nr_cols = reader.number_columns
+                except (IOError, ImportError) as e:
+                    self.logger.error("Cannot open file", "{}: {}".format(filename, e))
+                    self.reset()
+                    return
+
+            else:
                 separator = self.separator
-                self.logger.debug("Selected another separator: {}"
-                                  .format("<tabulator>" if separator == '\t' else separator))
+                if separator == "<tabulator>":
+                    separator = '\t'
 
-            cols = cols.split(separator)
-            units = import_file.readline().strip().split(separator)
-            data = import_file.readline().strip().split(separator)
+                try:
+                    cols = self.__metadata_cache.head(filename, 1)[0].strip()
+                except IOError:
+                    self.logger.error("Cannot open file", "{}".format(filename))
+                    return
+
+                if len(cols.split(separator)) < 3:
+                    self.separator = self.find_separator(cols)
+                    separator = self.separator
+                    self.logger.debug("Selected another separator: {}"
+                                      .format("<tabulator>" if separator == '\t' else separator))
+
+                metadata = self.__metadata_cache.get(filename, separator)
+                cols = metadata.columns
+                units = metadata.units
+                nr_cols = metadata.number_columns
+                self.logger.debug("data:\t{}", args=(metadata.samples[0] if len(metadata.samples) > 0 else [],))
 
             self.logger.debug("cols:\t{}".format(cols))
             self.logger.debug("units:\t{}".format(units))
-            self.logger.debug("data:\t{}".format(data))
-
-            import_file.close()
-
-            nr_cols = []
-            for col in data:
-                try:
-                    float(col)
-                    nr_cols.append(data.index(col))
-                except ValueError:
-                    pass
 
             if len(nr_cols) < 3:
                 self.logger.warn("Not enough columns",
@@ -446,21 +447,22 @@ class ImportService(QObject):
 
         # noinspection PyCallByClass,PyArgumentList
         filename = get_file_name(QFileDialog.getOpenFileName(self.dockwidget, "Select data file", path,
-                                                             "Data Files(*.txt *.csv *.data);;Any File Type (*)"))
+                                                             "Data Files(*.txt *.csv *.data *.gz *.bz2 *.xz *.zst);;"
+                                                             "Columnar Files(*.parquet *.pq *.feather *.arrow *.ipc);;"
+                                                             "Any File Type (*)"))
         if filename != "":
             self.__config_handler.set("General", "current working path", os.path.dirname(filename))
+            if ColumnarFileReader.is_columnar_file(filename):
+                self.import_file = filename
+                return
+
             try:
-                import_file = open(filename, 'r')
+                cols, props, data = [line.strip() for line in self.__metadata_cache.head(filename, 3)]
             except IOError as e:
                 self.logger.error("Cannot open file", e)
                 self.dockwidget.start_import_button.setEnabled(False)
                 return
 
-            cols = import_file.readline().strip()
-            props = import_file.readline().strip()
-            data = import_file.readline().strip()
-            import_file.close()
-
             if '' in [cols, props, data]:
                 self.logger.error("Import File Error",
                                   "Cannot process import_tests file, wrong file format!")
@@ -0,0 +1,74 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing the vectorized segmentation of line import data
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn
+
+
+class LineSegments(NamedTuple):
+    """
+    Lines found inside a chunk of the import data. The vertices of segment k are the chunk rows
+    rows[offsets[k]:offsets[k + 1]].
+    """
+    rows: np.ndarray
+    """chunk row index of each vertex, rows without coordinates are left out"""
+    offsets: np.ndarray
+    """start of each segment inside rows followed by the number of vertices"""
+    closed: np.ndarray
+    """True for each segment with more than one vertex, which ends at its first vertex"""
+    continues: bool
+    """True, if the first segment starts at the first chunk row and may continue the line of the previous chunk"""
+    open_end: bool
+    """True, if the last segment ends at the last chunk row and may be continued by the next chunk"""
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of segments
+        :return: the number of segments
+        """
+        return len(self.offsets) - 1
+
+
+def segment_lines(east: ImportColumn, north: ImportColumn, alt: ImportColumn = None, offset: int = 0) -> LineSegments:
+    """
+    Splits the rows of a chunk into lines. Rows without coordinates separate two lines, a line is closed, if the
+    coordinates of the last vertex are equal to the first one. All boundaries are determined on the coordinate arrays
+    at once.
+    :param east: easting column of the chunk
+    :param north: northing column of the chunk
+    :param alt: altitude column of the chunk or None, if no altitude was selected
+    :param offset: index of the first chunk row inside the import file, used for error messages
+    :return: the line segments of the chunk
+    :raises ValueError: if a row has only one coordinate or a coordinate column contains text
+    """
+    for column in (east, north, alt):
+        if (column is not None) and (column.dtype == ColumnTypes.TEXT):
+            raise ValueError("text column {} cannot be converted to float".format(column.name))
+
+    valid = east.mask & north.mask
+    incomplete = np.flatnonzero(east.mask ^ north.mask)
+    if len(incomplete) > 0:
+        raise ValueError("Incomplete coordinates in data row {}".format(offset + incomplete[0] + 1))
+
+    rows = np.flatnonzero(valid)
+    count = len(valid)
+
+    # a segment starts at each vertex, which doesn't follow directly on the previous vertex
+    starts = np.flatnonzero(np.diff(rows, prepend=-2) != 1)
+    offsets = np.append(starts, len(rows))
+
+    first = rows[offsets[:-1]]
+    last = rows[offsets[1:] - 1]
+    closed = (last > first) & (east.values[first] == east.values[last]) & (north.values[first] == north.values[last])
+    if alt is not None:
+        closed &= (alt.mask[first] == alt.mask[last]) & \
+                  (~alt.mask[first] | (alt.values[first] == alt.values[last]))
+
+    return LineSegments(rows, offsets, closed, len(rows) > 0 and rows[0] == 0,
+                        len(rows) > 0 and rows[-1] == count - 1)
@@ -0,0 +1,216 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing read only memory mapped access to import files
+
+The module only depends on the standard library, so it can be used inside the parser worker processes.
+"""
+
+import codecs
+import io
+import locale
+import mmap
+import os
+from typing import Iterator, List, Tuple
+
+
+class MappedFile:
+    """
+    Read only memory map of an import file, used as context manager. Lines are located directly inside the mapped
+    pages and only the requested parts are decoded. Multiple processes mapping the same file share the pages of the
+    operating system cache, no data is copied into private read buffers.
+
+    Lines are separated by '\\n', '\\r\\n' or a lone '\\r' and decoded with a '\\n' line break (universal newlines like
+    files opened in text mode), so the located lines are equal to the decoded lines. Ranges are decoded block by block,
+    so decoding a large range never holds more than a single block of text in memory.
+    """
+
+    encoding = locale.getpreferredencoding(False)
+    """text encoding of the import files, equal to the default encoding of open()"""
+
+    block_size = 1024 * 1024
+    """number of bytes decoded at once"""
+
+    def __init__(self, filename: str) -> None:
+        """
+        :param filename: path to the file
+        """
+        self.__filename = filename
+        self.__file = None
+        self.__buffer: mmap.mmap or bytes = b""
+
+    def __enter__(self) -> "MappedFile":
+        self.__file = open(self.__filename, "rb")
+        try:
+            # empty files cannot be mapped
+            if os.fstat(self.__file.fileno()).st_size > 0:
+                self.__buffer = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.__file.close()
+            raise
+        return self
+
+    def __exit__(self, *_) -> None:
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+        self.__buffer = b""
+        self.__file.close()
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the file in bytes
+        :return: the size of the file in bytes
+        """
+        return len(self.__buffer)
+
+    #
+    # public functions
+    #
+
+    def line_end(self, position: int, count: int = 1) -> int:
+        """
+        Returns the position after the next count lines
+        :param position: start position, should be the beginning of a line
+        :param count: number of lines to skip
+        :return: position of the first byte after the lines or the file size, if the file ends before
+        """
+        size = len(self.__buffer)
+        for _ in range(count):
+            if position >= size:
+                break
+            end = self.__buffer.find(b"\n", position)
+            end = size if end < 0 else end
+
+            # a lone '\r' before the next '\n' ends the line as well
+            cr = self.__buffer.find(b"\r", position, end)
+            position = end + 1 if (cr < 0) or (cr + 1 == end) else cr + 1
+        return min(position, size)
+
+    def line_start(self, position: int) -> int:
+        """
+        Returns the beginning of the first line starting at or after position
+        :param position: any position inside the file
+        :return: position of the line beginning or the file size
+        """
+        if position <= 0:
+            return 0
+
+        previous = self.__buffer[position - 1:position]
+        if (previous == b"\n") or ((previous == b"\r") and (self.__buffer[position:position + 1] != b"\n")):
+            return min(position, len(self.__buffer))
+        return self.line_end(position)
+
+    def count_lines(self, position: int = 0) -> int:
+        """
+        Counts the lines from position to the end of the file, a last line without line break is counted as well
+        :param position: start position, should be the beginning of a line
+        :return: the number of lines
+        """
+        size = len(self.__buffer)
+        if position >= size:
+            return 0
+
+        count = 0
+        block = 16 * 1024 * 1024
+        for start in range(position, size, block):
+            stop = min(start + block, size)
+            data = self.__buffer[start:stop]
+            # a '\r\n' at the end of the block is counted once, including the first byte of the next block
+            count += data.count(b"\n") + data.count(b"\r") - self.__buffer[start:stop + 1].count(b"\r\n")
+
+        return count if self.__buffer[size - 1:size] in (b"\n", b"\r") else count + 1
+
+    def readline(self, position: int) -> Tuple[str, int]:
+        """
+        Reads a single line
+        :param position: beginning of the line
+        :return: a tuple of the decoded line including the line break and the position of the next line
+        """
+        end = self.line_end(position)
+        return "".join(self.decode(position, end)), end
+
+    def sample_lines(self, start: int, count: int) -> List[str]:
+        """
+        Returns up to count lines evenly distributed between start and the end of the file, e.g. to sample the data
+        rows of a large file without reading it completely. Each line is the first line beginning at or after a
+        sample position.
+        :param start: beginning of the sampled part of the file
+        :param count: number of sample positions
+        :return: list of the decoded lines without line breaks, ordered by position
+        """
+        size = len(self.__buffer)
+        lines = list()
+        last = -1
+        for nr in range(count):
+            position = self.line_start(start + (size - start) * nr // count)
+            if position >= size:
+                break
+            if position == last:
+                continue
+
+            last = position
+            line, _ = self.readline(position)
+            lines.append(line.rstrip("\n"))
+
+        return lines
+
+    def head(self, count: int) -> List[str]:
+        """
+        Returns the first lines of the file without line breaks. Missing lines are returned as empty strings.
+        :param count: number of lines
+        :return: list of the decoded lines
+        """
+        lines = [line.rstrip("\n") for line in self.decode(0, self.line_end(0, count))]
+        return lines + [""] * (count - len(lines))
+
+    def read(self, start: int, stop: int) -> bytes:
+        """
+        Returns the bytes of the range [start, stop)
+        :param start: first byte of the range
+        :param stop: byte after the last one of the range
+        :return: the bytes of the range
+        """
+        return self.__buffer[start:stop]
+
+    def decode(self, start: int, stop: int) -> Iterator[str]:
+        """
+        Decodes the range [start, stop) with universal newlines
+        :param start: first byte of the range
+        :param stop: byte after the last one of the range
+        :return: an iterator over the decoded lines of the range including their line breaks
+        """
+        return self.decode_bytes(self.__buffer, start, stop)
+
+    @classmethod
+    def decode_bytes(cls, data: bytes or mmap.mmap, start: int = 0, stop: int = None) -> Iterator[str]:
+        """
+        Decodes bytes read from an import file with universal newlines. The bytes are passed block by block to an
+        incremental decoder via memoryviews, neither the bytes nor the decoded text are copied as a whole.
+        :param data: bytes read from an import file or a memory map of the file
+        :param start: first byte to decode
+        :param stop: byte after the last one to decode, defaults to the end of data
+        :return: an iterator over the decoded lines including their line breaks
+        """
+        stop = len(data) if stop is None else stop
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(cls.encoding)(), translate=True)
+
+        rest = ""
+        for position in range(start, stop, cls.block_size):
+            # views have to be released before the next line is returned, a memory map cannot be closed otherwise
+            with memoryview(data) as view, view[position:min(position + cls.block_size, stop)] as block:
+                lines = (rest + decoder.decode(block)).split("\n")
+
+            rest = lines.pop()
+            for line in lines:
+                yield line + "\n"
+
+        lines = (rest + decoder.decode(b"", final=True)).split("\n")
+        rest = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if rest != "":
+            yield rest
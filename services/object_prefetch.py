@@ -0,0 +1,75 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing functions to load many database objects with a small number of queries
+"""
+
+from typing import Dict, Iterable, Set, Type
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.session import Session
+
+from geological_toolbox.db_handler import AbstractDBObject
+
+query_size = 500
+"""maximum number of values inside a single IN (...) clause, stays below the SQLite parameter limit of 999"""
+
+
+def load_by_ids(cls: Type[AbstractDBObject], session: Session, ids: Iterable[int],
+                *relations: str) -> Dict[int, AbstractDBObject]:
+    """
+    Loads all objects of type cls with the given ids using chunked IN (...) queries instead of one query per object
+    :param cls: database class, e.g. GeoPoint
+    :param session: SQLAlchemy session used for all database requests
+    :param ids: ids of the requested objects, duplicates are allowed
+    :param relations: names of relationships loaded together with the objects, e.g. "properties"
+    :return: a dictionary id -> object. Ids without a database entry are not part of the result.
+    """
+    ids = sorted(set(ids))
+    options = [selectinload(getattr(cls, relation)) for relation in relations]
+
+    result = dict()
+    for start in range(0, len(ids), query_size):
+        query = session.query(cls).options(*options).filter(cls.id.in_(ids[start:start + query_size]))
+        for obj in query:
+            obj.session = session
+            result[obj.id] = obj
+
+    return result
+
+
+def existing_ids(cls: Type[AbstractDBObject], session: Session, ids: Iterable[int]) -> Set[int]:
+    """
+    Returns the ids, which have a database entry of type cls, using chunked IN (...) queries. Only the ids are
+    requested, no objects are loaded.
+    :param cls: database class, e.g. Line
+    :param session: SQLAlchemy session used for all database requests
+    :param ids: requested ids, duplicates are allowed
+    :return: the set of existing ids
+    """
+    ids = sorted(set(ids))
+
+    result = set()
+    for start in range(0, len(ids), query_size):
+        result.update(_id for _id, in session.query(cls.id).filter(cls.id.in_(ids[start:start + query_size])))
+
+    return result
+
+
+def ids_by_value(cls: Type[AbstractDBObject], session: Session, column: str, values: Iterable) -> Dict[any, int]:
+    """
+    Returns the ids of all objects of type cls, whose column has one of the given values, using chunked IN (...)
+    queries. The column should be unique, e.g. the well name.
+    :param cls: database class, e.g. Well
+    :param session: SQLAlchemy session used for all database requests
+    :param column: name of the column, e.g. "wellname"
+    :param values: requested values, duplicates are allowed
+    :return: a dictionary value -> id. Values without a database entry are not part of the result.
+    """
+    values = sorted(set(values))
+    attribute = getattr(cls, column)
+
+    result = dict()
+    for start in range(0, len(values), query_size):
+        result.update(session.query(attribute, cls.id).filter(attribute.in_(values[start:start + query_size])))
+
+    return result
@@ -0,0 +1,179 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing a process parallel parser for large delimited import files
+
+The module only depends on numpy and the import data model, so the worker processes don't have to import QGIS.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Set, Tuple
+
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn, ImportData
+from GeologicalDataProcessing.services.mapped_file import MappedFile
+
+
+def parse_lines(cols: List[str], units: List[str], lines: Iterable[str], separator: str,
+                dtypes: List[ColumnTypes] = None) -> List[ImportColumn]:
+    """
+    Splits data lines and parses them into typed columns. Missing cells are filled with empty strings, additional
+    cells are ignored.
+    :param cols: column names
+    :param units: column units
+    :param lines: iterable of data lines
+    :param separator: column separator
+    :param dtypes: expected data types of the columns, e.g. inferred from sample rows, or None
+    :return: list of parsed columns
+    """
+    nr_cols = len(cols)
+    values = [list() for _ in range(nr_cols)]
+
+    for line in lines:
+        line = line.strip().split(separator)
+        line = line[:nr_cols] + [""] * (nr_cols - len(line))
+        for i in range(nr_cols):
+            values[i].append(line[i])
+
+    if dtypes is None:
+        dtypes = [None] * nr_cols
+
+    return [ImportColumn.from_strings(cols[i], units[i], values[i], dtypes[i]) for i in range(nr_cols)]
+
+
+def parse_range(filename: str, separator: str, cols: List[str], units: List[str], start: int, stop: int,
+                dtypes: List[ColumnTypes] = None) -> List[ImportColumn]:
+    """
+    Worker function: parses the lines inside the byte range [start, stop) of the import file. The range has to start
+    at the beginning of a line. The file is memory mapped, so all workers share the cached pages of the file.
+    :param filename: path to the import file
+    :param separator: column separator
+    :param cols: column names
+    :param units: column units
+    :param start: first byte of the range
+    :param stop: byte after the last one of the range
+    :param dtypes: expected data types of the columns or None
+    :return: list of parsed columns
+    """
+    with MappedFile(filename) as mapped:
+        return parse_lines(cols, units, mapped.decode(start, stop), separator, dtypes)
+
+
+class ParallelParser:
+    """
+    Parses the data lines of a delimited import file in worker processes. The data part of the file (after the two
+    header lines) is split into newline aligned byte ranges, which are parsed independently into typed columns. The
+    parts are concatenated in file order afterwards.
+
+    Parts of a column, which were parsed as numbers in one range but contain text in another one, are parsed again as
+    text, so the result equals the sequential parsing of the file.
+    """
+
+    def __init__(self, filename: str, separator: str, processes: int, min_range_size: int = 4 * 1024 * 1024) -> None:
+        """
+        :param filename: path to the import file
+        :param separator: column separator
+        :param processes: number of worker processes
+        :param min_range_size: minimum size of a byte range in bytes
+        """
+        self.__filename = filename
+        self.__separator = separator
+        self.__processes = max(int(processes), 1)
+        self.__min_range_size = max(int(min_range_size), 1)
+
+    #
+    # public functions
+    #
+
+    def data_start(self) -> int:
+        """
+        Returns the position of the first data line, which follows the column and the unit line
+        :return: the byte position of the first data line
+        """
+        with MappedFile(self.__filename) as mapped:
+            return mapped.line_end(0, 2)
+
+    def split(self, start: int) -> List[Tuple[int, int]]:
+        """
+        Splits the file from start to the end into newline aligned byte ranges. Each worker process gets up to four
+        ranges to balance the load.
+        :param start: first byte of the first range
+        :return: list of byte ranges (start, stop)
+        """
+        ranges = list()
+        with MappedFile(self.__filename) as mapped:
+            size = mapped.size
+            count = max(min(self.__processes * 4, (size - start) // self.__min_range_size), 1)
+            step = (size - start) // count
+
+            for _ in range(count - 1):
+                stop = mapped.line_start(start + step)
+                if stop >= size:
+                    break
+                ranges.append((start, stop))
+                start = stop
+
+        if start < size:
+            ranges.append((start, size))
+        return ranges
+
+    def parse(self, cols: List[str], units: List[str], start: int = None,
+              dtypes: List[ColumnTypes] = None) -> ImportData:
+        """
+        Parses all data lines of the import file
+        :param cols: column names
+        :param units: column units
+        :param start: position of the first data line, determined from the file, if None
+        :param dtypes: expected data types of the columns, e.g. inferred from sample rows, or None
+        :return: the parsed columnar data
+        """
+        ranges = self.split(self.data_start() if start is None else start)
+        if len(ranges) == 0:
+            return ImportData(parse_lines(cols, units, [], self.__separator))
+
+        if dtypes is None:
+            dtypes = [None] * len(cols)
+
+        with ProcessPoolExecutor(max_workers=min(self.__processes, len(ranges)),
+                                 mp_context=self.__context()) as pool:
+            futures = [pool.submit(parse_range, self.__filename, self.__separator, cols, units, start, stop, dtypes)
+                       for start, stop in ranges]
+            parts = [future.result() for future in futures]
+
+            # ranges with numeric columns, which contain text in other ranges, have to be parsed again
+            retry: Dict[int, Set[int]] = dict()
+            for index in range(len(cols)):
+                types = set(part[index].dtype for part in parts)
+                if ColumnTypes.TEXT in types and (ColumnTypes.INT in types or ColumnTypes.FLOAT in types):
+                    for nr, part in enumerate(parts):
+                        if part[index].dtype in (ColumnTypes.INT, ColumnTypes.FLOAT):
+                            retry.setdefault(nr, set()).add(index)
+
+            futures = dict()
+            for nr, text_columns in retry.items():
+                retry_types = [ColumnTypes.TEXT if index in text_columns else dtype
+                               for index, dtype in enumerate(dtypes)]
+                futures[nr] = pool.submit(parse_range, self.__filename, self.__separator, cols, units, ranges[nr][0],
+                                          ranges[nr][1], retry_types)
+            for nr, future in futures.items():
+                parts[nr] = future.result()
+
+        return ImportData([ImportColumn.concat([part[index] for part in parts]) for index in range(len(cols))])
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __context() -> multiprocessing.context.BaseContext:
+        """
+        Returns the multiprocessing context of the worker processes. New processes are spawned, because forking the
+        multi threaded QGIS process is unsafe. On Windows, sys.executable is the QGIS executable, therefore the python
+        interpreter of the QGIS installation is used instead.
+        :return: the multiprocessing context
+        """
+        context = multiprocessing.get_context("spawn")
+        if os.name == "nt" and not os.path.basename(sys.executable).lower().startswith("python"):
+            context.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+        return context
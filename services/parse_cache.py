@@ -0,0 +1,349 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing an on-disk cache for parsed import files
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn, ImportData
+
+
+class ParseCache:
+    """
+    Stores parsed import files as binary numpy archives (.npz), so repeated imports of the same file skip the text
+    parsing. An entry is a directory with one archive per parsed chunk and is identified by the path, modification
+    time, size and separator of the import file. Entries are written to a temporary directory and become visible
+    after the last chunk was written.
+
+    The total size of the cache is limited: the least recently used entries are removed, if a new entry exceeds the
+    limit.
+    """
+
+    logger = QGISLogHandler("ParseCache")
+
+    version = 1
+    """format version, part of the entry key"""
+
+    __temp_prefix = ".tmp-"
+
+    def __init__(self, directory: str = None, max_size: int = None) -> None:
+        """
+        :param directory: cache directory, defaults to config.import_cache_directory or
+                          $HOME/.geological_data_processing_cache
+        :param max_size: maximum size of the cache in bytes, defaults to config.import_cache_size. 0 disables the cache,
+                         which is the default.
+        """
+        if directory is None:
+            directory = config.import_cache_directory
+        if directory == "":
+            directory = str(Path.joinpath(Path.home(), ".geological_data_processing_cache"))
+
+        self.__directory = directory
+        self.__max_size = config.import_cache_size if max_size is None else max_size
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def directory(self) -> str:
+        """
+        Returns the cache directory
+        :return: the cache directory
+        """
+        return self.__directory
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns True, if the cache is enabled
+        :return: True, if the cache is enabled
+        """
+        return self.__max_size > 0
+
+    #
+    # public functions
+    #
+
+    def key(self, filename: str, separator: str) -> str or None:
+        """
+        Returns the key of the current version of the import file
+        :param filename: path to the import file
+        :param separator: column separator
+        :return: the entry key or None, if the file doesn't exist
+        """
+        filename = os.path.normpath(os.path.abspath(filename))
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+
+        text = "{}|{}|{}|{}|{}".format(filename, stat.st_mtime_ns, stat.st_size, separator, self.version)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def parts(self, key: str) -> List[Tuple[str, int]] or None:
+        """
+        Returns the archives of a cache entry in file order and marks the entry as recently used
+        :param key: entry key
+        :return: list of tuples of the path to a chunk archive and its number of rows or None, if the entry doesn't
+                 exist
+        """
+        if not self.enabled or key is None:
+            return None
+
+        path = os.path.join(self.__directory, key)
+        try:
+            with open(os.path.join(path, "parts.json"), "r") as manifest:
+                parts = json.load(manifest)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        self.logger.debug("cache hit for entry {}", args=(key,))
+        return [(os.path.join(path, name), rows) for name, rows in parts]
+
+    def load(self, key: str) -> ImportData or None:
+        """
+        Loads a complete cache entry
+        :param key: entry key
+        :return: the cached data or None, if the entry doesn't exist or the chunks cannot be combined
+        """
+        parts = self.parts(key)
+        if parts is None:
+            return None
+
+        try:
+            chunks = [self.load_part(part) for part, _ in parts]
+            columns = [ImportColumn.concat([chunk.columns[index] for chunk in chunks])
+                       for index in range(len(chunks[0].columns))]
+            return ImportData(columns)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            self.logger.debug("cannot load cache entry {}: {}", args=(key, e))
+            return None
+
+    @staticmethod
+    def load_part(path: str) -> ImportData:
+        """
+        Loads a single chunk archive
+        :param path: path to the archive
+        :return: the parsed chunk
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            meta = json.loads(str(archive["meta"]))
+            columns = list()
+            for index, (name, unit, dtype) in enumerate(zip(meta["columns"], meta["units"], meta["dtypes"])):
+                dtype = ColumnTypes[dtype]
+                categories = archive["c{}".format(index)] if dtype == ColumnTypes.TEXT else None
+                raw = archive["r{}".format(index)] if "r{}".format(index) in archive.files else None
+                columns.append(ImportColumn(name, unit, dtype, archive["v{}".format(index)],
+                                            archive["m{}".format(index)], categories, raw))
+
+        return ImportData(columns, meta["offset"], meta["progress"])
+
+    def writer(self, key: str) -> "ParseCacheWriter" or None:
+        """
+        Starts a new cache entry
+        :param key: entry key
+        :return: a writer for the entry or None, if the cache is disabled or the directory cannot be created
+        """
+        if not self.enabled or key is None:
+            return None
+
+        path = os.path.join(self.__directory, "{}{}-{}".format(self.__temp_prefix, key, uuid.uuid4().hex))
+        try:
+            os.makedirs(path)
+        except OSError as e:
+            self.logger.warn("Cannot create parse cache directory", str(e))
+            return None
+
+        return ParseCacheWriter(self, key, path)
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries, until the cache size is below the limit. Temporary directories of
+        aborted entries are removed after one day.
+        :return: Nothing
+        """
+        entries: List[Tuple[float, int, str]] = list()
+        try:
+            names = os.listdir(self.__directory)
+        except OSError:
+            return
+
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.__directory, name)
+            try:
+                if name.startswith(self.__temp_prefix):
+                    if now - os.path.getmtime(path) > 24 * 3600:
+                        shutil.rmtree(path, ignore_errors=True)
+                    continue
+
+                size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+                entries.append((os.path.getmtime(path), size, path))
+            except OSError:
+                continue
+
+        total = sum(entry[1] for entry in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.__max_size:
+                break
+            self.logger.debug("evicting parse cache entry {}", args=(path,))
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    #
+    # protected functions
+    #
+
+    def _publish(self, key: str, path: str) -> None:
+        """
+        Makes a completely written entry visible and evicts old entries
+        :param key: entry key
+        :param path: temporary directory of the entry
+        :return: Nothing
+        """
+        target = os.path.join(self.__directory, key)
+        try:
+            if os.path.isdir(target):
+                shutil.rmtree(target, ignore_errors=True)
+            os.replace(path, target)
+        except OSError as e:
+            self.logger.warn("Cannot store parse cache entry", str(e))
+            shutil.rmtree(path, ignore_errors=True)
+            return
+
+        self.evict()
+
+
+class ParseCacheWriter:
+    """
+    Writes the chunks of a new cache entry. Chunks can be added from multiple threads in any order. The entry is
+    published, when all chunks announced by :meth:`finish` were written.
+    """
+
+    def __init__(self, cache: ParseCache, key: str, path: str) -> None:
+        """
+        :param cache: the parent cache
+        :param key: entry key
+        :param path: temporary directory of the entry
+        """
+        self.__cache = cache
+        self.__key = key
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__rows = dict()
+        self.__count = None
+        self.__closed = False
+
+    #
+    # public functions
+    #
+
+    def add(self, index: int, data: ImportData) -> None:
+        """
+        Writes a parsed chunk. Errors are logged and abort the entry, they never interrupt the import.
+        :param index: position of the chunk inside the file, starting with 0
+        :param data: the parsed chunk
+        :return: Nothing
+        """
+        arrays = dict()
+        for nr, column in enumerate(data.columns):
+            arrays["v{}".format(nr)] = column.values
+            arrays["m{}".format(nr)] = column.mask
+            if column.dtype == ColumnTypes.TEXT:
+                arrays["c{}".format(nr)] = column.categories
+            if column.raw is not None:
+                arrays["r{}".format(nr)] = column.raw
+
+        meta = {
+            "columns": [column.name for column in data.columns],
+            "units": [column.unit for column in data.columns],
+            "dtypes": [column.dtype.name for column in data.columns],
+            "offset": data.offset,
+            "progress": data.progress
+        }
+
+        with self.__lock:
+            if self.__closed:
+                return
+
+        try:
+            with open(os.path.join(self.__path, self.__part(index)), "wb") as archive:
+                np.savez(archive, meta=np.array(json.dumps(meta)), **arrays)
+        except OSError as e:
+            if not self.__closed:
+                self.__cache.logger.warn("Cannot write parse cache entry", str(e))
+                self.abort()
+            return
+
+        with self.__lock:
+            self.__rows[index] = data.row_count
+        self.__publish_if_complete()
+
+    def finish(self, count: int) -> None:
+        """
+        Announces the number of chunks of the entry. The entry is published as soon as all chunks were written.
+        :param count: number of chunks
+        :return: Nothing
+        """
+        with self.__lock:
+            self.__count = count
+        self.__publish_if_complete()
+
+    def abort(self) -> None:
+        """
+        Discards the entry, chunks added afterwards are ignored
+        :return: Nothing
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+
+        shutil.rmtree(self.__path, ignore_errors=True)
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __part(index: int) -> str:
+        """
+        Returns the file name of a chunk archive
+        :param index: position of the chunk inside the file
+        :return: the file name of the archive
+        """
+        return "part-{:06d}.npz".format(index)
+
+    def __publish_if_complete(self) -> None:
+        """
+        Publishes the entry, if all chunks were written
+        :return: Nothing
+        """
+        with self.__lock:
+            if self.__closed or (self.__count is None) or (len(self.__rows) < self.__count):
+                return
+            self.__closed = True
+
+        try:
+            with open(os.path.join(self.__path, "parts.json"), "w") as manifest:
+                json.dump([(self.__part(index), self.__rows[index]) for index in range(self.__count)], manifest)
+        except OSError as e:
+            self.__cache.logger.warn("Cannot write parse cache entry", str(e))
+            shutil.rmtree(self.__path, ignore_errors=True)
+            return
+
+        self.__cache._publish(self.__key, self.__path)
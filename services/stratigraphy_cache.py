@@ -0,0 +1,75 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing a horizon cache, which resolves stratigraphic units once per import run
+"""
+
+from typing import Dict
+
+from sqlalchemy.orm.session import Session
+
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import QGISLogHandler
+from geological_toolbox.stratigraphy import StratigraphicObject
+
+
+class StratigraphyCache:
+    """
+    Replacement for :meth:`~geological_toolbox.stratigraphy.StratigraphicObject.init_stratigraphy` inside the import
+    loops. All existing horizons are loaded with a single query, afterwards each horizon is resolved from memory.
+
+    The results are equal to init_stratigraphy: unit names are unique inside the database, so an existing horizon is
+    returned regardless of the requested age and the age is only used when a new horizon is created. New horizons are
+    added to the session and flushed immediately, so they have a valid id for bulk inserts and are found by later
+    requests of the same name.
+    """
+
+    def __init__(self, session: Session, preload: bool = True) -> None:
+        """
+        :param session: SQLAlchemy session used for all database requests
+        :param preload: load all existing horizons at once, else each horizon is requested on first use
+        """
+        self.__logger = QGISLogHandler(self.__class__.__name__)
+        self.__session = session
+        self.__horizons: Dict[str, StratigraphicObject] = dict()
+
+        if preload:
+            self.preload()
+
+    def __len__(self) -> int:
+        return len(self.__horizons)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__horizons
+
+    #
+    # public functions
+    #
+
+    def preload(self) -> None:
+        """
+        Loads all horizons stored in the database with a single query
+        :return: Nothing
+        """
+        for horizon in StratigraphicObject.load_all_from_db(self.__session):
+            self.__horizons[horizon.statigraphic_name] = horizon
+
+        self.__logger.debug("{} horizons preloaded", args=(len(self.__horizons),))
+
+    def get(self, name: str, age: float = -1) -> StratigraphicObject:
+        """
+        Returns the stratigraphic unit with the given name. Creates a new one, if no unit with this name exists.
+        :param name: name of the stratigraphic unit
+        :param age: age of the stratigraphic unit (-1 if none)
+        :return: the stratigraphic unit with the given name
+        :raises ValueError: if age is not compatible to float
+        """
+        if name in self.__horizons:
+            return self.__horizons[name]
+
+        horizon = StratigraphicObject.init_stratigraphy(self.__session, name, age)
+        if horizon.id is None:
+            self.__session.add(horizon)
+            self.__session.flush()
+            self.__logger.debug("new horizon: {}", args=(horizon,))
+
+        self.__horizons[name] = horizon
+        return horizon
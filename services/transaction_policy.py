@@ -0,0 +1,88 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing the transaction policy of the import writers
+"""
+
+import time
+
+import GeologicalDataProcessing.config as config
+
+
+class TransactionPolicy:
+    """
+    Defines, when the bulk writers of an import commit and how failing batches are handled.
+
+    A batch is committed after batch_size objects or after commit_interval seconds, whatever comes first. Small batches
+    and short intervals lose less work on a crash, large batches give a higher throughput. Each batch is written inside
+    a savepoint. If isolate_errors is set and the batch fails, it is rolled back to the savepoint and written again
+    object by object, each inside its own savepoint. Failing objects are skipped and reported, all others are committed.
+    """
+
+    def __init__(self, batch_size: int = None, commit_interval: float = None, isolate_errors: bool = None) -> None:
+        """
+        :param batch_size: maximum number of objects committed at once, defaults to config.import_batch_size
+        :param commit_interval: maximum number of seconds between two commits, defaults to
+                                config.import_commit_interval. 0 disables time based commits.
+        :param isolate_errors: skip failing objects instead of failing the import, defaults to
+                               config.import_isolate_errors
+        :raises ValueError: if batch_size is smaller than 1 or commit_interval is negative
+        """
+        batch_size = config.import_batch_size if batch_size is None else batch_size
+        commit_interval = config.import_commit_interval if commit_interval is None else commit_interval
+
+        if batch_size < 1:
+            raise ValueError("batch size has to be larger than 0")
+        if commit_interval < 0:
+            raise ValueError("commit interval must not be negative")
+
+        self.__batch_size = int(batch_size)
+        self.__commit_interval = float(commit_interval)
+        self.__isolate_errors = config.import_isolate_errors if isolate_errors is None else bool(isolate_errors)
+
+    def __repr__(self) -> str:
+        return "<TransactionPolicy(batch_size={}, commit_interval={}, isolate_errors={})>". \
+            format(self.__batch_size, self.__commit_interval, self.__isolate_errors)
+
+    #
+    # setter and getter
+    #
+
+    @property
+    def batch_size(self) -> int:
+        """
+        Returns the maximum number of objects committed at once
+        :return: the maximum number of objects committed at once
+        """
+        return self.__batch_size
+
+    @property
+    def commit_interval(self) -> float:
+        """
+        Returns the maximum number of seconds between two commits, 0 if time based commits are disabled
+        :return: the maximum number of seconds between two commits
+        """
+        return self.__commit_interval
+
+    @property
+    def isolate_errors(self) -> bool:
+        """
+        Returns True, if failing objects are skipped instead of failing the import
+        :return: True, if failing objects are skipped
+        """
+        return self.__isolate_errors
+
+    #
+    # public functions
+    #
+
+    def is_due(self, pending: int, last_commit: float) -> bool:
+        """
+        Checks, if the pending objects have to be committed
+        :param pending: number of objects collected since the last commit
+        :param last_commit: time of the last commit, as returned by time.monotonic()
+        :return: True, if the pending objects have to be committed
+        """
+        if pending >= self.__batch_size:
+            return True
+        return (self.__commit_interval > 0) and (pending > 0) and \
+               (time.monotonic() - last_commit >= self.__commit_interval)
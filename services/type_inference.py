@@ -0,0 +1,37 @@
+# -*- coding: UTF-8 -*-
+"""
+module providing the column type inference for import files
+"""
+
+from typing import List, NamedTuple
+
+import numpy as np
+
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn
+
+
+class ColumnInfo(NamedTuple):
+    """inferred data type and ratio of empty cells of an import column"""
+    dtype: ColumnTypes
+    null_ratio: float
+
+
+def infer_types(columns: List[str], rows: List[List[str]]) -> List[ColumnInfo]:
+    """
+    Infers the data types of the columns from sample rows. Each column of the sample is converted at once with the
+    rules of the parser (:meth:`~GeologicalDataProcessing.models.import_data.ImportColumn.from_strings`), so the
+    inferred type is the type the column would get, if the file only contained the sample rows.
+    :param columns: column names
+    :param rows: sample rows split into cells, all rows need one cell per column
+    :return: the inferred data type and the ratio of empty cells for each column
+    """
+    if len(rows) == 0:
+        return [ColumnInfo(ColumnTypes.EMPTY, 1.0) for _ in columns]
+
+    cells = np.array(rows, dtype=str).reshape(len(rows), len(columns))
+    result = list()
+    for index, name in enumerate(columns):
+        column = ImportColumn.from_strings(name, "", cells[:, index])
+        result.append(ColumnInfo(column.dtype, 1.0 - float(np.count_nonzero(column.mask)) / len(column)))
+
+    return result
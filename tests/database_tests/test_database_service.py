@@ -0,0 +1,164 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the DatabaseService
+"""
+
+import os.path
+import tempfile
+import unittest
+from typing import Dict
+
+from sqlalchemy import text
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.services.database_service import DatabaseService
+
+
+class TestDatabaseServiceClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.database_service module. The tests use SQLite databases inside a
+    temporary directory, the previous connection settings of the service are restored afterwards.
+    """
+
+    def setUp(self) -> None:
+        """
+        Connects the service to a new SQLite database
+
+        :return: None
+        """
+        self.service = DatabaseService.get_instance()
+        self.settings = (self.service.db_type, self.service.connection)
+        self.bulk_load = config.sqlite_bulk_load
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.service.db_type = "sqlite"
+        self.service.connection = os.path.join(self.directory.name, "test.db")
+
+    def test_engine_reuse(self) -> None:
+        """
+        test that the database engine is reused, until the connection parameters change
+        :return: Nothing
+        """
+        self.service.connect()
+        engine = self.service.get_session().get_bind()
+        self.service.close_session()
+
+        self.service.connect()
+        self.assertIs(self.service.get_session().get_bind(), engine)
+        self.service.close_session()
+
+        self.service.connection = os.path.join(self.directory.name, "other.db")
+        self.service.connect()
+        self.assertIsNot(self.service.get_session().get_bind(), engine)
+        self.assertEqual(self.service.check_connection(), "")
+
+    def test_dispose(self) -> None:
+        """
+        test that a disposed engine is removed and recreated by the next connect
+        :return: Nothing
+        """
+        self.service.connect()
+        engine = self.service.get_session().get_bind()
+
+        self.service.dispose()
+        with self.assertRaises(ConnectionError):
+            self.service.get_session()
+
+        self.service.connect()
+        self.assertIsNot(self.service.get_session().get_bind(), engine)
+
+    def test_sqlite_pragmas(self) -> None:
+        """
+        test that the configured pragmas are applied to new SQLite connections
+        :return: Nothing
+        """
+        self.service.connect()
+        session = self.service.get_session()
+
+        self.assertEqual(self.__pragma(session, "journal_mode"), str(config.sqlite_pragmas["journal_mode"]).lower())
+        self.assertEqual(self.__pragma(session, "cache_size"), config.sqlite_pragmas["cache_size"])
+        self.assertEqual(self.__pragma(session, "synchronous"),
+                         self.__synchronous(config.sqlite_pragmas["synchronous"]))
+
+    def test_bulk_load(self) -> None:
+        """
+        test that the bulk load mode drops the secondary indexes during the import and rebuilds them afterwards
+        :return: Nothing
+        """
+        self.service.connect()
+        session = self.service.get_session()
+        session.execute(text("CREATE INDEX test_index ON geopoints (east, north)"))
+        session.commit()
+        indexes = self.__indexes(session)
+        self.assertIn("test_index", indexes)
+
+        config.sqlite_bulk_load = False
+        self.assertEqual(self.service.begin_bulk_load(session), [])
+        self.assertEqual(self.__indexes(session), indexes)
+
+        config.sqlite_bulk_load = True
+        dropped = self.service.begin_bulk_load(session)
+        try:
+            self.assertEqual(sorted(dropped), sorted(indexes.values()))
+            self.assertEqual(self.__indexes(session), dict())
+            self.assertEqual(self.__pragma(session, "synchronous"),
+                             self.__synchronous(config.sqlite_import_synchronous))
+        finally:
+            self.service.end_bulk_load(session, dropped)
+
+        self.assertEqual(self.__indexes(session), indexes)
+        self.assertEqual(self.__pragma(session, "synchronous"),
+                         self.__synchronous(config.sqlite_pragmas["synchronous"]))
+
+    def tearDown(self) -> None:
+        """
+        Closes all connections and restores the previous connection settings
+
+        :return: Nothing
+        """
+        self.service.close_session()
+        self.service.dispose()
+        config.sqlite_bulk_load = self.bulk_load
+
+        db_type, connection = self.settings
+        if db_type != "":
+            self.service.db_type = db_type
+        self.service.connection = connection
+        self.directory.cleanup()
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __pragma(session, pragma: str) -> any:
+        """
+        Returns the current value of a pragma
+        :param session: session of the SQLite database
+        :param pragma: name of the pragma
+        :return: the current value
+        """
+        return session.execute(text("PRAGMA {}".format(pragma))).scalar()
+
+    @staticmethod
+    def __indexes(session) -> Dict[str, str]:
+        """
+        Returns the secondary indexes of the database, indexes of unique constraints are ignored
+        :param session: session of the SQLite database
+        :return: dictionary index name -> SQL statement
+        """
+        statement = text("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        return dict(session.execute(statement).fetchall())
+
+    @staticmethod
+    def __synchronous(value: str) -> int:
+        """
+        Returns the numeric value of a synchronous setting, as returned by the pragma
+        :param value: synchronous setting, e.g. NORMAL
+        :return: the numeric value
+        """
+        return ["OFF", "NORMAL", "FULL", "EXTRA"].index(str(value).upper())
+
+
+if __name__ == "__main__":
+    unittest.main()
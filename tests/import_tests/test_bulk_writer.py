@@ -0,0 +1,388 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the bulk writers of the import controllers
+"""
+
+import unittest
+from typing import Dict, List, Type
+
+from sqlalchemy import func, inspect, text
+from sqlalchemy.orm.session import Session
+
+from GeologicalDataProcessing.models.log_model import PropertyImportData
+from GeologicalDataProcessing.services.bulk_writer import LineBulkWriter, PointBulkWriter, PropertyBulkWriter, \
+    WellBulkWriter
+from GeologicalDataProcessing.services.copy_loader import CopyLoader
+from GeologicalDataProcessing.services.transaction_policy import TransactionPolicy
+from geological_toolbox.db_handler import AbstractDBObject, DBHandler
+from geological_toolbox.exceptions import WellMarkerDepthException
+from geological_toolbox.geometries import GeoPoint, Line
+from geological_toolbox.properties import Property, PropertyTypes
+from geological_toolbox.stratigraphy import StratigraphicObject
+from geological_toolbox.wells import Well, WellMarker
+
+
+class SQLiteCopyLoader(CopyLoader):
+    """
+    COPY loader for the SQLite test database. Ids are reserved above the largest id of the table and the rows are
+    inserted with a single executemany statement. Tables listed in fail execute a real COPY statement, which fails
+    inside SQLite.
+    """
+
+    def __init__(self, session: Session, fail: List[str] = ()) -> None:
+        """
+        :param session: SQLAlchemy session of the SQLite test database
+        :param fail: names of the tables, whose rows cannot be copied
+        """
+        super().__init__(session)
+        self.session = session
+        self.fail = list(fail)
+        self.reserved: Dict[str, List[int]] = dict()
+        self.copied: Dict[str, int] = dict()
+
+    @staticmethod
+    def is_available(session: Session) -> bool:
+        """
+        The test loader is available for all databases
+        :param session: SQLAlchemy session to check
+        :return: True
+        """
+        return True
+
+    def reserve_ids(self, cls: Type[AbstractDBObject], count: int) -> List[int]:
+        """
+        Reserves count ids above the largest id of the table and all ids reserved before
+        :param cls: database class, e.g. GeoPoint
+        :param count: number of requested ids
+        :return: list of reserved ids
+        """
+        reserved = self.reserved.setdefault(cls.__table__.name, list())
+        start = max([self.session.query(func.max(cls.id)).scalar() or 0] + reserved) + 1
+        ids = list(range(start, start + count))
+        reserved.extend(ids)
+        return ids
+
+    def copy(self, cls: Type[AbstractDBObject], rows: List[Dict]) -> None:
+        """
+        Inserts the rows into the table of cls
+        :param cls: database class, e.g. GeoPoint
+        :param rows: list of dictionaries column name -> value, all with the same keys
+        :return: Nothing
+        :raises OperationalError: if the table is listed in fail
+        """
+        name = cls.__table__.name
+        if name in self.fail:
+            self.session.execute(text("COPY {} FROM STDIN".format(name)))
+        self.session.execute(cls.__table__.insert(), rows)
+        self.copied[name] = self.copied.get(name, 0) + len(rows)
+
+
+class TestBulkWriterClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.bulk_writer module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize an empty SQLite database in memory
+
+        :return: None
+        """
+        self.handler = DBHandler(connection="sqlite:///:memory:", echo=False)
+        self.session = self.handler.get_session()
+
+    def test_point_writer(self) -> None:
+        """
+        test that new points and their properties are written in batches
+        :return: Nothing
+        """
+        horizon = StratigraphicObject("ro", 15, session=self.session)
+        prop = PropertyImportData("Strat_ID", PropertyTypes.INT, "")
+
+        writer = PointBulkWriter(self.session, TransactionPolicy(2, 0, False))
+        writer.add_point(horizon, "", 1.0, 2.0, 3.0, "set", "comment", [(prop, "16")])
+        self.assertEqual(writer.pending, 1)
+        self.assertEqual(self.session.query(GeoPoint).count(), 0)
+
+        # the second point completes the batch
+        writer.add_point(None, "", "4.5", 5.0, None)
+        self.assertEqual(writer.pending, 0)
+        self.assertEqual(writer.written, 2)
+        self.assertEqual(self.session.query(GeoPoint).count(), 2)
+
+        writer.add_point(horizon, "", 7.0, 8.0, 9.0, properties=[(prop, "17")])
+        writer.flush()
+        self.assertEqual(writer.written, 3)
+
+        points = self.session.query(GeoPoint).order_by(GeoPoint.id).all()
+        self.assertEqual([(p.easting, p.northing) for p in points], [(1.0, 2.0), (4.5, 5.0), (7.0, 8.0)])
+        self.assertEqual([p.has_z for p in points], [True, False, True])
+        self.assertEqual(points[0].horizon.statigraphic_name, "ro")
+        self.assertIsNone(points[1].horizon)
+        self.assertEqual(points[0].name, "set")
+        self.assertEqual(points[0].comment, "comment")
+        self.assertEqual([(p.property_name, p.property_value) for p in points[0].properties], [("Strat_ID", 16)])
+        self.assertEqual([(p.property_name, p.property_value) for p in points[2].properties], [("Strat_ID", 17)])
+        self.assertEqual(points[1].properties, [])
+        self.assertEqual(self.session.query(StratigraphicObject).count(), 1)
+
+    def test_point_writer_conversion(self) -> None:
+        """
+        test that points with invalid values fail the import, if the policy does not isolate errors
+        :return: Nothing
+        """
+        prop = PropertyImportData("Strat_ID", PropertyTypes.INT, "")
+
+        writer = PointBulkWriter(self.session, TransactionPolicy(10, 0, False))
+        with self.assertRaises(ValueError):
+            writer.add_point(None, "", "east", 2.0, None)
+        with self.assertRaises(ValueError):
+            writer.add_point(None, "", 1.0, 2.0, None, properties=[(prop, "x")])
+
+        writer.flush()
+        self.assertEqual(writer.written, 0)
+        self.assertEqual(self.session.query(GeoPoint).count(), 0)
+
+    def test_copy_loader(self) -> None:
+        """
+        test that the COPY loader is only available for PostgreSQL databases
+        :return: Nothing
+        """
+        self.assertFalse(CopyLoader.is_available(self.session))
+        with self.assertRaises(ValueError):
+            CopyLoader(self.session)
+
+    def test_point_writer_copy(self) -> None:
+        """
+        test that the points and properties are copied with the reserved ids
+        :return: Nothing
+        """
+        prop = PropertyImportData("nr", PropertyTypes.INT, "")
+        loader = SQLiteCopyLoader(self.session)
+
+        writer = PointBulkWriter(self.session, TransactionPolicy(10, 0, False), loader)
+        for i in range(3):
+            writer.add_point(None, "", float(i), float(i), None, properties=[(prop, str(i))])
+        writer.flush()
+
+        self.assertEqual(loader.copied, {"geopoints": 3, "properties": 3})
+        points = self.session.query(GeoPoint).order_by(GeoPoint.id).all()
+        self.assertEqual([p.id for p in points], loader.reserved["geopoints"])
+        for i, point in enumerate(points):
+            self.assertEqual(point.easting, float(i))
+            self.assertEqual([(p.id, p.property_value) for p in point.properties],
+                             [(loader.reserved["properties"][i], i)])
+
+    def test_point_writer_copy_fallback(self) -> None:
+        """
+        test that a failing COPY is rolled back and the writer falls back to ORM bulk inserts
+        :return: Nothing
+        """
+        prop = PropertyImportData("nr", PropertyTypes.INT, "")
+        loader = SQLiteCopyLoader(self.session, ["properties"])
+
+        writer = PointBulkWriter(self.session, TransactionPolicy(2, 0, False), loader)
+        for i in range(3):
+            writer.add_point(None, "", float(i), float(i), None, properties=[(prop, str(i))])
+        writer.flush()
+
+        # the copied points of the failed batch were rolled back, all later batches are written without COPY
+        self.assertEqual(loader.copied, {"geopoints": 2})
+        self.assertEqual(writer.written, 3)
+        self.assertEqual(self.session.query(GeoPoint).count(), 3)
+        self.assertEqual(self.session.query(Property).count(), 3)
+        for point in self.session.query(GeoPoint):
+            self.assertEqual([p.property_value for p in point.properties], [int(point.easting)])
+
+    def test_line_writer(self) -> None:
+        """
+        test that the vertices and their properties of existing lines are replaced
+        :return: Nothing
+        """
+        horizon = StratigraphicObject("ro", 15, session=self.session)
+        prop = PropertyImportData("nr", PropertyTypes.INT, "")
+
+        lines = list()
+        for i in range(2):
+            points = [GeoPoint(None, False, "", float(j), float(i), 0, self.session, "", "") for j in range(3)]
+            for point in points:
+                point.add_property(Property(value=i, _type=PropertyTypes.INT, property_name="nr", property_unit="",
+                                            session=self.session))
+            lines.append(Line(False, None, points, self.session, "line {}".format(i), ""))
+        self.session.add_all(lines)
+        self.session.commit()
+        line_id, other_id = [line.id for line in lines]
+        self.session.expunge_all()
+
+        writer = LineBulkWriter(self.session, TransactionPolicy(10, 0, False))
+        writer.replace_line(line_id, True, horizon, "ref", "new name", "comment",
+                            [(10.0, 11.0, 12.0, "first", "", [(prop, "5")]), ("20", 21.0, None, "", "", [])])
+        writer.flush()
+        self.assertEqual(writer.written, 1)
+
+        line = self.session.query(Line).get(line_id)
+        self.assertTrue(line.closed)
+        self.assertEqual(line.name, "new name")
+        self.assertEqual(line.comment, "comment")
+        self.assertEqual(line.horizon.statigraphic_name, "ro")
+        self.assertEqual([(p.easting, p.northing, p.line_pos) for p in line.points], [(10.0, 11.0, 0), (20.0, 21.0, 1)])
+        self.assertEqual([p.has_z for p in line.points], [True, False])
+        self.assertEqual([p.horizon.statigraphic_name for p in line.points], ["ro", "ro"])
+        self.assertEqual([p.property_value for p in line.points[0].properties], [5])
+        self.assertEqual(line.points[1].properties, [])
+
+        # the old vertices are deleted together with their properties, the other line is unchanged
+        self.assertEqual(self.session.query(GeoPoint).count(), 5)
+        self.assertEqual(self.session.query(Property).count(), 4)
+        other = self.session.query(Line).get(other_id)
+        self.assertFalse(other.closed)
+        self.assertEqual([(p.easting, p.line_pos) for p in other.points], [(0.0, 0), (1.0, 1), (2.0, 2)])
+        self.assertEqual([p.properties[0].property_value for p in other.points], [1, 1, 1])
+
+    def test_well_writer(self) -> None:
+        """
+        test that new wells are written with their markers and the markers of existing wells are replaced
+        :return: Nothing
+        """
+        ro = StratigraphicObject("ro", 15, session=self.session)
+        su = StratigraphicObject("su", 20, session=self.session)
+
+        writer = WellBulkWriter(self.session, TransactionPolicy(10, 0, False))
+        writer.add_well("well 1", "w1", 100, "ref", 1.0, 2.0, 3.0, [(10, ro, "top ro"), ("50.5", su, "")])
+        writer.add_well("well 2", "w2", "200", "ref", 4.0, 5.0, 6.0, [])
+        writer.flush()
+        self.assertEqual(writer.written, 2)
+
+        wells = self.session.query(Well).order_by(Well.id).all()
+        self.assertEqual([(w.well_name, w.short_name, w.depth) for w in wells],
+                         [("well 1", "w1", 100.0), ("well 2", "w2", 200.0)])
+        self.assertEqual([(w.easting, w.northing, w.altitude) for w in wells], [(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)])
+        self.assertEqual([(m.depth, m.horizon.statigraphic_name, m.comment) for m in wells[0].marker],
+                         [(10.0, "ro", "top ro"), (50.5, "su", "")])
+        self.assertEqual(wells[1].marker, [])
+        well_id = wells[0].id
+        self.session.expunge_all()
+
+        writer.replace_well(well_id, "well 1", "short", 150, 7.0, 8.0, [(120, su, "deeper")])
+        writer.flush()
+
+        well = self.session.query(Well).get(well_id)
+        self.assertEqual((well.well_name, well.short_name, well.depth), ("well 1", "short", 150.0))
+        self.assertEqual((well.easting, well.northing, well.altitude), (7.0, 8.0, 3.0))
+        self.assertEqual([(m.depth, m.horizon.statigraphic_name, m.comment) for m in well.marker],
+                         [(120.0, "su", "deeper")])
+        self.assertEqual(self.session.query(WellMarker).count(), 1)
+
+    def test_well_writer_validation(self) -> None:
+        """
+        test that wells with invalid depths or too long names are rejected
+        :return: Nothing
+        """
+        writer = WellBulkWriter(self.session, TransactionPolicy(10, 0, False))
+        with self.assertRaises(ValueError):
+            writer.add_well("well", "", -1, "", 0.0, 0.0, 0.0, [])
+        with self.assertRaises(WellMarkerDepthException):
+            writer.add_well("well", "", 10, "", 0.0, 0.0, 0.0, [(20, None, "")])
+        with self.assertRaises(ValueError):
+            writer.add_well("w" * 101, "", 10, "", 0.0, 0.0, 0.0, [])
+        with self.assertRaises(ValueError):
+            writer.replace_well(1, "well", "s" * 101, 10, 0.0, 0.0, [])
+        with self.assertRaises(ValueError):
+            writer.add_well("well", "", 10, "", 0.0, 0.0, 0.0, [(5, None, "c" * 101)])
+        with self.assertRaises(ValueError):
+            writer.add_well("well", "", 10, "", 0.0, 0.0, None, [])
+
+        writer.flush()
+        self.assertEqual(writer.written, 0)
+        self.assertEqual(writer.failed, [])
+
+        # the same wells are skipped, if the errors are isolated
+        writer = WellBulkWriter(self.session, TransactionPolicy(10, 0, True))
+        writer.add_well("w" * 101, "", 10, "", 0.0, 0.0, 0.0, [])
+        writer.add_well("well", "", 10, "", 0.0, 0.0, 0.0, [(20, None, "")])
+        writer.add_well("no altitude", "", 10, "", 0.0, 0.0, None, [])
+        writer.add_well("w" * 100, "", 10, "", 0.0, 0.0, 0.0, [])
+        writer.flush()
+
+        self.assertEqual(writer.written, 1)
+        self.assertEqual(len(writer.failed), 3)
+        self.assertIn("altitude is missing", writer.failed[2])
+        self.assertEqual([w.well_name for w in self.session.query(Well)], ["w" * 100])
+
+    def test_property_writer(self) -> None:
+        """
+        test that existing properties are updated and missing properties are inserted
+        :return: Nothing
+        """
+        points = [GeoPoint(None, False, "old", float(i), float(i), 0, self.session, "", "") for i in range(3)]
+        points[0].add_property(Property(value=1, _type=PropertyTypes.INT, property_name="nr", property_unit="",
+                                        session=self.session))
+        points[1].add_property(Property(value="a", _type=PropertyTypes.STRING, property_name="text",
+                                        property_unit="", session=self.session))
+        self.session.add_all(points)
+        self.session.commit()
+        ids = [point.id for point in points]
+        property_id = points[0].properties[0].id
+        self.session.expunge_all()
+
+        nr = PropertyImportData("nr", PropertyTypes.INT, "")
+        value = PropertyImportData("value", PropertyTypes.FLOAT, "m")
+
+        writer = PropertyBulkWriter(self.session, TransactionPolicy(10, 0, False), "new")
+        writer.set_properties(ids[0], [(nr, "2"), (value, "1.5")])
+        writer.set_properties(ids[1], [(nr, "3")])
+        # the last value of a property wins
+        writer.set_properties(ids[0], [(nr, "4")])
+        writer.flush()
+        self.assertEqual(writer.written, 3)
+
+        properties = {(p.point_id, p.property_name): p for p in self.session.query(Property)}
+        self.assertEqual(len(properties), 4)
+        self.assertEqual(properties[(ids[0], "nr")].id, property_id)
+        self.assertEqual(properties[(ids[0], "nr")].property_value, 4)
+        self.assertEqual(properties[(ids[0], "value")].property_value, 1.5)
+        self.assertEqual(properties[(ids[0], "value")].property_unit, "m")
+        self.assertEqual(properties[(ids[1], "nr")].property_value, 3)
+        self.assertEqual(properties[(ids[1], "text")].property_value, "a")
+
+        # only the reference systems of the written points are updated
+        references = dict(self.session.query(GeoPoint.id, GeoPoint.reference))
+        self.assertEqual([references[_id] for _id in ids], ["new", "new", "old"])
+
+        writer = PropertyBulkWriter(self.session, TransactionPolicy(10, 0, False))
+        writer.set_properties(ids[2], [(nr, "5")])
+        writer.flush()
+        self.assertEqual(self.session.query(GeoPoint.reference).filter(GeoPoint.id == ids[2]).scalar(), "old")
+        self.assertEqual(self.session.query(Property).count(), 5)
+
+    def test_expire_on_commit(self) -> None:
+        """
+        test that loaded objects stay usable after a batch commit and the session setting is restored afterwards
+        :return: Nothing
+        """
+        point = GeoPoint(None, False, "", 1.0, 2.0, 0, self.session, "", "")
+        self.session.add(point)
+        self.session.commit()
+        self.assertTrue(self.session.expire_on_commit)
+
+        # reload the point expired by the commit
+        self.assertEqual(point.easting, 1.0)
+
+        writer = PointBulkWriter(self.session, TransactionPolicy(1, 0, False))
+        writer.add_point(None, "", 3.0, 4.0, None)
+
+        self.assertEqual(writer.written, 1)
+        self.assertNotIn("east", inspect(point).expired_attributes)
+        self.assertTrue(self.session.expire_on_commit)
+
+    def tearDown(self) -> None:
+        """
+        Closes the database session
+
+        :return: Nothing
+        """
+        self.handler.close_last_session()
+
+
+if __name__ == "__main__":
+    unittest.main()
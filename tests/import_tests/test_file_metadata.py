@@ -0,0 +1,106 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the header metadata cache of import files
+"""
+
+import os
+import tempfile
+import unittest
+
+from GeologicalDataProcessing.models.import_data import ColumnTypes
+from GeologicalDataProcessing.services.file_metadata import FileMetadataCache
+from GeologicalDataProcessing.services.type_inference import ColumnInfo, infer_types
+
+
+class TestFileMetadataClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.file_metadata and the services.type_inference modules
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a temporary import file
+
+        :return: None
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "import.txt")
+        self.__write("E;N;Horizon\nm;m\n1;2.5;ro\n3;4;su\n")
+
+    def test_cached_metadata(self) -> None:
+        """
+        test that the metadata are read once per separator and file version
+        :return: Nothing
+        """
+        cache = FileMetadataCache(sample_rows=10)
+        metadata = cache.get(self.filename, ";")
+        self.assertEqual(metadata.columns, ["E", "N", "Horizon"])
+        self.assertEqual(metadata.units, ["m", "m", ""])
+        self.assertEqual(metadata.row_count, 2)
+        self.assertIs(cache.get(self.filename, ";"), metadata)
+        self.assertEqual(cache.get(self.filename, ",").columns, ["E;N;Horizon"])
+        self.assertEqual(cache.head(self.filename, 5), ["E;N;Horizon", "m;m", "1;2.5;ro", "3;4;su", ""])
+
+        # same size, but a new modification time
+        stat = os.stat(self.filename)
+        self.__write("X;Y;Horizon\nm;m\n1;2.5;ro\n3;4;su\n")
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        changed = cache.get(self.filename, ";")
+        self.assertIsNot(changed, metadata)
+        self.assertEqual(changed.columns, ["X", "Y", "Horizon"])
+
+        # new size, but the same modification time
+        stat = os.stat(self.filename)
+        self.__write("X;Y;Horizon\nm;m\n1;2.5;ro\n3;4;su\n5;6;mu\n")
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(cache.get(self.filename, ";").row_count, 3)
+        self.assertEqual(cache.head(self.filename, 5)[-1], "5;6;mu")
+
+        cache.clear()
+        self.assertIsNot(cache.get(self.filename, ";"), changed)
+
+    def test_type_inference(self) -> None:
+        """
+        test the data types inferred from sample rows
+        :return: Nothing
+        """
+        self.assertEqual(infer_types(["a", "b", "c", "d"], [["1", "1.5", "ro", ""], ["", "2", "3", ""]]),
+                         [ColumnInfo(ColumnTypes.INT, 0.5), ColumnInfo(ColumnTypes.FLOAT, 0.0),
+                          ColumnInfo(ColumnTypes.TEXT, 0.0), ColumnInfo(ColumnTypes.EMPTY, 1.0)])
+        self.assertEqual(infer_types(["a"], []), [ColumnInfo(ColumnTypes.EMPTY, 1.0)])
+
+        # the comments in the middle of the file are only found by sampling the rest of the file
+        self.__write("E;N;Comment\nm;m\n" + "".join("{};{}.5;{}\n".format(i, i, "text" if 500 <= i < 700 else "")
+                                                      for i in range(1000)))
+        metadata = FileMetadataCache(sample_rows=5).get(self.filename, ";")
+        self.assertEqual(len(metadata.samples), 10)
+        self.assertEqual([row[2] for row in metadata.samples[:5]], [""] * 5)
+        self.assertIn("text", [row[2] for row in metadata.samples[5:]])
+        self.assertEqual(metadata.dtypes, [ColumnTypes.INT, ColumnTypes.FLOAT, ColumnTypes.TEXT])
+        self.assertEqual(metadata.number_columns, [0, 1])
+        self.assertEqual(metadata.row_count, 1000)
+
+    def tearDown(self) -> None:
+        """
+        Removes the temporary directory
+
+        :return: Nothing
+        """
+        self.directory.cleanup()
+
+    #
+    # private functions
+    #
+
+    def __write(self, text: str) -> None:
+        """
+        Writes the temporary import file
+        :param text: content of the file
+        :return: Nothing
+        """
+        with open(self.filename, "w") as file:
+            file.write(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,295 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the columnar import data model
+"""
+
+import gzip
+import json
+import os.path
+import tempfile
+import unittest
+
+import numpy as np
+
+import GeologicalDataProcessing.config as config
+import GeologicalDataProcessing.tests.test_data as test_data
+from GeologicalDataProcessing.models.import_data import ColumnTypes, ImportColumn, ImportData
+from GeologicalDataProcessing.services.columnar_file_reader import ColumnarFileReader
+from GeologicalDataProcessing.services.compressed_file import CompressedFile
+from GeologicalDataProcessing.services.import_file_reader import ImportFileReader
+from GeologicalDataProcessing.services.line_segments import segment_lines
+from GeologicalDataProcessing.services.parallel_parser import ParallelParser
+from GeologicalDataProcessing.services.parse_cache import ParseCache
+
+
+class TestImportDataClass(unittest.TestCase):
+    """
+    This is a unittest class for the models.import_data module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize the test data path and a disabled parse cache inside a temporary directory
+
+        :return: None
+        """
+        self.test_data_path = os.path.dirname(test_data.__file__)
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(self.cache_directory.name, 0)
+
+    def test_column_types(self) -> None:
+        """
+        test the type detection of the column parser
+        :return: Nothing
+        """
+        self.assertEqual(ImportColumn.from_strings("a", "", ["1", "", "3"]).dtype, ColumnTypes.INT)
+        self.assertEqual(ImportColumn.from_strings("a", "", ["1.5", "", "3"]).dtype, ColumnTypes.FLOAT)
+        self.assertEqual(ImportColumn.from_strings("a", "", ["1.5", "ro", ""]).dtype, ColumnTypes.TEXT)
+        self.assertEqual(ImportColumn.from_strings("a", "", ["", ""]).dtype, ColumnTypes.EMPTY)
+
+    def test_type_hints(self) -> None:
+        """
+        test that expected data types skip the known conversions and fall back, if they don't fit
+        :return: Nothing
+        """
+        column = ImportColumn.from_strings("a", "", ["1", "", "3"], ColumnTypes.FLOAT)
+        self.assertEqual(column.dtype, ColumnTypes.FLOAT)
+        self.assertEqual(column.to_values(), [1.0, None, 3.0])
+        self.assertEqual(column.to_list(), ["1", "", "3"])
+
+        column = ImportColumn.from_strings("a", "", ["1", "", "3"], ColumnTypes.TEXT)
+        self.assertEqual(column.dtype, ColumnTypes.TEXT)
+        self.assertEqual(column.to_values(), ["1", None, "3"])
+
+        self.assertEqual(ImportColumn.from_strings("a", "", ["1.5", "ro"], ColumnTypes.FLOAT).dtype, ColumnTypes.TEXT)
+        self.assertEqual(ImportColumn.from_strings("a", "", ["1.5", "2"], ColumnTypes.INT).dtype, ColumnTypes.FLOAT)
+        self.assertEqual(ImportColumn.from_strings("a", "", ["", ""], ColumnTypes.TEXT).dtype, ColumnTypes.EMPTY)
+
+    def test_masked_values(self) -> None:
+        """
+        test the handling of empty cells
+        :return: Nothing
+        """
+        column = ImportColumn.from_strings("a", "m", ["1.5", "", "3"])
+        self.assertTrue(np.array_equal(column.mask, [True, False, True]))
+        self.assertEqual(column.get(0), 1.5)
+        self.assertIsNone(column.get(1))
+        self.assertEqual(column.get(1, -1), -1)
+        self.assertEqual(column.text(1), "")
+
+    def test_original_strings(self) -> None:
+        """
+        test that numeric columns return the original cell strings as text
+        :return: Nothing
+        """
+        column = ImportColumn.from_strings("a", "", ["0815", "+5", "", "7"])
+        self.assertEqual(column.dtype, ColumnTypes.INT)
+        self.assertEqual(column.to_values(), [815, 5, None, 7])
+        self.assertEqual(column.to_list(), ["0815", "+5", "", "7"])
+        self.assertEqual(column.slice(1, 2).text(0), "+5")
+
+        column = ImportColumn.from_strings("a", "", ["1.50", "1e3", "12345678901234567890"])
+        self.assertEqual(column.dtype, ColumnTypes.FLOAT)
+        self.assertEqual(column.to_list(), ["1.50", "1e3", "12345678901234567890"])
+
+        self.assertIsNone(ImportColumn.from_strings("a", "", ["1.5", "", "-2.25"]).raw)
+
+        data = ImportData([ImportColumn.from_strings("set", "", ["0815", "7"])])
+        self.assertEqual(list(data["set"]["values"]), ["0815", "7"])
+
+    def test_concat(self) -> None:
+        """
+        test the concatenation of column parts, e.g. parsed by different worker processes
+        :return: Nothing
+        """
+        column = ImportColumn.concat([ImportColumn.from_strings("a", "m", ["1", ""]),
+                                      ImportColumn.from_strings("a", "m", ["", ""]),
+                                      ImportColumn.from_strings("a", "m", ["2.5"])])
+        self.assertEqual(column.dtype, ColumnTypes.FLOAT)
+        self.assertTrue(np.array_equal(column.mask, [True, False, False, False, True]))
+        self.assertEqual(column.to_list(), ["1", "", "", "", "2.5"])
+        self.assertEqual(column.to_values(), [1.0, None, None, None, 2.5])
+
+        column = ImportColumn.concat([ImportColumn.from_strings("a", "", ["ro", ""]),
+                                      ImportColumn.from_strings("a", "", ["1", "su"], ColumnTypes.TEXT)])
+        self.assertEqual(column.dtype, ColumnTypes.TEXT)
+        self.assertEqual(column.to_list(), ["ro", "", "1", "su"])
+
+        with self.assertRaises(ValueError):
+            ImportColumn.concat([ImportColumn.from_strings("a", "", ["ro"]), ImportColumn.from_strings("a", "", ["1"])])
+
+    def test_parallel_parse(self) -> None:
+        """
+        test that the worker processes return the same columns and chunks as the sequential parsing
+        :return: Nothing
+        """
+        filename = os.path.join(self.cache_directory.name, "parallel.txt")
+        with open(filename, "w") as file:
+            file.write("Easting\tNorthing\tStratigraphy\tComment\nm\tm\n")
+            for i in range(3000):
+                # the comment column contains text in the last rows only
+                comment = "" if i % 7 else i if i < 2900 else "x"
+                file.write("{}\t{}.5\t{}\t{}\n".format(i, i, ["ro", "su"][i % 2], comment))
+
+        settings = (config.import_parse_processes, config.import_parallel_parse_size)
+        try:
+            config.import_parse_processes = 1
+            expected = ImportFileReader(filename, "\t", cache=self.cache).read()
+            config.import_parse_processes, config.import_parallel_parse_size = 2, 1
+            parallel = ImportFileReader(filename, "\t", cache=self.cache).read()
+        finally:
+            config.import_parse_processes, config.import_parallel_parse_size = settings
+
+        parser = ParallelParser(filename, "\t", 2, min_range_size=1024)
+        self.assertGreater(len(parser.split(parser.data_start())), 4)
+        ranges = parser.parse(["Easting", "Northing", "Stratigraphy", "Comment"], ["m", "m", "", ""])
+
+        self.assertEqual([col.dtype for col in expected.columns],
+                         [ColumnTypes.INT, ColumnTypes.FLOAT, ColumnTypes.TEXT, ColumnTypes.TEXT])
+        for data in [parallel, ranges]:
+            self.assertEqual([col.dtype for col in data.columns], [col.dtype for col in expected.columns])
+            self.assertEqual(data.as_dict(), expected.as_dict())
+            chunks = list(data.iter_chunks(700))
+            self.assertEqual([chunk.offset for chunk in chunks], [0, 700, 1400, 2100, 2800])
+            self.assertEqual([chunk.as_dict() for chunk in chunks],
+                             [chunk.as_dict() for chunk in expected.iter_chunks(700)])
+
+    def test_line_segments(self) -> None:
+        """
+        test the segmentation of line vertices into lines
+        :return: Nothing
+        """
+        east = ImportColumn.from_strings("E", "m", ["0", "1", "0", "", "", "5", "6", "", "7"])
+        north = ImportColumn.from_strings("N", "m", ["0", "1", "0", "", "", "5", "6", "", "7"])
+        segments = segment_lines(east, north)
+
+        self.assertEqual(segments.count, 3)
+        self.assertEqual(segments.rows.tolist(), [0, 1, 2, 5, 6, 8])
+        self.assertEqual(segments.offsets.tolist(), [0, 3, 5, 6])
+        self.assertEqual(segments.closed.tolist(), [True, False, False])
+        self.assertTrue(segments.continues)
+        self.assertTrue(segments.open_end)
+
+        with self.assertRaises(ValueError):
+            segment_lines(east, ImportColumn.from_strings("N", "m", ["0", "1", "0", "", "", "5", "", "", "7"]))
+
+    def test_dict_view(self) -> None:
+        """
+        test the compatibility view on the former dictionary result
+        :return: Nothing
+        """
+        data = ImportFileReader(os.path.join(self.test_data_path, "point_data.txt"), "\t", cache=self.cache).read()
+
+        self.assertIn("Easting", data)
+        self.assertEqual(data["Easting"]["property"], "m")
+        self.assertEqual(data["Easting"]["values"][0], "4502711.31")
+        self.assertEqual(data["Stratigraphy"]["values"][0], "ro")
+        self.assertEqual(len(data["Easting"]["values"]), data.row_count)
+        self.assertEqual(data.as_dict()["Point Set"]["values"], list(data["Point Set"]["values"]))
+
+    def test_parse_cache(self) -> None:
+        """
+        test that cached chunks are equal to the parsed chunks
+        :return: Nothing
+        """
+        filename = os.path.join(self.test_data_path, "point_data.txt")
+        self.assertFalse(self.cache.enabled)
+        ImportFileReader(filename, "\t", cache=self.cache).read()
+        self.assertEqual(os.listdir(self.cache_directory.name), [])
+
+        cache = ParseCache(self.cache_directory.name, 1024 * 1024)
+        parsed = list(ImportFileReader(filename, "\t", cache=cache).iter_chunks(10))
+        self.assertIsNotNone(cache.parts(cache.key(filename, "\t")))
+
+        cached = list(ImportFileReader(filename, "\t", cache=cache).iter_chunks(10))
+        self.assertEqual([chunk.offset for chunk in cached], [chunk.offset for chunk in parsed])
+        for first, second in zip(parsed, cached):
+            self.assertEqual([col.dtype for col in first.columns], [col.dtype for col in second.columns])
+            self.assertEqual(first.as_dict(), second.as_dict())
+
+    def test_compressed_file(self) -> None:
+        """
+        test that a compressed file results in the same chunks as the uncompressed file
+        :return: Nothing
+        """
+        filename = os.path.join(self.test_data_path, "point_data.txt")
+        with open(filename, "rb") as file:
+            raw = file.read()
+
+        with tempfile.TemporaryDirectory() as directory:
+            reader = ImportFileReader(filename, "\t", cache=self.cache)
+            expected = [chunk.as_dict() for chunk in reader.iter_chunks(10)]
+
+            # single member and multi member gzip files
+            for data in [gzip.compress(raw), b"".join(gzip.compress(raw[i:i + 100]) for i in range(0, len(raw), 100))]:
+                compressed = os.path.join(directory, "point_data.txt.gz")
+                with open(compressed, "wb") as file:
+                    file.write(data)
+
+                with CompressedFile(compressed, threads=2) as file:
+                    file.segment_size = 256
+                    self.assertEqual(b"".join(file.iter_blocks()), raw)
+
+                reader = ImportFileReader(compressed, "\t", cache=self.cache)
+                self.assertEqual([chunk.as_dict() for chunk in reader.iter_chunks(10)], expected)
+
+            # mixed line breaks, a '\r\n' is split between two blocks
+            raw = b"a;b\r\nm;m\r\n1;2\r\n3;4\r5;6\r\n7;8\r\n9;10\r"
+            with open(os.path.join(directory, "mixed.txt"), "wb") as file:
+                file.write(raw)
+            with gzip.open(os.path.join(directory, "mixed.txt.gz"), "wb") as file:
+                file.write(raw)
+
+            expected = [chunk.as_dict() for chunk in
+                        ImportFileReader(os.path.join(directory, "mixed.txt"), ";", cache=self.cache).iter_chunks(2)]
+            self.assertEqual([list(chunk["a"]["values"]) for chunk in expected], [["1", "3"], ["5", "7"], ["9"]])
+
+            block_size = CompressedFile.block_size
+            try:
+                for CompressedFile.block_size in [1, 2, 3, 5]:
+                    with CompressedFile(os.path.join(directory, "mixed.txt.gz")) as file:
+                        self.assertEqual(file.count_lines(), 7)
+                        self.assertEqual(file.head(3), ["a;b", "m;m", "1;2"])
+
+                    reader = ImportFileReader(os.path.join(directory, "mixed.txt.gz"), ";", cache=self.cache)
+                    self.assertEqual([chunk.as_dict() for chunk in reader.iter_chunks(2)], expected)
+            finally:
+                CompressedFile.block_size = block_size
+
+    @unittest.skipUnless(ColumnarFileReader.is_available(), "pyarrow is not installed")
+    def test_columnar_file(self) -> None:
+        """
+        test that a Parquet file results in the same columns as the delimited text file
+        :return: Nothing
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        data = ImportFileReader(os.path.join(self.test_data_path, "point_data.txt"), "\t", cache=self.cache).read()
+        table = pa.table({col.name: pa.array(col.to_values()) for col in data.columns})
+        table = table.replace_schema_metadata({"units": json.dumps({col.name: col.unit for col in data.columns})})
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "point_data.parquet")
+            pq.write_table(table, filename)
+            reader = ColumnarFileReader(filename)
+
+            self.assertEqual(reader.read_header(), (list(data.keys()), [col.unit for col in data.columns]))
+            chunks = list(reader.iter_chunks(10))
+            self.assertEqual([chunk.offset for chunk in chunks], [0, 10, 20, 30, 40])
+            for col in data.columns:
+                parsed = ImportColumn.concat([chunk.column(col.name) for chunk in chunks])
+                self.assertEqual(parsed.dtype, col.dtype)
+                self.assertEqual(parsed.to_values(), col.to_values())
+
+    def tearDown(self) -> None:
+        """
+        Removes the temporary parse cache directory
+
+        :return: Nothing
+        """
+        self.cache_directory.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
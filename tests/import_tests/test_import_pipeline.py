@@ -0,0 +1,146 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the staged import pipeline
+"""
+
+import os.path
+import tempfile
+import threading
+import time
+import unittest
+from typing import Iterator
+
+import GeologicalDataProcessing.tests.test_data as test_data
+from GeologicalDataProcessing.controller.import_pipeline import ImportPipeline
+from GeologicalDataProcessing.models.import_data import ImportData
+from GeologicalDataProcessing.services.import_file_reader import ImportFileReader
+from GeologicalDataProcessing.services.parse_cache import ParseCache
+
+
+class FailingImportData(ImportData):
+    """
+    Import data, which fails after the first chunk was read
+    """
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[ImportData]:
+        """
+        Returns the first chunk and raises an exception afterwards
+        :param chunk_size: maximum number of data rows per chunk
+        :return: an iterator over the first chunk
+        :raises IOError: after the first chunk
+        """
+        yield next(super().iter_chunks(chunk_size))
+        raise IOError("cannot read the next chunk")
+
+
+class TestImportPipelineClass(unittest.TestCase):
+    """
+    This is a unittest class for the controller.import_pipeline module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize the test data reader with a disabled parse cache inside a temporary directory
+
+        :return: None
+        """
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(self.cache_directory.name, 0)
+        self.filename = os.path.join(os.path.dirname(test_data.__file__), "point_data.txt")
+        self.reader = ImportFileReader(self.filename, "\t", cache=self.cache)
+        self.data = self.reader.read()
+
+    def test_order(self) -> None:
+        """
+        test that the chunks are returned in file order, even if later chunks are transformed faster
+        :return: Nothing
+        """
+        def transform(chunk: ImportData) -> int:
+            time.sleep(0.01 * (5 - chunk.offset // 10))
+            return chunk.row_count
+
+        for data in [self.reader, self.data]:
+            results = list(ImportPipeline(data, transform, workers=4, queue_size=2).run(10))
+            self.assertEqual([chunk.offset for chunk, _ in results], [0, 10, 20, 30, 40])
+            self.assertEqual([count for _, count in results], [chunk.row_count for chunk, _ in results])
+            self.assertEqual(sum(count for _, count in results), self.data.row_count)
+            self.assertEqual(results[0][0].as_dict(), next(self.data.iter_chunks(10)).as_dict())
+
+    def test_transform_error(self) -> None:
+        """
+        test that exceptions of the transform stage are reraised in the writing thread
+        :return: Nothing
+        """
+        def transform(chunk: ImportData) -> None:
+            if chunk.offset == 20:
+                raise ValueError("invalid chunk")
+
+        received = list()
+        with self.assertRaises(ValueError):
+            for chunk, _ in ImportPipeline(self.reader, transform, workers=2).run(10):
+                received.append(chunk.offset)
+
+        self.assertEqual(received, [0, 10])
+        self.assertFalse(self.__pipeline_threads())
+
+    def test_reader_error(self) -> None:
+        """
+        test that exceptions of the reader stage are reraised in the writing thread
+        :return: Nothing
+        """
+        data = FailingImportData(self.data.columns)
+        received = list()
+        with self.assertRaises(IOError):
+            for chunk, _ in ImportPipeline(data, lambda chunk: None, workers=2).run(10):
+                received.append(chunk.offset)
+        self.assertEqual(received, [0])
+
+        reader = ImportFileReader(os.path.join(self.cache_directory.name, "missing.txt"), "\t", cache=self.cache)
+        with self.assertRaises(OSError):
+            list(ImportPipeline(reader, lambda chunk: None).run(10))
+        self.assertFalse(self.__pipeline_threads())
+
+    def test_cancel(self) -> None:
+        """
+        test that the pipeline stops, if the import is canceled or the writing thread stops the iteration
+        :return: Nothing
+        """
+        cancel = threading.Event()
+        received = list()
+        for chunk, _ in ImportPipeline(self.reader, lambda chunk: None, cancel.is_set, 1, 1).run(5):
+            received.append(chunk.offset)
+            cancel.set()
+
+        # chunks read before the cancel request are still returned
+        self.assertLess(len(received), 9)
+        self.assertEqual(received, list(range(0, 5 * len(received), 5)))
+        self.assertFalse(self.__pipeline_threads())
+
+        for chunk, _ in ImportPipeline(self.reader, lambda chunk: None, workers=2, queue_size=1).run(5):
+            if chunk.offset == 10:
+                break
+        self.assertFalse(self.__pipeline_threads())
+
+    def tearDown(self) -> None:
+        """
+        Removes the temporary parse cache directory
+
+        :return: Nothing
+        """
+        self.cache_directory.cleanup()
+
+    #
+    # private functions
+    #
+
+    @staticmethod
+    def __pipeline_threads() -> bool:
+        """
+        Checks for running reader or worker threads of an import pipeline
+        :return: True, if a thread of an import pipeline is still running
+        """
+        return any(thread.name.startswith(("ImportReader", "ImportWorker")) for thread in threading.enumerate())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the memory mapped import files
+"""
+
+import os.path
+import tempfile
+import unittest
+
+from GeologicalDataProcessing.services.import_file_reader import ImportFileReader
+from GeologicalDataProcessing.services.mapped_file import MappedFile
+from GeologicalDataProcessing.services.parse_cache import ParseCache
+
+
+class TestMappedFileClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.mapped_file module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a temporary directory with a disabled parse cache and store the decoding block size
+
+        :return: None
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(self.directory.name, 0)
+        self.block_size = MappedFile.block_size
+
+    def test_line_breaks(self) -> None:
+        """
+        test that lines are located with the same line breaks as they are decoded: '\\n', '\\r\\n' and a lone '\\r'
+        :return: Nothing
+        """
+        filename = self.__write(b"a;b\r\nm;m\r\n1;2\r\n3;4\r5;6\r\n7;8\n9;10")
+        with MappedFile(filename) as mapped:
+            self.assertEqual(mapped.line_end(0, 2), 10)
+            self.assertEqual([mapped.line_end(position) for position in [10, 15, 19, 24, 28]], [15, 19, 24, 28, 32])
+            self.assertEqual(mapped.line_end(0, 10), mapped.size)
+
+            self.assertEqual([mapped.line_start(position) for position in [0, 1, 14, 16, 19, 20]],
+                             [0, 5, 15, 19, 19, 24])
+            self.assertEqual(mapped.count_lines(0), 7)
+            self.assertEqual(mapped.count_lines(19), 3)
+            self.assertEqual(mapped.readline(15), ("3;4\n", 19))
+
+            for block_size in [1, 2, 3, 1024]:
+                MappedFile.block_size = block_size
+                self.assertEqual(list(mapped.decode(10, mapped.size)), ["1;2\n", "3;4\n", "5;6\n", "7;8\n", "9;10"])
+
+        with MappedFile(self.__write(b"a;b\rm;m\r1;2\r\r")) as mapped:
+            self.assertEqual(mapped.line_end(0, 2), 8)
+            self.assertEqual(mapped.count_lines(), 4)
+            self.assertEqual(mapped.head(5), ["a;b", "m;m", "1;2", "", ""])
+
+    def test_chunks(self) -> None:
+        """
+        test that the chunks of a file with mixed line breaks start at the correct data rows
+        :return: Nothing
+        """
+        filename = self.__write(b"a;b\r\nm;m\r\n1;2\r\n3;4\r5;6\r\n7;8\r\n")
+        chunks = list(ImportFileReader(filename, ";", cache=self.cache).iter_chunks(2))
+
+        self.assertEqual([chunk.offset for chunk in chunks], [0, 2])
+        self.assertEqual([chunk.as_dict()["a"]["values"] for chunk in chunks], [["1", "3"], ["5", "7"]])
+        self.assertEqual(ImportFileReader(filename, ";", cache=self.cache).read().as_dict()["b"]["values"],
+                         ["2", "4", "6", "8"])
+
+    def tearDown(self) -> None:
+        """
+        Restores the decoding block size and removes the temporary directory
+
+        :return: Nothing
+        """
+        MappedFile.block_size = self.block_size
+        self.directory.cleanup()
+
+    #
+    # private functions
+    #
+
+    def __write(self, data: bytes) -> str:
+        """
+        Writes a temporary import file
+        :param data: content of the file
+        :return: path to the file
+        """
+        filename = os.path.join(self.directory.name, "import.txt")
+        with open(filename, "wb") as file:
+            file.write(data)
+        return filename
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the chunked loading of database objects
+"""
+
+import unittest
+
+from sqlalchemy import event
+
+import GeologicalDataProcessing.services.object_prefetch as object_prefetch
+from GeologicalDataProcessing.services.object_prefetch import existing_ids, ids_by_value, load_by_ids
+from geological_toolbox.db_handler import DBHandler
+from geological_toolbox.geometries import GeoPoint
+from geological_toolbox.properties import Property, PropertyTypes
+from geological_toolbox.wells import Well
+
+
+class TestObjectPrefetchClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.object_prefetch module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a SQLite database in memory with some points and wells. The query size is reduced, so the requests
+        are split into multiple IN (...) queries.
+
+        :return: None
+        """
+        self.query_size = object_prefetch.query_size
+        object_prefetch.query_size = 2
+
+        self.handler = DBHandler(connection="sqlite:///:memory:", echo=False)
+        self.session = self.handler.get_session()
+
+        for i in range(5):
+            point = GeoPoint(None, False, "", float(i), float(i), 0, self.session, "set", "")
+            point.add_property(Property(value=i, _type=PropertyTypes.INT, property_name="nr", property_unit="",
+                                        session=self.session))
+            self.session.add(point)
+            self.session.add(Well("well {}".format(i), "", 100, "", float(i), float(i), 0, self.session))
+        self.session.commit()
+
+        self.point_ids = [point.id for point in self.session.query(GeoPoint).order_by(GeoPoint.id)]
+        self.session.expunge_all()
+
+    def test_load_by_ids(self) -> None:
+        """
+        test that all requested objects are loaded together with the requested relationships
+        :return: Nothing
+        """
+        ids = self.point_ids[:4] + self.point_ids[:1] + [-1]
+        points = load_by_ids(GeoPoint, self.session, ids, "properties")
+
+        self.assertEqual(sorted(points.keys()), self.point_ids[:4])
+        for _id, point in points.items():
+            self.assertEqual(point.id, _id)
+            self.assertIn("properties", point.__dict__)
+            self.assertEqual([p.property_name for p in point.properties], ["nr"])
+
+        self.assertEqual(load_by_ids(GeoPoint, self.session, []), dict())
+
+    def test_existing_ids(self) -> None:
+        """
+        test that only ids with a database entry are returned
+        :return: Nothing
+        """
+        statements = list()
+
+        def listener(*args) -> None:
+            statements.append(args[2])
+
+        engine = self.session.get_bind()
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            # five unique ids, requested in chunks of two ids
+            ids = self.point_ids[1:] + self.point_ids[1:2] + [max(self.point_ids) + 1]
+            self.assertEqual(existing_ids(GeoPoint, self.session, ids), set(self.point_ids[1:]))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(existing_ids(GeoPoint, self.session, []), set())
+
+    def test_ids_by_value(self) -> None:
+        """
+        test the mapping of unique column values to ids
+        :return: Nothing
+        """
+        names = ["well 0", "well 3", "well 4", "well 3", "unknown"]
+        result = ids_by_value(Well, self.session, "wellname", names)
+
+        self.assertEqual(sorted(result.keys()), ["well 0", "well 3", "well 4"])
+        for name, _id in result.items():
+            self.assertEqual(self.session.query(Well).get(_id).well_name, name)
+
+    def tearDown(self) -> None:
+        """
+        Closes the database session and restores the query size
+
+        :return: Nothing
+        """
+        self.handler.close_last_session()
+        object_prefetch.query_size = self.query_size
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the per-import stratigraphy cache
+"""
+
+import unittest
+
+from sqlalchemy import event
+
+from GeologicalDataProcessing.services.stratigraphy_cache import StratigraphyCache
+from geological_toolbox.db_handler import DBHandler
+from geological_toolbox.stratigraphy import StratigraphicObject
+
+
+class TestStratigraphyCacheClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.stratigraphy_cache module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a SQLite database in memory with two horizons and collect the executed statements
+
+        :return: None
+        """
+        self.handler = DBHandler(connection="sqlite:///:memory:", echo=False)
+        self.session = self.handler.get_session()
+        self.session.add_all([StratigraphicObject("ro", 15, session=self.session),
+                              StratigraphicObject("su", 20, session=self.session)])
+        self.session.commit()
+
+        self.statements = list()
+        event.listen(self.session.get_bind(), "before_cursor_execute", self.__listener)
+
+    def test_preload(self) -> None:
+        """
+        test that preloaded horizons are returned without a database request
+        :return: Nothing
+        """
+        cache = StratigraphyCache(self.session)
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(len(cache), 2)
+        self.assertIn("ro", cache)
+        self.assertNotIn("mu", cache)
+
+        # existing horizons are returned regardless of the requested age
+        horizon = cache.get("ro", 30)
+        self.assertEqual((horizon.statigraphic_name, horizon.age), ("ro", 15))
+        self.assertIs(cache.get("su"), cache.get("su"))
+        self.assertEqual(len(self.statements), 1)
+
+    def test_new_horizon(self) -> None:
+        """
+        test that new horizons are flushed immediately and cached afterwards
+        :return: Nothing
+        """
+        cache = StratigraphyCache(self.session)
+        horizon = cache.get("mu", 25)
+        self.assertIsNotNone(horizon.id)
+        self.assertEqual((horizon.statigraphic_name, horizon.age), ("mu", 25))
+        self.assertIn("mu", cache)
+        self.assertEqual(len(cache), 3)
+
+        count = len(self.statements)
+        self.assertIs(cache.get("mu"), horizon)
+        self.assertEqual(len(self.statements), count)
+
+        self.session.commit()
+        self.assertEqual(self.session.query(StratigraphicObject).count(), 3)
+
+    def test_without_preload(self) -> None:
+        """
+        test that each horizon is requested once on first use, if the horizons are not preloaded
+        :return: Nothing
+        """
+        cache = StratigraphyCache(self.session, preload=False)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(self.statements, [])
+
+        horizon = cache.get("su")
+        self.assertEqual(horizon.age, 20)
+        count = len(self.statements)
+        self.assertGreater(count, 0)
+
+        self.assertIs(cache.get("su"), horizon)
+        self.assertEqual(len(self.statements), count)
+        self.assertEqual(len(cache), 1)
+
+    def tearDown(self) -> None:
+        """
+        Removes the statement listener and closes the database session
+
+        :return: Nothing
+        """
+        event.remove(self.session.get_bind(), "before_cursor_execute", self.__listener)
+        self.handler.close_last_session()
+
+    #
+    # private functions
+    #
+
+    def __listener(self, *args) -> None:
+        """
+        Collects the executed SQL statements
+        :param args: arguments of the before_cursor_execute event
+        :return: Nothing
+        """
+        self.statements.append(args[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the transaction policy of the bulk writers
+"""
+
+import time
+import unittest
+
+from sqlalchemy.exc import IntegrityError
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.services.bulk_writer import PointBulkWriter, WellBulkWriter
+from GeologicalDataProcessing.services.transaction_policy import TransactionPolicy
+from geological_toolbox.db_handler import DBHandler
+from geological_toolbox.geometries import GeoPoint
+from geological_toolbox.wells import Well, WellMarker
+
+
+class TestTransactionPolicyClass(unittest.TestCase):
+    """
+    This is a unittest class for the services.transaction_policy module and the savepoint handling of the bulk writers
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a SQLite database in memory with a single well
+
+        :return: None
+        """
+        self.handler = DBHandler(connection="sqlite:///:memory:", echo=False)
+        self.session = self.handler.get_session()
+        self.session.add(Well("duplicate", "", 100, "", 0.0, 0.0, 0.0, self.session))
+        self.session.commit()
+
+    def test_policy(self) -> None:
+        """
+        test the commit conditions and the validation of the policy
+        :return: Nothing
+        """
+        policy = TransactionPolicy(3, 0, True)
+        now = time.monotonic()
+        self.assertFalse(policy.is_due(2, now - 3600))
+        self.assertTrue(policy.is_due(3, now))
+        self.assertTrue(policy.isolate_errors)
+
+        policy = TransactionPolicy(100, 10, False)
+        self.assertFalse(policy.is_due(1, time.monotonic()))
+        self.assertTrue(policy.is_due(1, time.monotonic() - 10))
+        self.assertFalse(policy.is_due(0, time.monotonic() - 10))
+        self.assertFalse(policy.isolate_errors)
+
+        policy = TransactionPolicy()
+        self.assertEqual((policy.batch_size, policy.commit_interval, policy.isolate_errors),
+                         (config.import_batch_size, config.import_commit_interval, config.import_isolate_errors))
+
+        with self.assertRaises(ValueError):
+            TransactionPolicy(0, 0, False)
+        with self.assertRaises(ValueError):
+            TransactionPolicy(1, -1, False)
+
+    def test_isolated_errors(self) -> None:
+        """
+        test that a failing well is skipped and all other wells of the batch are committed
+        :return: Nothing
+        """
+        writer = WellBulkWriter(self.session, TransactionPolicy(3, 0, True))
+        writer.add_well("well 1", "", 100, "", 1.0, 1.0, 0.0, [(10, None, "")])
+        writer.add_well("duplicate", "", 100, "", 2.0, 2.0, 0.0, [(20, None, "")])
+        writer.add_well("well 2", "", 100, "", 3.0, 3.0, 0.0, [(30, None, "")])
+        self.assertEqual(writer.pending, 0)
+
+        writer.add_well("well 3", "", 100, "", 4.0, 4.0, 0.0, [])
+        writer.flush()
+
+        self.assertEqual(writer.written, 3)
+        self.assertEqual(len(writer.failed), 1)
+        self.assertEqual(sorted(w.well_name for w in self.session.query(Well)),
+                         ["duplicate", "well 1", "well 2", "well 3"])
+        self.assertEqual(sorted(m.depth for m in self.session.query(WellMarker)), [10.0, 30.0])
+
+    def test_failing_batch(self) -> None:
+        """
+        test that a failing batch fails the import and is rolled back, if the policy does not isolate errors
+        :return: Nothing
+        """
+        writer = WellBulkWriter(self.session, TransactionPolicy(3, 0, False))
+        writer.add_well("well 1", "", 100, "", 1.0, 1.0, 0.0, [(10, None, "")])
+        writer.add_well("well 2", "", 100, "", 3.0, 3.0, 0.0, [(30, None, "")])
+        with self.assertRaises(IntegrityError):
+            writer.add_well("duplicate", "", 100, "", 2.0, 2.0, 0.0, [(20, None, "")])
+
+        self.assertEqual(writer.pending, 0)
+        self.assertEqual(writer.written, 0)
+        self.assertEqual([w.well_name for w in self.session.query(Well)], ["duplicate"])
+        self.assertEqual(self.session.query(WellMarker).count(), 0)
+
+    def test_rejected_rows(self) -> None:
+        """
+        test that rows with invalid values are skipped and reported, if the policy isolates errors
+        :return: Nothing
+        """
+        writer = PointBulkWriter(self.session, TransactionPolicy(10, 0, True))
+        writer.add_point(None, "", 1.0, 2.0, None)
+        writer.add_point(None, "", "east", 2.0, None)
+        writer.add_point(None, "", 3.0, "north", None)
+        writer.skip("row 4: missing coordinates")
+        writer.add_point(None, "", 5.0, 6.0, None)
+        writer.flush()
+
+        self.assertEqual(writer.written, 2)
+        self.assertEqual(len(writer.failed), 3)
+        self.assertEqual(writer.failed[-1], "row 4: missing coordinates")
+        self.assertEqual([p.easting for p in self.session.query(GeoPoint).order_by(GeoPoint.id)], [1.0, 5.0])
+
+    def tearDown(self) -> None:
+        """
+        Closes the database session
+
+        :return: Nothing
+        """
+        self.handler.close_last_session()
+
+
+if __name__ == "__main__":
+    unittest.main()
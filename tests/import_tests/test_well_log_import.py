@@ -0,0 +1,117 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the row by row and the grouped well log import
+"""
+
+import unittest
+from typing import Dict, List, Tuple
+
+from GeologicalDataProcessing.controller.import_controller import WellLogImportController
+from GeologicalDataProcessing.models.import_data import ImportColumn, ImportData
+from GeologicalDataProcessing.models.log_model import LogImportData
+from GeologicalDataProcessing.services.bulk_writer import BulkWriter
+from GeologicalDataProcessing.services.transaction_policy import TransactionPolicy
+from geological_toolbox.db_handler import DBHandler
+from geological_toolbox.well_logs import WellLog, WellLogValue
+from geological_toolbox.wells import Well
+
+
+class TestWellLogImportClass(unittest.TestCase):
+    """
+    This is a unittest class for the well log import of the controller.import_controller module. Both import modes
+    have to result in the same well logs.
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize the import data and the log columns. The data contains an unknown well, duplicate depths and the
+        depth of an existing log value.
+
+        :return: None
+        """
+        self.selection = {"well_name": "Well", "depth": "Depth"}
+        self.logs = [LogImportData("GR", "API"), LogImportData("RHOB", "g/cm3")]
+        self.data = ImportData([
+            ImportColumn.from_strings("Well", "", ["W1", "W2", "W1", "unknown", "W2", "W1", "W1", "unknown"]),
+            ImportColumn.from_strings("Depth", "m", ["10", "5", "20", "1", "15", "10", "30", "2"]),
+            ImportColumn.from_strings("GR", "API", ["1", "2", "3", "4", "5", "6", "7", "8"]),
+            ImportColumn.from_strings("RHOB", "g/cm3", ["2.1", "2.2", "2.3", "2.4", "2.5", "2.6", "2.7", "2.8"])
+        ])
+
+    def test_grouped_import(self) -> None:
+        """
+        test that the grouped import results in the same well logs as the row by row import
+        :return: Nothing
+        """
+        grouped, failed = self.__import(True)
+        self.assertEqual(grouped["W1"]["GR"], [(10.0, 6.0), (20.0, 3.0), (25.0, 0.5), (30.0, 7.0)])
+        self.assertEqual(grouped["W1"]["RHOB"], [(10.0, 2.6), (20.0, 2.3), (30.0, 2.7)])
+        self.assertEqual(grouped["W2"]["GR"], [(5.0, 2.0), (15.0, 5.0)])
+        self.assertEqual(failed, 2)
+
+        self.assertEqual(self.__import(False), (grouped, failed))
+
+    def test_depth_column(self) -> None:
+        """
+        test that the grouped import skips rows without depth and requires a numeric depth column
+        :return: Nothing
+        """
+        self.data = ImportData([ImportColumn.from_strings("Well", "", ["W1", "W1"]),
+                                ImportColumn.from_strings("Depth", "m", ["10", ""]),
+                                ImportColumn.from_strings("GR", "API", ["1", "2"]),
+                                ImportColumn.from_strings("RHOB", "g/cm3", ["2.1", "2.2"])])
+        logs, failed = self.__import(True)
+        self.assertEqual(logs["W1"]["GR"], [(10.0, 1.0), (25.0, 0.5)])
+        self.assertEqual(failed, 1)
+
+        self.data = ImportData([ImportColumn.from_strings("Well", "", ["W1", "W1"]),
+                                ImportColumn.from_strings("Depth", "m", ["10", "top"]),
+                                ImportColumn.from_strings("GR", "API", ["1", "2"]),
+                                ImportColumn.from_strings("RHOB", "g/cm3", ["2.1", "2.2"])])
+        with self.assertRaises(ValueError):
+            self.__import(True)
+
+        self.selection["depth"] = ""
+        with self.assertRaises(ValueError):
+            self.__import(True)
+
+    #
+    # private functions
+    #
+
+    def __import(self, grouped: bool) -> Tuple[Dict[str, Dict[str, List[Tuple[float, float]]]], int]:
+        """
+        Imports the well logs into a new SQLite database with two wells. The first well has an existing GR log.
+        :param grouped: use the grouped import
+        :return: a tuple of the sorted log values (depth, value) per well and log and the number of failed samples
+        """
+        handler = DBHandler(connection="sqlite:///:memory:", echo=False)
+        session = handler.get_session()
+        try:
+            wells = [Well(name, "", 100, "", 0.0, 0.0, 0.0, session) for name in ["W1", "W2"]]
+            session.add_all(wells)
+            log = WellLog(property_name="GR", property_unit="API", session=session)
+            wells[0].add_log(log)
+            log.insert_multiple_log_values([WellLogValue(10.0, -1.0, session=session),
+                                            WellLogValue(25.0, 0.5, session=session)])
+            session.commit()
+
+            policy = TransactionPolicy(100, 0, False)
+            controller = WellLogImportController(self.data, self.selection, self.logs, grouped, policy)
+            writer = BulkWriter(session, policy)
+            if grouped:
+                failed = controller._import_grouped(session, "", writer)
+            else:
+                failed = controller._import_rows(session, "", writer)
+            writer.flush()
+
+            # read the written values from the database
+            session.expire_all()
+            return {well.well_name: {log.property_name: sorted((v.depth, v.value) for v in log.log_values)
+                                     for log in well.logs} for well in session.query(Well)}, failed
+        finally:
+            handler.close_last_session()
+
+
+if __name__ == "__main__":
+    unittest.main()
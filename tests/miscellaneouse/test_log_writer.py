@@ -0,0 +1,126 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the background log writer
+"""
+
+import os.path
+import re
+import tempfile
+import threading
+import unittest
+from typing import List
+
+from GeologicalDataProcessing.miscellaneous.log_writer import LogWriter
+
+
+class TestLogWriterClass(unittest.TestCase):
+    """
+    This is a unittest class for the miscellaneous.log_writer module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a log writer with a log file inside a temporary directory
+
+        :return: None
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.log")
+        self.dispatched = list()
+        self.writer = LogWriter(self.__dispatch, 100, 60)
+
+    def test_flush(self) -> None:
+        """
+        test that flush writes all queued records to the log file
+        :return: Nothing
+        """
+        self.writer.write(self.path, "logger", "INFO", "title", "text")
+        self.writer.write(self.path, "", "ERROR", "title")
+        self.writer.flush()
+
+        lines = self.__read()
+        self.assertEqual(len(lines), 2)
+        self.assertRegex(lines[0], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} - logger - INFO - title: text$")
+        self.assertRegex(lines[1], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} - ERROR - title$")
+
+    def test_dispatch(self) -> None:
+        """
+        test that consecutive messages of the same level are dispatched at once
+        :return: Nothing
+        """
+        entered = threading.Event()
+        release = threading.Event()
+
+        def dispatch(message: str, level: any) -> None:
+            entered.set()
+            release.wait(10)
+            self.dispatched.append((message, level))
+
+        writer = LogWriter(dispatch, 100, 60)
+        try:
+            # the following messages are queued, while the writer thread dispatches the first one
+            writer.dispatch("a", 1)
+            self.assertTrue(entered.wait(10))
+            for message, level in [("b", 1), ("c", 1), ("d", 2), ("e", 1)]:
+                writer.dispatch(message, level)
+            release.set()
+            writer.flush()
+        finally:
+            release.set()
+            writer.stop()
+
+        self.assertEqual(self.dispatched, [("a", 1), ("b\nc", 1), ("d", 2), ("e", 1)])
+
+    def test_stop(self) -> None:
+        """
+        test that stop writes all queued records and a later record restarts the writer thread
+        :return: Nothing
+        """
+        for i in range(10):
+            self.writer.write(self.path, "", "INFO", "message {}".format(i))
+        self.writer.stop()
+        self.assertEqual([re.sub(r"^.* - ", "", line) for line in self.__read()],
+                         ["message {}".format(i) for i in range(10)])
+
+        # stopping a stopped writer does nothing
+        self.writer.stop()
+
+        self.writer.write(self.path, "", "INFO", "restarted")
+        self.writer.dispatch("restarted", 0)
+        self.writer.flush()
+        self.assertEqual(len(self.__read()), 11)
+        self.assertEqual(self.dispatched, [("restarted", 0)])
+
+    def tearDown(self) -> None:
+        """
+        Stops the log writer and removes the temporary directory
+
+        :return: Nothing
+        """
+        self.writer.stop()
+        self.directory.cleanup()
+
+    #
+    # private functions
+    #
+
+    def __dispatch(self, message: str, level: any) -> None:
+        """
+        Collects the dispatched messages
+        :param message: joined messages
+        :param level: message level
+        :return: Nothing
+        """
+        self.dispatched.append((message, level))
+
+    def __read(self) -> List[str]:
+        """
+        Returns the lines of the log file
+        :return: list of lines without line breaks
+        """
+        with open(self.path) as logfile:
+            return logfile.read().splitlines()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the throttled progress reporter
+"""
+
+import time
+import unittest
+
+from GeologicalDataProcessing.miscellaneous.progress_reporter import ProgressReporter
+
+
+class TestProgressReporterClass(unittest.TestCase):
+    """
+    This is a unittest class for the miscellaneous.progress_reporter module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize the lists of emitted values
+
+        :return: None
+        """
+        self.progress = list()
+        self.rates = list()
+
+    def test_throttling(self) -> None:
+        """
+        test that an unchanged integer percentage is only emitted after the interval elapsed
+        :return: Nothing
+        """
+        reporter = ProgressReporter(self.progress.append, interval=60)
+        for percent in [0, 0.5, 0.9, 1, 1.5, 2.99, 3]:
+            reporter.report(percent)
+        self.assertEqual(self.progress, [0, 1, 2, 3])
+
+        self.progress.clear()
+        reporter = ProgressReporter(self.progress.append, interval=0)
+        for percent in [5, 5, 5.5]:
+            reporter.report(percent)
+        self.assertEqual(self.progress, [5, 5, 5])
+
+        # start resets the last emitted value
+        self.progress.clear()
+        reporter = ProgressReporter(self.progress.append, interval=60)
+        reporter.report(10)
+        reporter.start()
+        reporter.report(10)
+        self.assertEqual(self.progress, [10, 10])
+
+    def test_clamping(self) -> None:
+        """
+        test that the emitted values are limited to 0 - 100
+        :return: Nothing
+        """
+        reporter = ProgressReporter(self.progress.append, interval=60)
+        for percent in [-5, 0, 100, 150.5]:
+            reporter.report(percent)
+        self.assertEqual(self.progress, [0, 100])
+
+    def test_rate(self) -> None:
+        """
+        test the processing rate and the estimated remaining time
+        :return: Nothing
+        """
+        reporter = ProgressReporter(self.progress.append, lambda *args: self.rates.append(args), 0)
+        time.sleep(0.01)
+        reporter.report(0, 0)
+        reporter.report(1)
+        reporter.report(50, 500)
+
+        self.assertEqual(self.progress, [0, 1, 50])
+        self.assertEqual(len(self.rates), 2)
+        self.assertEqual(self.rates[0], (0, -1))
+
+        # at 50 percent the remaining time equals the elapsed time
+        rate, remaining = self.rates[1]
+        self.assertGreater(rate, 0)
+        self.assertAlmostEqual(500 / rate, remaining)
+
+        # no rate notifications without a rate function
+        ProgressReporter(self.progress.append, interval=0).report(60, 600)
+        self.assertEqual(self.progress[-1], 60)
+        self.assertEqual(len(self.rates), 2)
+
+    def tearDown(self) -> None:
+        """
+        Empty function, nothing to shutdown after the testing process
+
+        :return: Nothing
+        """
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
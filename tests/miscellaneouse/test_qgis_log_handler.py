@@ -0,0 +1,98 @@
+# -*- coding: UTF-8 -*-
+"""
+An unittest module for the lazy message formatting of the QGISLogHandler
+"""
+
+import unittest
+
+import GeologicalDataProcessing.config as config
+from GeologicalDataProcessing.miscellaneous.qgis_log_handler import LogLevel, QGISLogHandler
+
+
+class TestQGISLogHandlerClass(unittest.TestCase):
+    """
+    This is a unittest class for the miscellaneous.qgis_log_handler module
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize a log handler and store the current debug settings
+
+        :return: None
+        """
+        self.logger = QGISLogHandler("TestQGISLogHandlerClass")
+        self.settings = (config.debug, self.logger.save_to_file)
+        self.calls = list()
+
+    def test_debug_disabled(self) -> None:
+        """
+        test that callables and format arguments of debug messages are not evaluated, if debugging is disabled
+        :return: Nothing
+        """
+        config.debug = False
+        self.logger.save_to_file = True
+        self.assertFalse(self.logger.is_enabled(LogLevel.DEBUG))
+        self.assertTrue(self.logger.is_enabled(LogLevel.WARNING))
+
+        # formatting the title would fail, as an argument is missing
+        self.logger.debug(self.__title, self.__text, args=(1,))
+        self.logger.debug("{} {}", args=(1,))
+        self.assertEqual(self.calls, [])
+
+        config.debug = True
+        self.logger.save_to_file = False
+        self.assertFalse(self.logger.is_enabled(LogLevel.DEBUG))
+        self.logger.debug(self.__title, self.__text)
+        self.assertEqual(self.calls, [])
+
+    def test_debug_enabled(self) -> None:
+        """
+        test that callables and format arguments are evaluated and written, if debugging is enabled
+        :return: Nothing
+        """
+        config.debug = True
+        self.logger.save_to_file = True
+        self.assertTrue(self.logger.is_enabled(LogLevel.DEBUG))
+
+        self.logger.debug(self.__title, self.__text, args=("debug", 1))
+        self.logger.debug("{} message {}", args=("second", 2))
+        QGISLogHandler.flush()
+
+        self.assertEqual(self.calls, ["title", "text"])
+        with open(self.logger.logfile) as logfile:
+            lines = logfile.read().splitlines()[-2:]
+        self.assertTrue(lines[0].endswith("TestQGISLogHandlerClass - DEBUG - title debug 1: message text"))
+        self.assertTrue(lines[1].endswith("TestQGISLogHandlerClass - DEBUG - second message 2"))
+
+    def tearDown(self) -> None:
+        """
+        Writes all queued messages and restores the debug settings
+
+        :return: Nothing
+        """
+        QGISLogHandler.flush()
+        config.debug, self.logger.save_to_file = self.settings
+
+    #
+    # private functions
+    #
+
+    def __title(self) -> str:
+        """
+        Returns a message title with two format fields
+        :return: the message title
+        """
+        self.calls.append("title")
+        return "title {} {}"
+
+    def __text(self) -> str:
+        """
+        Returns a message text
+        :return: the message text
+        """
+        self.calls.append("text")
+        return "message text"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@
 This module defines views for import processing
 """
 
+from datetime import timedelta
 from enum import IntEnum, unique
 from typing import Dict, List
 
@@ -183,6 +184,7 @@ class ImportViewInterface(QObject):
     def _on_start_import(self) -> None:
         self.logger.debug("(Interface) _on_start_import")
         self._update_progress_bar(0)
+        self._dwg.progress_bar.setFormat("%p%")
         self._dwg.progress_bar_layout.setVisible(True)
 
     def _on_import_failed(self, msg: str) -> None:
@@ -308,7 +310,7 @@ class ImportViewInterface(QObject):
         :param value: value in percent
         :return: nothing
         """
-        self.logger.debug("Update progressbar with value {} called".format(value))
+        self.logger.debug("Update progressbar with value {} called", args=(value,))
         if value < 0:
             self.dockwidget.progress_bar.setValue(0)
         elif value > 100:
@@ -316,6 +318,18 @@ class ImportViewInterface(QObject):
         else:
             self.dockwidget.progress_bar.setValue(int(value))
 
+    def _update_rate(self, rows_per_second: float, remaining: float) -> None:
+        """
+        slot to show the import rate and the estimated remaining time inside the progress bar
+        :param rows_per_second: processed rows per second
+        :param remaining: estimated remaining seconds, -1 if unknown
+        :return: nothing
+        """
+        text = "%p% - {:.0f} rows/s".format(rows_per_second)
+        if remaining >= 0:
+            text = "{} - {} remaining".format(text, timedelta(seconds=int(remaining)))
+        self.dockwidget.progress_bar.setFormat(text)
+
     def _connect_selection_changed(self):
         self.logger.debug("_connect_selection_changed")
         [self.__combos[key].currentTextChanged.connect(self.on_selection_changed) for key in self.__combos]
@@ -333,6 +347,7 @@ class ImportViewInterface(QObject):
         self._controller_thread.import_failed.connect(self._on_import_failed)
         self._controller_thread.import_finished_with_warnings.connect(self._on_import_finished_with_warnings)
         self._controller_thread.update_progress.connect(self._update_progress_bar)
+        self._controller_thread.update_rate.connect(self._update_rate)
         self._dwg.cancel_import.clicked.connect(self._on_cancel_import)
 
     def _disconnect_thread(self):
@@ -340,6 +355,7 @@ class ImportViewInterface(QObject):
         self._controller_thread.import_failed.disconnect(self._on_import_failed)
         self._controller_thread.import_finished_with_warnings.disconnect(self._on_import_finished_with_warnings)
         self._controller_thread.update_progress.disconnect(self._update_progress_bar)
+        self._controller_thread.update_rate.disconnect(self._update_rate)
         self._dwg.cancel_import.clicked.disconnect(self._on_cancel_import)
 
 
@@ -406,7 +422,7 @@ class PointImportView(ImportViewInterface):
             self.logger.debug("currentIndex != ViewTabs.POINTS [{}]", self.dockwidget.import_type.currentIndex())
             return
 
-        data = self._import_service.read_import_file()
+        data = self._import_service.get_import_reader()
 
         selection = dict()
         selection["easting"] = self.combobox_data("easting")
@@ -487,7 +503,7 @@ class LineImportView(ImportViewInterface):
             self.logger.debug("currentIndex != ViewTabs.LINES [{}]", self.dockwidget.import_type.currentIndex())
             return
 
-        data = self._import_service.read_import_file()
+        data = self._import_service.get_import_reader()
 
         selection = dict()
         selection["easting"] = self.combobox_data("easting")
@@ -570,7 +586,7 @@ class WellImportView(ImportViewInterface):
             self.logger.debug("currentIndex != ViewTabs.WELLS [{}]", self.dockwidget.import_type.currentIndex())
             return
 
-        data = self._import_service.read_import_file()
+        data = self._import_service.get_import_reader()
 
         selection = dict()
         selection["name"] = self.combobox_data("name")
@@ -642,7 +658,7 @@ class PropertyImportView(ImportViewInterface):
             self.logger.debug("currentIndex != ViewTabs.PROPERTIES [{}]", self.dockwidget.import_type.currentIndex())
             return
 
-        data = self._import_service.read_import_file()
+        data = self._import_service.get_import_reader()
 
         selection = dict()
         selection["id"] = self.combobox_data("id")
@@ -716,7 +732,7 @@ class WellLogImportView(ImportViewInterface):
             self.logger.debug("currentIndex != ViewTabs.WELL_LOGS [{}]", self.dockwidget.import_type.currentIndex())
             return
 
-        data = self._import_service.read_import_file()
+        data = self._import_service.get_import_reader()
 
         selection = dict()
         selection["well_name"] = self.combobox_data("well_name")